@@ -63,11 +63,11 @@ async def login(login_cred: UserLoginCredential) -> LoginCertificate:
             - 401 Unauthorized if the username does not exist or the password is incorrect.
 
     """
-    user = database_client.fetch_user_by_name(login_cred.username)
+    user = await database_client.fetch_user_by_name(login_cred.username)
     if user is None:
         raise HTTPException(401, "Invalid Username or password")
 
-    stored_password = database_client.fetch_user_hashed_password(user_id=user.user_id)
+    stored_password = await database_client.fetch_user_hashed_password(user_id=user.user_id)
 
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     is_password_match = pwd_context.verify(login_cred.password, stored_password)
@@ -88,7 +88,7 @@ async def login(login_cred: UserLoginCredential) -> LoginCertificate:
     access_token_expire_time = parse_duration(access_token_expire_time)
     refresh_token_expire_time = parse_duration(refresh_token_expire_time)
 
-    database_client.login(
+    await database_client.login(
         user_id=login_certificate.user_id,
         access_token=login_certificate.access_token,
         refresh_token=login_certificate.refresh_token,
@@ -118,7 +118,7 @@ async def logout(user_id: int) -> bool:
         HTTPException: 401 Unauthorized if the `user_id` is invalid.
 
     """
-    result = database_client.logout(user_id=user_id)
+    result = await database_client.logout(user_id=user_id)
 
     if not isinstance(result, bool):
         raise HTTPException(401, "Invalid user_id")
@@ -157,14 +157,16 @@ async def create_new_role(new_role: NewRole, payload: Annotated[AccessToken, Dep
         )
 
     # Check for duplicates
-    existing_roles = [r.role_name for r in database_client.fetch_all_role()]
+    existing_roles = [r.role_name for r in await database_client.fetch_all_role()]
     if new_role.role_name in existing_roles:
         raise HTTPException(status_code=400, detail="Role name already exists")
 
     # Create the new role and return its ID
-    role_id = database_client.create_new_role(role_name=new_role.role_name, role_description=new_role.role_description)
+    role_id = await database_client.create_new_role(
+        role_name=new_role.role_name, role_description=new_role.role_description
+    )
 
-    role = database_client.fetch_role_by_id(role_id)
+    role = await database_client.fetch_role_by_id(role_id)
 
     if role:
         return role
@@ -181,7 +183,7 @@ async def get_role() -> list[Role]:
         list[Role]: A list of Role objects representing all roles in the system.
 
     """
-    return database_client.fetch_all_role()
+    return await database_client.fetch_all_role()
 
 
 @router.get("/get-role/name/{role_name}")
@@ -199,7 +201,7 @@ async def get_role_by_name(role_name: str) -> Role:
         HTTPException: If the role does not exist (404).
 
     """
-    role = database_client.fetch_role_by_name(role_name)
+    role = await database_client.fetch_role_by_name(role_name)
 
     if role is None:
         raise HTTPException(status_code=404, detail="Role Not Found")
@@ -209,7 +211,7 @@ async def get_role_by_name(role_name: str) -> Role:
 
 @router.get("/get-role/id/{role_id}")
 async def get_role_by_id(role_id: int) -> Role:
-    role = database_client.fetch_role_by_id(role_id)
+    role = await database_client.fetch_role_by_id(role_id)
 
     if role is None:
         raise HTTPException(status_code=404, detail="Role Not Found")
@@ -251,11 +253,11 @@ async def create_new_user(new_user: NewUser, payload: Annotated[AccessToken, Dep
         logger.critical("Invalid Email: %s", new_user.email)
         raise HTTPException(status_code=400, detail="Invalid Email")
 
-    role_name_list = [r.role_name for r in database_client.fetch_all_role()]
+    role_name_list = [r.role_name for r in await database_client.fetch_all_role()]
     if new_user.role_name not in role_name_list:
         raise HTTPException(status_code=400, detail="Invalid Role name")
 
-    role = database_client.fetch_role_by_name(role_name=new_user.role_name)
+    role = await database_client.fetch_role_by_name(role_name=new_user.role_name)
 
     if role is None:
         raise HTTPException(status_code=400, detail="Invalid Role name")
@@ -263,7 +265,7 @@ async def create_new_user(new_user: NewUser, payload: Annotated[AccessToken, Dep
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     hashed_password = pwd_context.hash(new_user.password)
 
-    new_user_id = database_client.create_new_user(
+    new_user_id = await database_client.create_new_user(
         role_id=role.role_id,
         user_name=new_user.user_name,
         email=new_user.email,
@@ -273,7 +275,7 @@ async def create_new_user(new_user: NewUser, payload: Annotated[AccessToken, Dep
     if new_user_id is None:
         raise HTTPException(status_code=500, detail="Internal Database Error")
 
-    user = database_client.fetch_user_by_id(new_user_id)
+    user = await database_client.fetch_user_by_id(new_user_id)
 
     if user:
         return user
@@ -296,7 +298,7 @@ async def get_user_by_name(user_name: str) -> User:
         HTTPException: If the user does not exist (404).
 
     """
-    user = database_client.fetch_user_by_name(user_name)
+    user = await database_client.fetch_user_by_name(user_name)
 
     if user is None:
         raise HTTPException(status_code=404, detail="User Not Found")
@@ -319,7 +321,7 @@ async def get_user_by_id(user_id: int) -> User:
         HTTPException: If no user is found with the given ID (404).
 
     """
-    user = database_client.fetch_user_by_id(user_id)
+    user = await database_client.fetch_user_by_id(user_id)
 
     if user is None:
         raise HTTPException(status_code=404, detail="User Not Found")
@@ -345,9 +347,9 @@ async def refresh_access_token(refresh_token: str) -> str:
 
     """
     logger.info(refresh_token)
-    token = verify_refresh_token(refresh_token=refresh_token)
+    token = await verify_refresh_token(refresh_token=refresh_token)
     user_id = int(token.sub)
-    db_refresh_token = database_client.fetch_refresh_token(user_id=user_id)
+    db_refresh_token = await database_client.fetch_refresh_token(user_id=user_id)
 
     logger.info(db_refresh_token)
     if db_refresh_token is None or db_refresh_token != refresh_token:
@@ -355,8 +357,8 @@ async def refresh_access_token(refresh_token: str) -> str:
 
     new_refresh_token = generate_refresh_token(user_id)
 
-    database_client.revoke_access_token(user_id=user_id)
-    database_client.update_refresh_token(user_id=user_id, refresh_token=new_refresh_token)
+    await database_client.revoke_access_token(user_id=user_id)
+    await database_client.update_refresh_token(user_id=user_id, refresh_token=new_refresh_token)
 
     return new_refresh_token
 
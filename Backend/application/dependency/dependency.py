@@ -208,7 +208,7 @@ def get_jwt_environment_variable() -> JWTEnvironmentalSetup:
     )
 
 
-def _check_revocation(payload: dict, token: str, token_type: TokenType) -> None:
+async def _check_revocation(payload: dict, token: str, token_type: TokenType) -> None:
     """
     Check if the given token has been revoked for the user.
 
@@ -225,7 +225,7 @@ def _check_revocation(payload: dict, token: str, token_type: TokenType) -> None:
 
     """
     logger.debug(payload)
-    if not database_client.verify_token(user_id=int(payload["sub"]), token=token or "", token_type=token_type):
+    if not await database_client.verify_token(user_id=int(payload["sub"]), token=token or "", token_type=token_type):
         raise HTTPException(status_code=401, detail="Token revoked")
 
 
@@ -264,7 +264,7 @@ async def verify_jwt_token(
         raise HTTPException(status_code=401, detail="Missing access token")
 
     # Try to decode and verify the access token
-    access_payload = verify_access_token(access_token=access_token)
+    access_payload = await verify_access_token(access_token=access_token)
 
     if isinstance(access_payload, AccessToken):
         return access_payload
@@ -274,7 +274,7 @@ async def verify_jwt_token(
         logger.critical("Access token expired and no refresh token provided")
         raise HTTPException(status_code=401, detail="Access token expired and no refresh token provided")
 
-    refresh_payload = verify_refresh_token(refresh_token=refresh_token)
+    refresh_payload = await verify_refresh_token(refresh_token=refresh_token)
 
     if isinstance(refresh_payload, RefreshToken):
         # Indicate to client to refresh token
@@ -287,7 +287,7 @@ async def verify_jwt_token(
     raise HTTPException(status_code=401, detail="Invalid token(s)")
 
 
-def verify_access_token(
+async def verify_access_token(
     access_token: str = Cookie(None),
 ) -> AccessToken:
     """
@@ -308,7 +308,7 @@ def verify_access_token(
 
     try:
         access_payload = jwt.decode(access_token, jwt_setup.secret, algorithms=jwt_setup.algorithm)
-        _check_revocation(access_payload, access_token, "access")
+        await _check_revocation(access_payload, access_token, "access")
         logger.info(access_payload)
 
     except InvalidSignatureError as e:
@@ -328,7 +328,7 @@ def verify_access_token(
         return AccessToken(**access_payload)
 
 
-def verify_refresh_token(refresh_token: str) -> RefreshToken:
+async def verify_refresh_token(refresh_token: str) -> RefreshToken:
     """
     Verify the validity of a refresh token.
 
@@ -347,7 +347,7 @@ def verify_refresh_token(refresh_token: str) -> RefreshToken:
 
     try:
         refresh_payload = jwt.decode(refresh_token, jwt_setup.secret, algorithms=[jwt_setup.algorithm])
-        _check_revocation(refresh_payload, refresh_token, "refresh")
+        await _check_revocation(refresh_payload, refresh_token, "refresh")
         logger.debug("Refresh token valid: %s", refresh_payload)
 
         return RefreshToken(**refresh_payload)
@@ -426,6 +426,15 @@ def generate_refresh_token(user_id: int) -> str:
     )
 
 
+# roles that may act on any user's resources
+ADMIN_ROLES = ["admin", "root"]
+
+
+def has_role(payload: AccessToken, roles: list[str]) -> bool:
+    """Check the token's role against lower-case role names, ignoring its case."""
+    return payload.role_name.lower() in roles
+
+
 async def require_role(required_roles: list[str], payload: AccessToken = Depends(verify_jwt_token)) -> AccessToken:
     """
     Check if the authenticated user has one of the required roles.
@@ -441,7 +450,7 @@ async def require_role(required_roles: list[str], payload: AccessToken = Depends
         HTTPException: If the user's role is not in the required roles list.
 
     """
-    if payload.role_name.lower() not in required_roles:
+    if not has_role(payload, required_roles):
         raise HTTPException(status_code=403, detail="Insufficient permissions")
 
     return payload
@@ -456,7 +465,7 @@ async def require_admin(
     payload: AccessToken = Depends(verify_jwt_token),
 ) -> AccessToken:
     """Require admin role to access the endpoint"""
-    return await require_role(["admin", "root"], payload)
+    return await require_role(ADMIN_ROLES, payload)
 
 
 async def require_user(payload: AccessToken = Depends(verify_jwt_token)) -> AccessToken:
@@ -32,7 +32,7 @@ authorization_database_client = AuthorizationOperation()
 async def create_default_user() -> list[User]:
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=12)
     hashed_password = pwd_context.hash("example_password")
-    return authorization_database_client.create_default_role_and_user(hashed_password)
+    return await authorization_database_client.create_default_role_and_user(hashed_password)
 
 
 # @router.post("/download/")
@@ -30,7 +30,7 @@ async def get_search_history(user: UserPayload) -> list[SearchHistoryRecord]:
 
     """
     user_id = int(user.sub)
-    result = history_database_client.fetch_search_history(user_id=user_id)
+    result = await history_database_client.fetch_search_history(user_id=user_id)
 
     if result == []:
         raise HTTPException(404, "History not found")
@@ -55,7 +55,7 @@ async def get_last_login(user: UserPayload) -> LoginHistoryRecord:
 
     """
     user_id = int(user.sub)
-    result = history_database_client.fetch_last_login(user_id=user_id)
+    result = await history_database_client.fetch_last_login(user_id=user_id)
 
     if result is None:
         raise HTTPException(404, "History not found")
@@ -0,0 +1,38 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from Backend.application.dependency.dependency import ADMIN_ROLES, UserPayload, has_role, require_user
+from Backend.utility.handler.database.job import IngestionJobOperation
+from Backend.utility.model.application.job import IngestionJob
+
+router = APIRouter(prefix="/jobs", dependencies=[Depends(require_user)])
+
+job_database_client = IngestionJobOperation()
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: int, access_token: UserPayload) -> IngestionJob:
+    """
+    Report an ingestion job queued by `POST /search/scraper/`.
+
+    Args:
+        job_id (int): The job ID returned when the job was queued.
+        access_token (UserPayload): The current user's token; admins see every job.
+
+    Returns:
+        IngestionJob: Status, current stage, per-stage progress and the patents inserted so far.
+
+    Raises:
+        HTTPException:
+            - 404: If the job does not exist or belongs to another user.
+
+    """
+    job = await job_database_client.fetch(job_id)
+
+    if job is None or (job.user_id != int(access_token.sub) and not has_role(access_token, ADMIN_ROLES)):
+        raise HTTPException(404, "Job not found")
+
+    return job
@@ -0,0 +1,66 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from Backend.application.dependency.dependency import require_admin
+from Backend.utility.handler.cache import DocumentEmbeddingCache, QueryEmbeddingCache
+from Backend.utility.handler.database.database import DatabaseConnection
+from Backend.utility.handler.database.history import SearchHistoryBuffer
+from Backend.utility.model.application.history import SearchHistoryWriterStats
+from Backend.utility.model.handler.cache import ContentEmbeddingCacheStats, EmbeddingCacheStats
+from Backend.utility.model.handler.database.database import DatabasePoolStats
+
+router = APIRouter(prefix="/metrics", dependencies=[Depends(require_admin)])
+
+
+@router.get("/search-history/")
+async def get_search_history_writer_stats() -> SearchHistoryWriterStats:
+    """
+    Report the search history write-behind buffer.
+
+    Returns:
+        SearchHistoryWriterStats: Queue depth, row counters and flush latency.
+
+    """
+    return SearchHistoryBuffer.stats()
+
+
+@router.get("/database/")
+async def get_database_pool_stats() -> DatabasePoolStats:
+    """
+    Report the sync and async connection pools.
+
+    A rising `average_wait_ms` or `overflow_count` shows the pool running out of
+    connections before requests start failing with `timeout_count`.
+
+    Returns:
+        DatabasePoolStats: Checked-out connections, wait times, overflow and timeouts per pool.
+
+    """
+    return DatabaseConnection.pool_stats()
+
+
+@router.get("/embedding-cache/")
+async def get_embedding_cache_stats() -> EmbeddingCacheStats:
+    """
+    Report the query embedding cache.
+
+    Returns:
+        EmbeddingCacheStats: Entries held in memory, hits per tier, misses and hit rate.
+
+    """
+    return QueryEmbeddingCache.stats()
+
+
+@router.get("/content-embedding-cache/")
+async def get_content_embedding_cache_stats() -> ContentEmbeddingCacheStats:
+    """
+    Report the content-addressed document embedding cache.
+
+    Returns:
+        ContentEmbeddingCacheStats: Entries, size against the limit, hits, misses and evictions.
+
+    """
+    return DocumentEmbeddingCache.stats()
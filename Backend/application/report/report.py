@@ -14,4 +14,4 @@ result_database_client = ResultOperation()
 
 @router.get("/info/")
 async def get_patent_info(patent_id: int) -> PatentInfoModel | None:
-    return result_database_client.search_patent_by_id(patent_id=patent_id) or None
+    return await result_database_client.search_patent_by_id(patent_id=patent_id) or None
@@ -10,7 +10,7 @@ from Backend.application.dependency.dependency import (
 )
 from Backend.utility.handler.database.history import HistoryOperation
 from Backend.utility.handler.database.result import ResultOperation
-from Backend.utility.handler.llm.llm import LLMResponser
+from Backend.utility.handler.lazy import LLMHandler
 from Backend.utility.handler.log_handler import Logger
 from Backend.utility.model.application.dependency.dependency import AccessToken
 
@@ -19,17 +19,16 @@ history_database_client = HistoryOperation()
 # router = APIRouter(prefix="/response", dependencies=[Depends(require_user)])
 router = APIRouter(prefix="/response", dependencies=[Depends(require_user)])
 logger = Logger().get_logger()
-llm_client = LLMResponser()
 result_database_client = ResultOperation()
 
 
 @router.get("/search/")
 async def llm_response(query: str, access_token: Annotated[AccessToken, Depends(require_user)]) -> str:
-    response, token_count = llm_client.search_response(query=query)
+    response, token_count = LLMHandler.get().search_response(query=query)
     logger.info(response)
     logger.info(token_count)
 
-    history_database_client.insert_response_history(
+    await history_database_client.insert_response_history(
         user_id=int(access_token.sub), query=query, response=response, token=token_count
     )
 
@@ -38,7 +37,7 @@ async def llm_response(query: str, access_token: Annotated[AccessToken, Depends(
 
 @router.get("/summary/")
 async def llm_summary(patent_id: int, access_token: Annotated[AccessToken, Depends(require_user)]) -> str:
-    patent_info = result_database_client.search_patent_by_id(patent_id=patent_id)
+    patent_info = await result_database_client.search_patent_by_id(patent_id=patent_id)
 
     if not patent_info:
         raise HTTPException(404, f"Patent id not found: {patent_id}")
@@ -50,10 +49,10 @@ async def llm_summary(patent_id: int, access_token: Annotated[AccessToken, Depen
     with Path.open(Path(patent_text_path), "r", encoding="utf-8") as f:
         patent_text = f.read()
 
-    response, token_count = llm_client.summary_response(query=patent_text)
+    response, token_count = LLMHandler.get().summary_response(query=patent_text)
     logger.info(response)
     logger.info(token_count)
-    history_database_client.insert_response_history(
+    await history_database_client.insert_response_history(
         user_id=int(access_token.sub), query=patent_text[:30], response=response, token=token_count
     )
     return response
@@ -2,186 +2,254 @@
 
 from __future__ import annotations
 
-import re
 from datetime import datetime, timezone
 from os import getenv
-from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from Backend.application.dependency.dependency import UserPayload, require_user
 from Backend.utility.error.common import EnvironmentVariableNotSetError
-from Backend.utility.handler.database.history import HistoryOperation
-from Backend.utility.handler.database.scraper import ScraperOperation
+from Backend.utility.error.database.database import InvalidCursorError
+from Backend.utility.handler.database.history import SearchHistoryBuffer
+from Backend.utility.handler.database.neighbor import NeighborOperation
 from Backend.utility.handler.database.search import SearchEngineOperation
-from Backend.utility.handler.embedding import ImageEmbedding
-from Backend.utility.handler.llm.llm import LLMResponser
+from Backend.utility.handler.ingestion import IngestionJobs
+from Backend.utility.handler.lazy import LLMHandler
 from Backend.utility.handler.log_handler import Logger
-from Backend.utility.handler.pdf_extractor import PDFExtractor
-from Backend.utility.handler.scraper import Scraper
-from Backend.utility.model.application.search import PDFChunkEmbedding, PDFInfo, SearchResult
+from Backend.utility.model.application.job import IngestionJob
+from Backend.utility.model.application.search import HybridSearchResult, SearchResult
 from Backend.utility.model.handler.scraper import PatentInfoModel
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
 router = APIRouter(prefix="/search", dependencies=[Depends(require_user)])
 # router = APIRouter(prefix="/search")
 
 logger = Logger().get_logger()
 search_database_client = SearchEngineOperation()
-history_database_client = HistoryOperation()
-scraper_database_client = ScraperOperation()
-llm_client = LLMResponser()
-pdf_extractor = PDFExtractor()
-embedding_model = ImageEmbedding()
+neighbor_database_client = NeighborOperation()
 
 POPPLER_PATH = getenv("POPPLER_PATH")
 
 
 @router.get("/full-text/")
-async def full_text_search(search_keywords: str, access_token: UserPayload) -> SearchResult:
+async def full_text_search(
+    search_keywords: str,
+    access_token: UserPayload,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: str | None = None,
+) -> SearchResult:
     """
-    Search patents by keyword, record the search history, and return the results.
+    Search patents by keyword, record the search history, and return one ranked page of results.
 
     This asynchronous endpoint performs a full-text search for patents matching
-    the given `search_keywords`. If any patents are found, it logs each search
-    in the user's history. Finally, it returns a `SearchResult` containing the
-    list of patents and the timestamp of the search.
+    the given `search_keywords`, ordered by relevance. The patents of the page are
+    added to the user's search history, which is written in the background.
+
+    To fetch the following page, pass the returned `next_cursor` back as `cursor`.
 
     Args:
         search_keywords (str): The keyword(s) to search for.
         access_token (AccessToken, via Depends): Authenticated user token.
+        limit (int): Page size, between 1 and 100. Defaults to 20.
+        cursor (str | None): The `next_cursor` of the previous page.
 
     Returns:
         SearchResult:
-            - patents (List[Patent]): List of matching patents.
+            - patents (List[Patent]): The matching patents of this page.
+            - next_cursor (str | None): Cursor of the next page, None on the last page.
+            - total_estimate (int | None): Planner estimate of the total number of matches,
+              on the first page only.
             - search_time (datetime): UTC timestamp when the search was executed.
 
-    """
-    patents = search_database_client.full_text_search(search_keywords)
+    Raises:
+        HTTPException:
+            - 400: If the cursor is invalid.
 
-    if patents:
-        for patent in patents:
-            history_database_client.insert_search_history(
-                user_id=int(access_token.sub), patent_id=patent.Patent_id, keyword=search_keywords
-            )
+    """
+    try:
+        page = await search_database_client.full_text_search(search_keywords, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(400, "Invalid cursor") from e
+
+    if page.patents:
+        SearchHistoryBuffer.add(
+            user_id=int(access_token.sub),
+            patent_ids=[patent.Patent_id for patent in page.patents],
+            keyword=search_keywords,
+        )
 
     return SearchResult(
-        patents=patents,
+        patents=page.patents,
+        next_cursor=page.next_cursor,
+        total_estimate=page.total_estimate,
+        search_time=datetime.now(tz=timezone.utc),
+    )
+
+
+@router.get("/hybrid/")
+async def hybrid_search(
+    search_keywords: str,
+    access_token: UserPayload,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    offset: Annotated[int, Query(ge=0, le=400)] = 0,
+    lexical_limit: Annotated[int, Query(ge=1, le=200)] = 100,
+    vector_limit: Annotated[int, Query(ge=1, le=200)] = 100,
+) -> HybridSearchResult:
+    """
+    Search patents by keyword and meaning at once, fused with reciprocal-rank fusion.
+
+    Args:
+        search_keywords (str): The query, matched lexically and embedded for vector search.
+        access_token (UserPayload): The current user's token, used to log the search history.
+        limit (int): Page size, 20 by default.
+        offset (int): The `next_offset` of the previous page, 0 by default.
+        lexical_limit (int): Keyword candidates considered, 100 by default.
+        vector_limit (int): Semantic candidates considered, 100 by default.
+
+    Returns:
+        HybridSearchResult:
+            - hits (List[HybridSearchHit]): Patents of this page with their fused score and stage ranks.
+            - next_offset (int | None): Offset of the next page, None on the last page.
+            - search_time (datetime): UTC timestamp when the search was executed.
+
+    """
+    page = await search_database_client.hybrid_search(
+        search_keywords,
+        embed_text=LLMHandler.get().embed_query,
+        limit=limit,
+        offset=offset,
+        lexical_limit=lexical_limit,
+        vector_limit=vector_limit,
+    )
+
+    if page.hits:
+        SearchHistoryBuffer.add(
+            user_id=int(access_token.sub),
+            patent_ids=[hit.patent.Patent_id for hit in page.hits],
+            keyword=search_keywords,
+        )
+
+    return HybridSearchResult(
+        hits=page.hits,
+        next_offset=page.next_offset,
         search_time=datetime.now(tz=timezone.utc),
     )
 
 
 @router.post("/patent-list/")
 async def search_patent_list(patent_ids: set[int]) -> list[PatentInfoModel]:
-    return search_database_client.search_patent_by_id(patent_ids)
+    return await search_database_client.search_patent_by_id(patent_ids)
 
 
 @router.get("/graph/")
-async def graph_search(patent_id: int) -> list[PatentInfoModel]:
+async def graph_search(
+    patent_id: int,
+    k: Annotated[int, Query(ge=1, le=50)] = 3,
+    ef_search: Annotated[int | None, Query(ge=1, le=1000)] = None,
+    probes: Annotated[int | None, Query(ge=1, le=1000)] = None,
+) -> list[PatentInfoModel]:
     """
-    Find and return the top-3 most similar patents by embedding cosine distance.
+    Find and return the k most similar patents by embedding cosine distance.
 
     Args:
         patent_id (int): The ID of the patent to query.
+        k (int): The number of similar patents, 3 by default.
+        ef_search (int | None): HNSW candidate list size, higher is slower with better recall.
+        probes (int | None): IVFFlat lists to scan, higher is slower with better recall.
 
     Returns:
-        List[PatentInfoModel]: A list of up to three PatentInfoModel objects.
+        List[PatentInfoModel]: A list of up to k PatentInfoModel objects, the queried patent excluded.
 
     """
-    patent_ids = search_database_client.search_patent_similarity_by_id(patent_id=patent_id)
+    # precomputed neighbours unless the caller tunes the live ANN search
+    patent_ids: list[int] | None = None
+    if ef_search is None and probes is None:
+        patent_ids = await neighbor_database_client.fetch(patent_id, k)
+
+    if patent_ids is None:
+        patent_ids = await search_database_client.search_patent_similarity_by_id(
+            patent_id=patent_id, k=k, ef_search=ef_search, probes=probes
+        )
     logger.info(patent_ids)
-    return search_database_client.search_patent_by_id(patent_ids)
+    patents = await search_database_client.search_patent_by_id(set(patent_ids))
 
+    # keep the nearest-first order of the similarity search
+    position = {patent_id: index for index, patent_id in enumerate(patent_ids)}
+    return sorted(patents, key=lambda patent: position[patent.Patent_id])
 
-@router.post("/scraper/")
-async def download_patent(patent_keyword: str) -> list[int | None]:
+
+@router.get("/graph/traverse/")
+async def graph_traverse(
+    patent_id: int,
+    depth: Annotated[int, Query(ge=1, le=4)] = 2,
+    fan_out: Annotated[int, Query(ge=1, le=20)] = 5,
+    max_nodes: Annotated[int, Query(ge=1, le=1000)] = 200,
+    time_budget_ms: Annotated[int, Query(ge=100, le=10000)] = 2000,
+) -> StreamingResponse:
+    """
+    Expand a patent's similarity neighbourhood breadth-first and stream it as NDJSON.
+
+    Every line is a `node` (patent_id, title, depth) or an `edge` (source, target,
+    similarity), in discovery order; the last line is an `end` record with the totals and
+    whether a budget cut the traversal short.
+
+    Args:
+        patent_id (int): The start patent.
+        depth (int): Hops to expand, 2 by default.
+        fan_out (int): Neighbours followed per patent, 5 by default.
+        max_nodes (int): Node budget, 200 by default.
+        time_budget_ms (int): Time budget in milliseconds, 2000 by default.
+
+    Returns:
+        StreamingResponse: `application/x-ndjson` stream of the traversal.
+
+    """
+
+    async def stream() -> AsyncIterator[str]:
+        async for item in neighbor_database_client.traverse(
+            patent_id, depth=depth, fan_out=fan_out, max_nodes=max_nodes, time_budget=time_budget_ms / 1000
+        ):
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/scraper/", status_code=202)
+async def download_patent(patent_keyword: str, access_token: UserPayload) -> IngestionJob:
     """
-    Scrape patent documents matching the given keyword, store them and their embeddings,
-    perform OCR on the downloaded PDFs, and return the list of inserted patent IDs.
+    Queue a job that scrapes the patents matching the keyword, stores them and their
+    embeddings, and runs OCR on the downloaded PDFs.
+
+    The job runs in the background; poll `GET /jobs/{job_id}` for its progress and the
+    inserted patent IDs.
 
     Args:
-        patent_keyword (str): The keyword to search patents for (default is "鞋面").
+        patent_keyword (str): The keyword to search patents for, only its first word is used.
+        access_token (UserPayload): The current user's token, the job's owner.
 
     Returns:
-        list[int | None]:
-            A list containing the database IDs of the inserted patents.
-            An entry will be  None if insertion failed for that particular patent.
+        IngestionJob: The queued job.
 
     Raises:
         EnvironmentVariableNotSetError
             If the POPPLER_PATH environment variable is not set, which is required
             for PDF processing.
+        HTTPException:
+            - 500: If the job could not be stored.
 
     """
     logger.debug(patent_keyword)
-    patent_keyword = patent_keyword.split()[0]
-
-    Scraper.create_scraper()
-    Scraper.keyword = patent_keyword
 
     if POPPLER_PATH is None:
         msg = "POPPLER_PATH"
         raise EnvironmentVariableNotSetError(msg)
 
-    url_list = Scraper.get_patent_url(page=1)
-
-    patent_infos: list[PDFInfo] = []
-    for url in url_list:
-        patent_data = Scraper.get_patent_information(url)
-        logger.info(patent_data)
-        patent_id = scraper_database_client.insert_patent(patent=patent_data)
-
-        image_path_list = Scraper.get_patent_image(url)
-        logger.info(image_path_list)
-
-        if patent_id is None:
-            continue
-
-        for image in image_path_list.image_list:
-            image_embedding = embedding_model.process(image_path=image.image_path)
-
-            search_database_client.insert_vector(
-                embedding=image_embedding, patent_id=patent_id, page=image.page, content=image.image_path, is_image=True
-            )
-
-        patent_infos.append(
-            PDFInfo(patent_id=patent_id, patent_file_path=patent_data.PatentFilePath, patent_title=patent_data.Title)
-        )
+    job = await IngestionJobs.submit(user_id=int(access_token.sub), keyword=patent_keyword.split()[0])
+    if job is None:
+        raise HTTPException(500, "Failed to queue the ingestion job")
 
-    logger.info(patent_infos)
-    Scraper.destroy_scraper()
-
-    results = pdf_extractor.process_multiple([info.patent_file_path for info in patent_infos], POPPLER_PATH)
-    logger.debug("| Finish OCR |")
-
-    regex_pattern = r"---\s*Page\s*(\d+)\s*---\s*([\s\S]*?)(?=(?:---\s*Page\s*\d+\s*---)|$)"
-    for index, items in enumerate(results.items()):
-        pdf_path, output_path = items[0], items[1]
-        if output_path is None:
-            continue
-
-        with Path.open(Path(output_path), mode="r", encoding="utf-8") as f:
-            text = f.read()
-            text_split = re.findall(pattern=regex_pattern, string=text)
-
-        pdf_chunk_embeddings: list[PDFChunkEmbedding] = [
-            PDFChunkEmbedding(
-                patent_id=patent_infos[index].patent_id,
-                page_number=chunk[0],
-                content=chunk[1],
-                embedding=llm_client.embed_text(chunk[1]),
-            )
-            for chunk in text_split
-        ]
-
-        for pdf_chunk_embedding in pdf_chunk_embeddings:
-            search_database_client.insert_vector(
-                embedding=pdf_chunk_embedding.embedding,
-                patent_id=patent_infos[index].patent_id,
-                page=pdf_chunk_embedding.page_number,
-                content=pdf_chunk_embedding.content,
-                is_image=False,
-            )
-        msg = f"Successfully processed {pdf_path} -> {output_path}"
-        logger.info(msg)
-
-    return [patent_info.patent_id for patent_info in patent_infos]
+    return job
@@ -0,0 +1,80 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter, BackgroundTasks, Depends
+
+from Backend.application.dependency.dependency import require_admin
+from Backend.utility.handler.database.database import DatabaseConnection
+from Backend.utility.handler.database.neighbor import NeighborOperation
+from Backend.utility.handler.lazy import LazyHandlers
+from Backend.utility.model.handler.lazy import LAZY_HANDLER_LIST, LazyHandlerStatus
+
+router = APIRouter(prefix="/system", dependencies=[Depends(require_admin)])
+
+neighbor_database_client = NeighborOperation()
+
+
+@router.get("/handlers/")
+async def get_handler_status() -> list[LazyHandlerStatus]:
+    """
+    Report which heavy handlers this worker has loaded and how long each took.
+
+    Returns:
+        list[LazyHandlerStatus]: One entry per lazily loaded handler.
+
+    """
+    return [handler.status() for handler in LazyHandlers.values()]
+
+
+@router.post("/warm-up/")
+async def warm_up(handlers: list[LAZY_HANDLER_LIST] | None = None) -> list[LazyHandlerStatus]:
+    """
+    Load heavy handlers now, so the first real request does not pay for it.
+
+    Only the worker serving this request is warmed up; call it once per worker, e.g. from a
+    readiness probe.
+
+    Args:
+        handlers (list[LAZY_HANDLER_LIST] | None): The handlers to load, all of them by default.
+
+    Returns:
+        list[LazyHandlerStatus]: The status of every handler after loading.
+
+    """
+    names = handlers or list(LazyHandlers)
+    # model loading is blocking, load them side by side off the event loop
+    await asyncio.gather(*(asyncio.to_thread(LazyHandlers[name].get) for name in names))
+
+    return [handler.status() for handler in LazyHandlers.values()]
+
+
+@router.post("/rebuild-vector-indexes/")
+async def rebuild_vector_indexes() -> bool:
+    """
+    Drop and rebuild the embedding ANN indexes with the current `VECTOR_INDEX_*` settings.
+
+    Needed after switching `VECTOR_INDEX_TYPE`, and for IVFFlat after a large backfill.
+
+    Returns:
+        bool: True once the indexes are rebuilt.
+
+    """
+    # index builds take minutes on a full corpus, keep them off the event loop
+    await asyncio.to_thread(DatabaseConnection.create_vector_indexes, rebuild=True)
+    return True
+
+
+@router.post("/rebuild-patent-neighbors/")
+async def rebuild_patent_neighbors(background_tasks: BackgroundTasks) -> bool:
+    """
+    Recompute the related-patent table of the whole corpus in the background.
+
+    Returns:
+        bool: True once the rebuild is scheduled.
+
+    """
+    background_tasks.add_task(neighbor_database_client.refresh_all)
+    return True
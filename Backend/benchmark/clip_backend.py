@@ -0,0 +1,122 @@
+# Code by AkinoAlice@TyrantRey
+
+# CLIP image embedding backends compared on CPU: load time, throughput, peak memory and the
+# cosine similarity of each backend's embeddings to the fp32 torch ones.
+# Every backend runs in its own process so the peak RSS is its own; `onnx` needs the extra:
+#
+#     CLIP_TORCH_THREADS=8 python -m Backend.benchmark.clip_backend ./patent_image --backends torch int8 onnx
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".tif", ".tiff"}
+
+
+def worker(args: argparse.Namespace, image_paths: list[str]) -> None:
+    # before the import: the cache singleton is created with the module
+    os.environ["CONTENT_EMBEDDING_CACHE_PATH"] = str(Path(args.output).with_suffix(".sqlite3"))
+    os.environ["CONTENT_EMBEDDING_CACHE_MAX_BYTES"] = "0"
+
+    from Backend.utility.handler.embedding import ImageEmbedding  # noqa: PLC0415
+
+    start = time.perf_counter()
+    embedding_model = ImageEmbedding(backend=args.worker)
+    load_seconds = time.perf_counter() - start
+    embedding_model.process_batch(image_paths[:2], batch_size=2)  # warm-up
+
+    start = time.perf_counter()
+    embeddings = embedding_model.process_batch(image_paths, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    np.save(args.output, embeddings)
+
+    # ru_maxrss is in KiB on Linux
+    result = {
+        "load_seconds": load_seconds,
+        "images_per_second": len(image_paths) / elapsed,
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+    print(json.dumps(result))  # noqa: T201
+
+
+def cosine_similarity(embeddings: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    return np.sum(embeddings * reference, axis=1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("image_dir")
+    parser.add_argument("--limit", type=int, default=128)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8", "onnx"])
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    image_paths = sorted(str(path) for path in Path(args.image_dir).rglob("*") if path.suffix.lower() in IMAGE_SUFFIXES)
+    image_paths = image_paths[: args.limit]
+    if not image_paths:
+        print("no images found")  # noqa: T201
+        return
+
+    if args.worker:
+        worker(args, image_paths)
+        return
+
+    # the fp32 model is the reference, always run it first
+    backends = ["torch", *[backend for backend in args.backends if backend != "torch"]]
+
+    print(  # noqa: T201
+        f"{'backend':<10}{'load s':>10}{'images/s':>12}{'peak MiB':>12}{'mean cos':>12}{'min cos':>12}"
+    )
+    with tempfile.TemporaryDirectory() as output_dir:
+        reference = None
+        for backend in backends:
+            output = Path(output_dir) / f"{backend}.npy"
+            process = subprocess.run(  # noqa: S603
+                [
+                    sys.executable,
+                    "-m",
+                    "Backend.benchmark.clip_backend",
+                    args.image_dir,
+                    f"--limit={args.limit}",
+                    f"--batch-size={args.batch_size}",
+                    f"--worker={backend}",
+                    f"--output={output}",
+                ],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            if process.returncode != 0:
+                print(f"{backend:<10}failed: {process.stderr.strip().splitlines()[-1:]}")  # noqa: T201
+                if reference is None:
+                    return
+                continue
+
+            result = json.loads(process.stdout.strip().splitlines()[-1])
+            embeddings = np.load(output)
+            if reference is None:
+                reference = embeddings
+            similarity = cosine_similarity(embeddings, reference)
+
+            print(  # noqa: T201
+                f"{backend:<10}{result['load_seconds']:>10.1f}{result['images_per_second']:>12.1f}"
+                f"{result['peak_rss_mib']:>12.0f}{similarity.mean():>12.4f}{similarity.min():>12.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
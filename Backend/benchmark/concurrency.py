@@ -0,0 +1,82 @@
+# Code by AkinoAlice@TyrantRey
+
+# Requests per second of a running API with N parallel clients.
+# Start one uvicorn worker, log in to get an access token, then run e.g.
+#
+#     python -m Backend.benchmark.concurrency --access-token <token> --clients 1 8 32 64
+#
+# Run it once on a build with the synchronous database calls and once with the async
+# engine to compare; with sync calls the throughput stays flat as clients are added.
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def client_loop(
+    client: httpx.AsyncClient, path: str, params: dict[str, str], deadline: float, latencies: list[float]
+) -> int:
+    errors = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(path, params=params)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code >= 400:  # noqa: PLR2004
+            errors += 1
+    return errors
+
+
+async def run(base_url: str, access_token: str, path: str, params: dict[str, str], clients: int, duration: float):
+    latencies: list[float] = []
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        cookies={"access_token": access_token},
+        timeout=60,
+        limits=httpx.Limits(max_connections=clients),
+    ) as client:
+        start = time.perf_counter()
+        errors = await asyncio.gather(
+            *[client_loop(client, path, params, deadline, latencies) for _ in range(clients)]
+        )
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    print(  # noqa: T201
+        f"clients {clients:>4}: {len(latencies) / elapsed:>8.1f} req/s, "
+        f"p50 {statistics.median(latencies) * 1000:>7.1f}ms, p95 {p95 * 1000:>7.1f}ms, errors {sum(errors)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000/api/v1")
+    parser.add_argument("--access-token", required=True)
+    parser.add_argument("--path", default="/search/full-text/")
+    parser.add_argument("--keyword", default="鞋面")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    for clients in args.clients:
+        asyncio.run(
+            run(
+                args.base_url,
+                args.access_token,
+                args.path,
+                {"search_keywords": args.keyword},
+                clients,
+                args.duration,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Code by AkinoAlice@TyrantRey
+
+# Full-text search benchmark on a synthetic patent corpus.
+# Run it against a scratch database only, it inserts `--rows` synthetic patents:
+#
+#     python -m Backend.benchmark.full_text_search --rows 1000000
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from Backend.utility.handler.database.database import DatabaseConnection
+from Backend.utility.handler.database.search import SearchEngineOperation
+
+WORDS = [
+    "shoe",
+    "upper",
+    "sole",
+    "cushion",
+    "lace",
+    "textile",
+    "knit",
+    "polymer",
+    "sensor",
+    "battery",
+    "circuit",
+    "antenna",
+    "valve",
+    "bearing",
+    "hinge",
+    "lens",
+]
+
+POPULATE_SQL = """
+    INSERT INTO patent (
+        title, application_date, publication_date, application_number, publication_number,
+        applicant, inventor, attorney, priority, gazette_ipc, ipc, gazette_volume,
+        kind_codes, patent_url, patent_file_path
+    )
+    SELECT
+        w[1 + (random() * 15)::int] || ' ' || w[1 + (random() * 15)::int] || ' ' || w[1 + (random() * 15)::int],
+        20250101, 20250601, 'TW' || g, 'TWAN-' || g,
+        'applicant ' || (g % 5000), '', '', '', '', 'A43B ' || (g % 100), '', 'A', '', ''
+    FROM generate_series(1, :rows) AS g, (SELECT CAST(:words AS text[]) AS w) AS words
+"""
+
+# the pre-index query shape: the tsvector is computed per row and cannot use an index
+SEQUENTIAL_SQL = """
+    SELECT patent_id FROM patent
+    WHERE to_tsvector('simple', title) @@ websearch_to_tsquery('simple', :keyword)
+"""
+
+
+def populate(rows: int) -> None:
+    start = time.perf_counter()
+    DatabaseConnection.run_raw_query(POPULATE_SQL, param={"rows": rows, "words": WORDS})
+    DatabaseConnection.run_raw_query("ANALYZE patent")
+    print(f"populated {rows} rows in {time.perf_counter() - start:.1f}s")  # noqa: T201
+
+
+async def measure(func, repeat: int) -> tuple[float, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+async def run(args: argparse.Namespace) -> None:
+    search_client = SearchEngineOperation()
+
+    for line in await search_client.explain_full_text_search(args.keyword, analyze=True):
+        print(line)  # noqa: T201
+
+    indexed = await measure(lambda: search_client.full_text_search(args.keyword), args.repeat)
+    sequential = await measure(
+        lambda: DatabaseConnection.run_raw_query_async(SEQUENTIAL_SQL, param={"keyword": args.keyword}), args.repeat
+    )
+
+    print(f"indexed search_vector: median {indexed[0]:.1f}ms max {indexed[1]:.1f}ms")  # noqa: T201
+    print(f"per-row to_tsvector:   median {sequential[0]:.1f}ms max {sequential[1]:.1f}ms")  # noqa: T201
+
+    # keyset pagination: no OFFSET rows are discarded, but every page ranks all the matches
+    cursor = None
+    for page_number in range(1, args.pages + 1):
+        start = time.perf_counter()
+        page = await search_client.full_text_search(args.keyword, limit=20, cursor=cursor)
+        elapsed = (time.perf_counter() - start) * 1000
+        if page.total_estimate is not None:
+            print(f"about {page.total_estimate} matches")  # noqa: T201
+        print(f"page {page_number}: {elapsed:.1f}ms")  # noqa: T201
+
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--keyword", default="cushion sensor")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--skip-populate", action="store_true")
+    args = parser.parse_args()
+
+    if not args.skip_populate:
+        populate(args.rows)
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Code by AkinoAlice@TyrantRey
+
+# CLIP image embedding throughput: one image per call against process_batch at several batch sizes.
+# Point it at a directory of patent images; the content embedding cache must be empty or
+# disabled for the timings to mean anything, so it uses a throwaway cache file:
+#
+#     CLIP_TORCH_THREADS=8 python -m Backend.benchmark.image_embedding ./patent_image --batch-sizes 1 8 16 32
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".tif", ".tiff"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("image_dir")
+    parser.add_argument("--limit", type=int, default=128)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    image_paths = sorted(str(path) for path in Path(args.image_dir).rglob("*") if path.suffix.lower() in IMAGE_SUFFIXES)
+    image_paths = image_paths[: args.limit]
+    if not image_paths:
+        print("no images found")  # noqa: T201
+        return
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # before the import: the cache singleton is created with the module
+        os.environ["CONTENT_EMBEDDING_CACHE_PATH"] = str(Path(cache_dir) / "embedding.sqlite3")
+        os.environ["CONTENT_EMBEDDING_CACHE_MAX_BYTES"] = "0"
+
+        from Backend.utility.handler.embedding import ImageEmbedding  # noqa: PLC0415
+
+        embedding_model = ImageEmbedding()
+        embedding_model.process_batch(image_paths[:2], batch_size=2)  # warm-up
+
+        start = time.perf_counter()
+        for image_path in image_paths:
+            embedding_model._embed(image_path)  # noqa: SLF001
+        print(f"single image:     {len(image_paths) / (time.perf_counter() - start):>8.1f} images/s")  # noqa: T201
+
+        for batch_size in args.batch_sizes:
+            start = time.perf_counter()
+            embeddings = embedding_model.process_batch(image_paths, batch_size=batch_size)
+            elapsed = time.perf_counter() - start
+            throughput = len(image_paths) / elapsed
+            print(f"batch size {batch_size:>4}: {throughput:>8.1f} images/s {embeddings.shape}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# Code by AkinoAlice@TyrantRey
+
+# Throughput of the Postgres task queue with several local worker processes.
+# Queues no-op `neighbors` tasks (empty patent lists), so only claiming, heartbeats and
+# completion are measured, then checks every task ran exactly once. Needs a user to own the
+# jobs (e.g. from /dev/create-default-user/); the jobs are deleted afterwards:
+#
+#     python -m Backend.benchmark.ingestion_queue --tasks 2000 --workers 1 2 4 8
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+
+from sqlalchemy import delete, func, select
+
+from Backend.utility.handler.database.database import DatabaseConnection
+from Backend.utility.handler.database.job import IngestionJobOperation
+from Backend.utility.handler.database.task import IngestionTaskOperation
+from Backend.utility.model.application.job import IngestionFollowUp, NeighborsTaskPayload
+from Backend.utility.model.handler.database.scheme import IngestionJobScheme, IngestionTaskScheme, UserScheme
+
+
+async def queue_jobs(user_id: int, jobs: int, tasks: int) -> list[int]:
+    job_client = IngestionJobOperation()
+    task_client = IngestionTaskOperation()
+    payload = NeighborsTaskPayload(patent_ids=[]).model_dump()
+
+    job_ids = []
+    for _ in range(jobs):
+        job = await job_client.create(user_id=user_id, keyword="benchmark")
+        if job is None:
+            return job_ids
+        job_ids.append(job.job_id)
+        await task_client.enqueue(job.job_id, [IngestionFollowUp(kind="neighbors", payload=payload)] * (tasks // jobs))
+
+    return job_ids
+
+
+async def run(args: argparse.Namespace) -> None:
+    users = await DatabaseConnection.run_read_query_async(select(UserScheme.user_id).limit(1))
+    if not users:
+        print("no users found, create one first")  # noqa: T201
+        return
+
+    print(f"{'workers':>8}{'tasks/s':>12}{'ran once':>10}{'failed':>8}")  # noqa: T201
+    for workers in args.workers:
+        job_ids = await queue_jobs(users[0]["user_id"], args.jobs, args.tasks)
+
+        command = [
+            sys.executable,
+            "-m",
+            "Backend.worker",
+            "--kinds",
+            "neighbors",
+            "--exit-when-idle",
+            f"--concurrency={args.concurrency}",
+        ]
+        start = time.perf_counter()
+        processes = [subprocess.Popen(command, stdout=subprocess.DEVNULL) for _ in range(workers)]  # noqa: S603
+        for process in processes:
+            await asyncio.to_thread(process.wait)
+        elapsed = time.perf_counter() - start
+
+        counts = await DatabaseConnection.run_read_query_async(
+            select(
+                func.count().filter(IngestionTaskScheme.status == "succeeded").label("succeeded"),
+                func.count().filter(IngestionTaskScheme.attempts == 1).label("ran_once"),
+                func.count().filter(IngestionTaskScheme.status == "failed").label("failed"),
+            ).where(IngestionTaskScheme.job_id.in_(job_ids))
+        )
+        succeeded, ran_once, failed = counts[0]["succeeded"], counts[0]["ran_once"], counts[0]["failed"]
+        print(f"{workers:>8}{succeeded / elapsed:>12.1f}{ran_once:>10}{failed:>8}")  # noqa: T201
+
+        # the tasks go with their jobs
+        await DatabaseConnection.run_write_async(
+            delete(IngestionJobScheme).where(IngestionJobScheme.job_id.in_(job_ids))
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
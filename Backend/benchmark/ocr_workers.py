@@ -0,0 +1,107 @@
+# Code by AkinoAlice@TyrantRey
+
+# OCR pages per minute of PDFExtractor's thread and process pools against the worker count.
+# Every configuration runs in its own process; the time to start the pool and load the readers
+# is reported apart from the throughput, measured after a warm-up PDF:
+#
+#     POPPLER_PATH=/usr/bin python -m Backend.benchmark.ocr_workers ./patent --workers 1 2 4 8
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def worker(args: argparse.Namespace, pdf_paths: list[str], poppler_path: str) -> None:
+    from Backend.utility.handler.pdf_extractor import PDFExtractor  # noqa: PLC0415
+    from Backend.utility.handler.pdf_pages import page_count  # noqa: PLC0415
+
+    executor, max_workers = args.worker.split(":")
+    pages = sum(page_count(pdf_path, poppler_path) for pdf_path in pdf_paths)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        extractor = PDFExtractor(max_workers=int(max_workers), executor=executor)
+        extractor.process_multiple(pdf_paths[:1], poppler_path, output_dir)  # warm-up, starts every worker
+        startup_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = extractor.process_multiple(pdf_paths, poppler_path, output_dir)
+        elapsed = time.perf_counter() - start
+        extractor.close()
+
+    # ru_maxrss is in KiB on Linux; the children are the process pool's workers
+    result = {
+        "startup_seconds": startup_seconds,
+        "pages_per_minute": pages / elapsed * 60,
+        "failed": sum(output_path is None for output_path in results.values()),
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "workers_peak_rss_mib": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }
+    print(json.dumps(result))  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdf_dir")
+    parser.add_argument("--limit", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--executors", nargs="+", choices=["thread", "process"], default=["thread", "process"])
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    poppler_path = os.environ.get("POPPLER_PATH")
+    if poppler_path is None:
+        print("POPPLER_PATH is not set")  # noqa: T201
+        return
+
+    pdf_paths = sorted(str(path) for path in Path(args.pdf_dir).rglob("*.pdf"))[: args.limit]
+    if not pdf_paths:
+        print("no PDFs found")  # noqa: T201
+        return
+
+    if args.worker:
+        worker(args, pdf_paths, poppler_path)
+        return
+
+    print(f"{len(pdf_paths)} PDFs on {os.cpu_count()} cores")  # noqa: T201
+    print(  # noqa: T201
+        f"{'executor':<10}{'workers':>8}{'startup s':>11}{'pages/min':>11}{'failed':>8}"
+        f"{'main MiB':>10}{'worker MiB':>12}"
+    )
+    for executor in args.executors:
+        for max_workers in args.workers:
+            process = subprocess.run(  # noqa: S603
+                [
+                    sys.executable,
+                    "-m",
+                    "Backend.benchmark.ocr_workers",
+                    args.pdf_dir,
+                    f"--limit={args.limit}",
+                    f"--worker={executor}:{max_workers}",
+                ],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            if process.returncode != 0:
+                error = process.stderr.strip().splitlines()[-1:]
+                print(f"{executor:<10}{max_workers:>8} failed: {error}")  # noqa: T201
+                continue
+
+            result = json.loads(process.stdout.strip().splitlines()[-1])
+            print(  # noqa: T201
+                f"{executor:<10}{max_workers:>8}{result['startup_seconds']:>11.1f}{result['pages_per_minute']:>11.1f}"
+                f"{result['failed']:>8}{result['peak_rss_mib']:>10.0f}{result['workers_peak_rss_mib']:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
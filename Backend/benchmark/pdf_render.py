@@ -0,0 +1,88 @@
+# Code by AkinoAlice@TyrantRey
+
+# Peak RSS of rasterising PDFs for OCR: every page at once against `iter_pages` with several
+# memory budgets (MiB). PIL's bitmaps are not seen by tracemalloc, so every run is a process
+# of its own and reports its ru_maxrss above the RSS right after the imports. Give it PDFs of
+# different lengths; with `iter_pages` the peak should stay flat as the page count grows:
+#
+#     POPPLER_PATH=/usr/bin python -m Backend.benchmark.pdf_render ./patent/*.pdf --budgets 64 128 256
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+def worker(pdf_path: str, mode: str, poppler_path: str) -> None:
+    import numpy as np  # noqa: PLC0415
+    from pdf2image import convert_from_path  # noqa: PLC0415
+
+    from Backend.utility.handler.pdf_pages import PDF_DPI, iter_pages  # noqa: PLC0415
+
+    # ru_maxrss is in KiB on Linux
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    start = time.perf_counter()
+    if mode == "all":
+        images = iter(convert_from_path(pdf_path, dpi=PDF_DPI, poppler_path=poppler_path))
+    else:
+        images = iter_pages(pdf_path, poppler_path, memory_budget=int(mode) * 1024**2)
+
+    pages = 0
+    for image in images:
+        # the copy OCR makes of every page
+        np.array(image)
+        pages += 1
+    elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    result = {"pages": pages, "seconds": elapsed, "peak_mib": peak, "above_baseline_mib": peak - baseline}
+    print(json.dumps(result))  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdf_paths", nargs="+")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[64, 128, 256])
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    poppler_path = os.environ.get("POPPLER_PATH")
+    if poppler_path is None:
+        print("POPPLER_PATH is not set")  # noqa: T201
+        return
+
+    if args.worker:
+        worker(args.pdf_paths[0], args.worker, poppler_path)
+        return
+
+    print(f"{'pdf':<32}{'pages':>7}{'mode':>8}{'seconds':>10}{'peak MiB':>10}{'rendering MiB':>15}")  # noqa: T201
+    for pdf_path in args.pdf_paths:
+        for mode in ["all", *(str(budget) for budget in args.budgets)]:
+            process = subprocess.run(  # noqa: S603
+                [sys.executable, "-m", "Backend.benchmark.pdf_render", pdf_path, f"--worker={mode}"],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            name = Path(pdf_path).name[-32:]
+            if process.returncode != 0:
+                error = process.stderr.strip().splitlines()[-1:]
+                print(f"{name:<32}{'':>7}{mode:>8} failed: {error}")  # noqa: T201
+                continue
+
+            result = json.loads(process.stdout.strip().splitlines()[-1])
+            print(  # noqa: T201
+                f"{name:<32}{result['pages']:>7}{mode:>8}{result['seconds']:>10.1f}"
+                f"{result['peak_mib']:>10.0f}{result['above_baseline_mib']:>15.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
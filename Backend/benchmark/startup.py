@@ -0,0 +1,71 @@
+# Code by AkinoAlice@TyrantRey
+
+# Import time and resident memory of the API app, what every worker pays before serving a
+# request. Each run is a fresh interpreter; with --warm-up the heavy handlers are loaded
+# afterwards too, showing what lazy loading defers:
+#
+#     python -m Backend.benchmark.startup --runs 5 --warm-up
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+
+def worker(warm_up: bool) -> None:
+    start = time.perf_counter()
+    import Backend.main  # noqa: F401, PLC0415
+
+    # ru_maxrss is in KiB on Linux
+    result = {
+        "import_seconds": time.perf_counter() - start,
+        "import_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+    if warm_up:
+        from Backend.utility.handler.lazy import LazyHandlers  # noqa: PLC0415
+
+        start = time.perf_counter()
+        for handler in LazyHandlers.values():
+            handler.get()
+        result["warm_up_seconds"] = time.perf_counter() - start
+        result["warm_up_rss_mib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(json.dumps(result))  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warm-up", action="store_true")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.warm_up)
+        return
+
+    command = [sys.executable, "-m", "Backend.benchmark.startup", "--worker"]
+    if args.warm_up:
+        command.append("--warm-up")
+
+    results = []
+    for _ in range(args.runs):
+        process = subprocess.run(command, capture_output=True, text=True, check=False)  # noqa: S603
+        if process.returncode != 0:
+            print(f"startup failed: {process.stderr.strip().splitlines()[-1:]}")  # noqa: T201
+            return
+        results.append(json.loads(process.stdout.strip().splitlines()[-1]))
+
+    for key in results[0]:
+        values = [result[key] for result in results]
+        print(f"{key:<18}median {statistics.median(values):>10.2f}  max {max(values):>10.2f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
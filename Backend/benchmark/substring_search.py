@@ -0,0 +1,90 @@
+# Code by AkinoAlice@TyrantRey
+
+# Side-by-side benchmark of the CJK substring search strategies (pg_trgm vs patent_bigram).
+# Run it against a scratch database only, it inserts `--rows` synthetic patents:
+#
+#     python -m Backend.benchmark.substring_search --rows 1000000
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from Backend.utility.handler.database.bigram import BigramOperation
+from Backend.utility.handler.database.database import DatabaseConnection
+from Backend.utility.handler.database.search import SearchEngineOperation
+
+# characters common in Taiwanese patent titles, so keywords have realistic selectivity
+CHARACTERS = "一種鞋面結構裝置方法系統及其製造用於電池模組控制電路感測器材料組合物光學鏡頭之底"
+
+POPULATE_SQL = """
+    INSERT INTO patent (
+        title, application_date, publication_date, application_number, publication_number,
+        applicant, inventor, attorney, priority, gazette_ipc, ipc, gazette_volume,
+        kind_codes, patent_url, patent_file_path
+    )
+    SELECT
+        (SELECT string_agg(substr(:characters, 1 + (random() * (length(:characters) - 1))::int, 1), '')
+         FROM generate_series(1, 8 + g % 12)),
+        20250101, 20250601, 'TW' || g, 'TWAN-' || g,
+        '股份有限公司' || (g % 5000), '', '', '', '', 'A43B', '', 'A', '', ''
+    FROM generate_series(1, :rows) AS g
+"""
+
+
+def populate(rows: int) -> None:
+    start = time.perf_counter()
+    DatabaseConnection.run_raw_query(POPULATE_SQL, param={"rows": rows, "characters": CHARACTERS})
+    DatabaseConnection.run_raw_query("ANALYZE patent")
+    print(f"populated {rows} rows in {time.perf_counter() - start:.1f}s")  # noqa: T201
+
+    start = time.perf_counter()
+    BigramOperation().rebuild()
+    print(f"built patent_bigram in {time.perf_counter() - start:.1f}s")  # noqa: T201
+
+
+async def measure(search_client: SearchEngineOperation, keyword: str, repeat: int) -> tuple[float, set[int]]:
+    timings = []
+    patent_ids: set[int] = set()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        page = await search_client.full_text_search(keyword, limit=100)
+        patent_ids = {patent.Patent_id for patent in page.patents}
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), patent_ids
+
+
+async def run(args: argparse.Namespace) -> None:
+    trigram_client = SearchEngineOperation(substring_search_mode="trigram")
+    bigram_client = SearchEngineOperation(substring_search_mode="bigram")
+
+    print(f"{'keyword':<12}{'hits':>8}{'trigram ms':>14}{'bigram ms':>14}")  # noqa: T201
+    for keyword in args.keywords:
+        trigram_ms, trigram_ids = await measure(trigram_client, keyword, args.repeat)
+        bigram_ms, bigram_ids = await measure(bigram_client, keyword, args.repeat)
+
+        # both strategies must keep plain LIKE semantics
+        if trigram_ids != bigram_ids:
+            print(f"result mismatch for {keyword}: {len(trigram_ids)} vs {len(bigram_ids)}")  # noqa: T201
+
+        print(f"{keyword:<12}{len(bigram_ids):>8}{trigram_ms:>14.1f}{bigram_ms:>14.1f}")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keywords", nargs="+", default=["鞋面", "鞋面結", "電池模組", "光學鏡頭裝置"])
+    parser.add_argument("--skip-populate", action="store_true")
+    args = parser.parse_args()
+
+    if not args.skip_populate:
+        populate(args.rows)
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Code by AkinoAlice@TyrantRey
+
+# Per-row insert_vector vs bulk_insert_vectors (binary COPY) on random 1536-d embeddings.
+# Run it against a scratch database only, it writes into patent_content_vector for
+# patents that already exist (populate them first, e.g. with benchmark.full_text_search):
+#
+#     python -m Backend.benchmark.vector_ingestion --rows 5000
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+from Backend.utility.handler.database.database import DatabaseConnection
+from Backend.utility.handler.database.search import SearchEngineOperation
+
+DIMENSION = 1536
+
+
+def make_rows(patent_ids: list[int], rows: int) -> list[tuple[int, int, str, list[float]]]:
+    # pages from 2 up, so the abstract page and its bigrams are left alone
+    return [
+        (
+            patent_ids[i % len(patent_ids)],
+            2 + i // len(patent_ids),
+            f"chunk {i}",
+            [random.random() for _ in range(DIMENSION)],  # noqa: S311
+        )
+        for i in range(rows)
+    ]
+
+
+async def run(args: argparse.Namespace) -> None:
+    patents = DatabaseConnection.run_raw_query("SELECT patent_id FROM patent LIMIT 1000")
+    if not isinstance(patents, list) or not patents:
+        print("no patents found, populate the database first")  # noqa: T201
+        return
+
+    patent_ids = [int(row["patent_id"]) for row in patents]
+    search_client = SearchEngineOperation()
+
+    rows = make_rows(patent_ids, args.per_row)
+    start = time.perf_counter()
+    for patent_id, page, content, embedding in rows:
+        await search_client.insert_vector(embedding=embedding, patent_id=patent_id, page=page, content=content)
+    elapsed = time.perf_counter() - start
+    print(f"insert_vector:       {len(rows) / elapsed:>10.1f} rows/s")  # noqa: T201
+
+    rows = make_rows(patent_ids, args.rows)
+    for offset in range(0, len(rows), args.batch_size):
+        result = await search_client.bulk_insert_vectors(rows[offset : offset + args.batch_size])
+        print(f"bulk_insert_vectors: {result.rows_per_second:>10.1f} rows/s ({result.rows} rows)")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--per-row", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# Code by AkinoAlice@TyrantRey
+
+# Recall and latency of ANN similarity search against exact search.
+# Needs embeddings in patent_content_vector (e.g. from benchmark.vector_ingestion) and the
+# index configured by VECTOR_INDEX_TYPE:
+#
+#     python -m Backend.benchmark.vector_recall --queries 50 --ef-search 10 40 100 200
+#     VECTOR_INDEX_TYPE=ivfflat python -m Backend.benchmark.vector_recall --rebuild --probes 1 5 10 20
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import func, select
+
+from Backend.utility.handler.database.database import DatabaseConnection
+from Backend.utility.handler.database.vector_index import ann_search_settings
+from Backend.utility.model.handler.database.scheme import ContentVectorScheme
+
+# the planner then cannot use the ANN index and falls back to an exact scan
+EXACT_SETTINGS = {"enable_indexscan": "off"}
+
+
+async def nearest(embedding, k: int, settings: dict[str, str]) -> tuple[float, list[int]]:
+    query = (
+        select(ContentVectorScheme.id)
+        .order_by(ContentVectorScheme.embedding.cosine_distance(embedding))
+        .limit(k)
+    )
+
+    start = time.perf_counter()
+    ids = await DatabaseConnection.run_read_query_vector_async(query, settings=settings)
+    return (time.perf_counter() - start) * 1000, list(ids)
+
+
+async def evaluate(
+    query_embeddings: list, truth: list[list[int]], k: int, settings: dict[str, str]
+) -> tuple[float, float, float]:
+    latencies = []
+    recalls = []
+    for embedding, expected in zip(query_embeddings, truth):
+        latency, ids = await nearest(embedding, k, settings)
+        latencies.append(latency)
+        recalls.append(len(set(ids) & set(expected)) / len(expected) if expected else 1.0)
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return statistics.mean(recalls), statistics.median(latencies), p95
+
+
+async def run(args: argparse.Namespace) -> None:
+    sample = select(ContentVectorScheme.embedding).order_by(func.random()).limit(args.queries)
+    query_embeddings = list(await DatabaseConnection.run_read_query_vector_async(sample))
+    if not query_embeddings:
+        print("no embeddings found, ingest some first")  # noqa: T201
+        return
+
+    truth = []
+    exact_latencies = []
+    for embedding in query_embeddings:
+        latency, ids = await nearest(embedding, args.k, EXACT_SETTINGS)
+        exact_latencies.append(latency)
+        truth.append(ids)
+
+    print(f"{'setting':<20}{'recall@' + str(args.k):>12}{'p50 ms':>10}{'p95 ms':>10}")  # noqa: T201
+    exact_latencies.sort()
+    exact_p50, exact_p95 = statistics.median(exact_latencies), exact_latencies[int(len(exact_latencies) * 0.95) - 1]
+    print(f"{'exact':<20}{1.0:>12.3f}{exact_p50:>10.1f}{exact_p95:>10.1f}")  # noqa: T201
+
+    for ef_search in args.ef_search:
+        recall, p50, p95 = await evaluate(query_embeddings, truth, args.k, ann_search_settings(ef_search=ef_search))
+        print(f"{'ef_search=' + str(ef_search):<20}{recall:>12.3f}{p50:>10.1f}{p95:>10.1f}")  # noqa: T201
+
+    for probes in args.probes:
+        recall, p50, p95 = await evaluate(query_embeddings, truth, args.k, ann_search_settings(probes=probes))
+        print(f"{'probes=' + str(probes):<20}{recall:>12.3f}{p50:>10.1f}{p95:>10.1f}")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--ef-search", type=int, nargs="*", default=[10, 40, 100, 200])
+    parser.add_argument("--probes", type=int, nargs="*", default=[])
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        start = time.perf_counter()
+        DatabaseConnection.create_vector_indexes(rebuild=True)
+        print(f"built vector indexes in {time.perf_counter() - start:.1f}s")  # noqa: T201
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,35 @@
 
 import os
 import time
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from Backend.application.auth import authorization
 from Backend.application.history import history
+from Backend.application.jobs import jobs
+from Backend.application.metrics import metrics
 from Backend.application.report import report
 from Backend.application.response import response
 from Backend.application.search import search
+from Backend.application.system import system
+from Backend.utility.handler.database.history import SearchHistoryBuffer
+from Backend.utility.handler.ingestion import IngestionJobs
 from Backend.utility.handler.log_handler import Logger
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # continue ingestion jobs interrupted by the last shutdown
+    await IngestionJobs.resume()
+    yield
+    # running jobs go back to the queue, then write the queued search history before the worker exits
+    await IngestionJobs.close()
+    SearchHistoryBuffer.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # development
 GLOBAL_DEBUG_MODE = os.getenv("DEBUG")
@@ -64,6 +81,21 @@ app.include_router(
     prefix="/api/v1",
     tags=["Response"],
 )
+app.include_router(
+    metrics.router,
+    prefix="/api/v1",
+    tags=["Metrics"],
+)
+app.include_router(
+    jobs.router,
+    prefix="/api/v1",
+    tags=["Jobs"],
+)
+app.include_router(
+    system.router,
+    prefix="/api/v1",
+    tags=["System"],
+)
 
 
 @app.middleware("http")
@@ -0,0 +1,31 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import pytest
+
+from Backend.utility.handler import backoff
+from Backend.utility.handler.backoff import backoff_delay
+
+BASE = 10
+MAXIMUM = 600
+
+
+@pytest.mark.parametrize(("attempts", "delay"), [(1, 10), (2, 20), (3, 40), (6, 320)])
+def test_backoff_doubles_per_attempt(attempts: int, delay: float) -> None:
+    for _ in range(100):
+        assert delay / 2 <= backoff_delay(attempts, BASE, MAXIMUM) <= delay
+
+
+@pytest.mark.parametrize("attempts", [7, 10, 50])
+def test_backoff_is_capped(attempts: int) -> None:
+    for _ in range(100):
+        assert 300 <= backoff_delay(attempts, BASE, MAXIMUM) <= 600
+
+
+def test_backoff_jitter_spans_half_the_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(backoff.random, "uniform", lambda low, high: low)
+    assert backoff_delay(3, BASE, MAXIMUM) == 20
+
+    monkeypatch.setattr(backoff.random, "uniform", lambda low, high: high)
+    assert backoff_delay(3, BASE, MAXIMUM) == 40
@@ -0,0 +1,32 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import pytest
+
+from Backend.utility.handler.database.substring_index import extract_bigrams
+
+
+def test_extract_bigrams_of_cjk_text() -> None:
+    assert extract_bigrams("鞋面結構") == {"鞋面", "面結", "結構"}
+
+
+@pytest.mark.parametrize("text", ["", "鞋"])
+def test_extract_bigrams_of_short_text_is_empty(text: str) -> None:
+    assert extract_bigrams(text) == set()
+
+
+def test_extract_bigrams_are_distinct() -> None:
+    assert extract_bigrams("aaaa") == {"aa"}
+
+
+def test_extract_bigrams_keep_case_and_whitespace() -> None:
+    assert extract_bigrams("Ab c") == {"Ab", "b ", " c"}
+
+
+@pytest.mark.parametrize("keyword", ["鞋面", "一種鞋", "結構及其"])
+def test_keyword_bigrams_are_in_every_text_containing_it(keyword: str) -> None:
+    # `candidate_patent_ids` relies on this to never drop a LIKE match
+    text = "一種鞋面結構及其製造方法"
+    assert keyword in text
+    assert extract_bigrams(keyword) <= extract_bigrams(text)
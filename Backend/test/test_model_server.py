@@ -0,0 +1,110 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from Backend.utility.error.model_server import ModelServerError
+from Backend.utility.handler.model_server import DynamicBatcher
+
+# generous, the batcher thread may be scheduled late on a loaded machine
+TIMEOUT = 5
+
+
+class RecordingHandler:
+    def __init__(self) -> None:
+        self.batches: list[list[int]] = []
+
+    def __call__(self, items: list[int]) -> list[int]:
+        self.batches.append(items)
+        return [item * 2 for item in items]
+
+
+def test_items_submitted_together_share_a_batch() -> None:
+    handler = RecordingHandler()
+    batcher = DynamicBatcher("test", handler, max_batch_size=8, max_wait=0.2)
+
+    futures = batcher.submit([1, 2, 3])
+
+    assert [future.result(TIMEOUT) for future in futures] == [2, 4, 6]
+    assert handler.batches == [[1, 2, 3]]
+
+
+def test_batch_is_split_at_max_batch_size() -> None:
+    handler = RecordingHandler()
+    batcher = DynamicBatcher("test", handler, max_batch_size=2, max_wait=0.2)
+
+    futures = batcher.submit([1, 2, 3, 4, 5])
+
+    assert [future.result(TIMEOUT) for future in futures] == [2, 4, 6, 8, 10]
+    assert handler.batches == [[1, 2], [3, 4], [5]]
+
+
+def test_lone_item_waits_at_most_max_wait() -> None:
+    batcher = DynamicBatcher("test", RecordingHandler(), max_batch_size=64, max_wait=0.05)
+
+    start = time.monotonic()
+    (future,) = batcher.submit([1])
+
+    assert future.result(TIMEOUT) == 2
+    assert time.monotonic() - start < 1
+
+
+def test_items_from_several_threads_are_batched() -> None:
+    handler = RecordingHandler()
+    batcher = DynamicBatcher("test", handler, max_batch_size=4, max_wait=0.5)
+    results: dict[int, int] = {}
+
+    def submit(item: int) -> None:
+        (future,) = batcher.submit([item])
+        results[item] = future.result(TIMEOUT)
+
+    threads = [threading.Thread(target=submit, args=(item,)) for item in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(TIMEOUT)
+
+    assert results == {0: 0, 1: 2, 2: 4, 3: 6}
+    assert len(handler.batches) < 4
+
+
+def test_handler_error_fails_the_whole_batch() -> None:
+    def handler(items: list[int]) -> list[int]:
+        msg = "model crashed"
+        raise RuntimeError(msg)
+
+    batcher = DynamicBatcher("test", handler, max_batch_size=8, max_wait=0.05)
+
+    for future in batcher.submit([1, 2]):
+        with pytest.raises(RuntimeError, match="model crashed"):
+            future.result(TIMEOUT)
+
+
+def test_batcher_keeps_serving_after_a_failed_batch() -> None:
+    def handler(items: list[int]) -> list[int]:
+        if 0 in items:
+            msg = "bad item"
+            raise ValueError(msg)
+        return items
+
+    batcher = DynamicBatcher("test", handler, max_batch_size=1, max_wait=0.05)
+    failed, succeeded = batcher.submit([0, 1])
+
+    with pytest.raises(ValueError, match="bad item"):
+        failed.result(TIMEOUT)
+    assert succeeded.result(TIMEOUT) == 1
+
+
+def test_missing_results_fail_their_futures() -> None:
+    batcher = DynamicBatcher("test", lambda items: items[:1], max_batch_size=8, max_wait=0.2)
+
+    first, second, third = batcher.submit([1, 2, 3])
+
+    assert first.result(TIMEOUT) == 1
+    for future in (second, third):
+        with pytest.raises(ModelServerError):
+            future.result(TIMEOUT)
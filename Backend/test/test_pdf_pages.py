@@ -0,0 +1,73 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import pytest
+
+from Backend.utility.handler import pdf_pages
+from Backend.utility.handler.pdf_pages import PDF_DPI, iter_pages, page_bytes
+
+PAGE_SIZE = "595 x 842 pts (A4)"
+PAGES = 7
+
+
+@pytest.fixture
+def rendered_windows(monkeypatch: pytest.MonkeyPatch) -> list[tuple[int, int]]:
+    """Fake poppler: a 7-page PDF whose pages render as their numbers; records every window."""
+    windows: list[tuple[int, int]] = []
+
+    def pdfinfo_from_path(pdf_file_path: str, poppler_path: str) -> dict[str, str]:
+        return {"Pages": str(PAGES), "Page size": PAGE_SIZE}
+
+    def convert_from_path(pdf_file_path: str, dpi: int, first_page: int, last_page: int, poppler_path: str) -> list:
+        assert dpi == PDF_DPI
+        windows.append((first_page, last_page))
+        return list(range(first_page, last_page + 1))
+
+    monkeypatch.setattr(pdf_pages, "pdfinfo_from_path", pdfinfo_from_path)
+    monkeypatch.setattr(pdf_pages, "convert_from_path", convert_from_path)
+    return windows
+
+
+def test_page_bytes_of_letter() -> None:
+    # 8.5 x 11 inches at 300 DPI, RGB
+    assert page_bytes("612 x 792 pts (letter)") == 2550 * 3300 * 3
+
+
+@pytest.mark.parametrize("page_size", [None, "", "unknown"])
+def test_page_bytes_defaults_to_a4(page_size: str | None) -> None:
+    assert page_bytes(page_size) == page_bytes("595.276 x 841.89 pts")
+
+
+def test_iter_pages_renders_windows_within_the_budget(rendered_windows: list[tuple[int, int]]) -> None:
+    # rendered output and decoded images are both held, so three pages need twice their size
+    budget = 3 * 2 * page_bytes(PAGE_SIZE)
+
+    assert list(iter_pages("a.pdf", "/poppler", memory_budget=budget)) == list(range(1, PAGES + 1))
+    assert rendered_windows == [(1, 3), (4, 6), (7, 7)]
+
+
+def test_iter_pages_renders_one_page_at_least(rendered_windows: list[tuple[int, int]]) -> None:
+    assert list(iter_pages("a.pdf", "/poppler", memory_budget=1)) == list(range(1, PAGES + 1))
+    assert rendered_windows == [(page, page) for page in range(1, PAGES + 1)]
+
+
+def test_iter_pages_renders_the_next_window_only_when_needed(rendered_windows: list[tuple[int, int]]) -> None:
+    pages = iter_pages("a.pdf", "/poppler", memory_budget=2 * 2 * page_bytes(PAGE_SIZE))
+
+    assert [next(pages), next(pages)] == [1, 2]
+    assert rendered_windows == [(1, 2)]
+
+    assert next(pages) == 3
+    assert rendered_windows == [(1, 2), (3, 4)]
+
+
+def test_iter_pages_reads_the_budget_from_the_environment(
+    rendered_windows: list[tuple[int, int]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # room for four and a half pages, a window of two
+    monkeypatch.setenv("OCR_RENDER_MEMORY_MB", str(4.5 * page_bytes(PAGE_SIZE) / 1024**2))
+
+    list(iter_pages("a.pdf", "/poppler"))
+
+    assert rendered_windows == [(1, 2), (3, 4), (5, 6), (7, 7)]
@@ -0,0 +1,50 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from Backend.utility.handler.pipeline import PipelineStage
+
+
+class FatalError(Exception): ...
+
+
+def run_stage(stage: PipelineStage[int], items: list[int]) -> None:
+    async def feed() -> None:
+        for item in items:
+            await stage.put(item)
+        await stage.close()
+
+    async def main() -> None:
+        await asyncio.gather(stage.run(), feed())
+
+    asyncio.run(main())
+
+
+def test_failed_item_is_skipped() -> None:
+    handled: list[int] = []
+
+    async def handle(item: int) -> None:
+        if item == 2:
+            raise ValueError(item)
+        handled.append(item)
+
+    stage: PipelineStage[int] = PipelineStage("test", handle, queue_size=2)
+    run_stage(stage, [1, 2, 3])
+
+    assert handled == [1, 3]
+    stats = stage.stats()
+    assert stats.processed == 3
+    assert stats.failed == 1
+
+
+def test_fatal_error_stops_the_stage() -> None:
+    async def handle(item: int) -> None:
+        raise FatalError(item)
+
+    stage: PipelineStage[int] = PipelineStage("test", handle, queue_size=2, fatal=(FatalError,))
+    with pytest.raises(FatalError):
+        run_stage(stage, [1])
@@ -0,0 +1,69 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import base64
+
+import pytest
+
+from Backend.utility.error.database.database import InvalidCursorError
+from Backend.utility.handler.database.search_ranking import decode_cursor, encode_cursor, reciprocal_rank_fusion
+from Backend.utility.model.application.search import SearchCursor
+
+
+def test_cursor_round_trip() -> None:
+    cursor = SearchCursor(rank=1.25, patent_id=42)
+
+    token = encode_cursor(cursor)
+
+    assert decode_cursor(token) == cursor
+
+
+def test_cursor_keeps_the_exact_rank() -> None:
+    # the next page continues strictly after this rank, a rounded value would skip or repeat rows
+    rank = 0.1 + 0.2
+
+    token = encode_cursor(SearchCursor(rank=rank, patent_id=1))
+
+    assert decode_cursor(token).rank == rank
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "not base64!",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        base64.urlsafe_b64encode(b'{"rank": 1.0}').decode(),
+        base64.urlsafe_b64encode(b'{"rank": "high", "patent_id": 1}').decode(),
+    ],
+)
+def test_invalid_cursor_is_rejected(token: str) -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token)
+
+
+def test_reciprocal_rank_fusion_sums_reciprocal_ranks() -> None:
+    fused = reciprocal_rank_fusion([[1, 2], [2, 3]], k=60)
+
+    assert fused == [(2, 1 / 62 + 1 / 61), (1, 1 / 61), (3, 1 / 62)]
+
+
+def test_reciprocal_rank_fusion_favours_patents_found_by_both_stages() -> None:
+    lexical = [10, 11, 12, 13]
+    vector = [20, 21, 13, 22]
+
+    fused = reciprocal_rank_fusion([lexical, vector])
+
+    assert fused[0][0] == 13
+
+
+def test_reciprocal_rank_fusion_breaks_ties_by_patent_id() -> None:
+    fused = reciprocal_rank_fusion([[5], [7]])
+
+    assert [patent_id for patent_id, _ in fused] == [7, 5]
+
+
+@pytest.mark.parametrize("rankings", [[], [[]], [[], []]])
+def test_reciprocal_rank_fusion_of_nothing_is_empty(rankings: list[list[int]]) -> None:
+    assert reciprocal_rank_fusion(rankings) == []
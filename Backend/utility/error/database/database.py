@@ -41,3 +41,12 @@ class DatabaseError(Exception): ...
 
 
 class NoConnectionError(DatabaseError): ...
+
+
+class InvalidSubstringSearchModeError(Exception): ...
+
+
+class InvalidCursorError(Exception): ...
+
+
+class InvalidVectorIndexTypeError(Exception): ...
@@ -0,0 +1,7 @@
+# Code by AkinoAlice@TyrantRey
+
+
+class InvalidClipBackendError(Exception): ...
+
+
+class ClipBackendUnavailableError(Exception): ...
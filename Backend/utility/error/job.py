@@ -0,0 +1,10 @@
+# Code by AkinoAlice@TyrantRey
+
+
+class IngestionJobLostError(Exception): ...
+
+
+class IngestionTaskError(Exception): ...
+
+
+class InvalidIngestionModeError(Exception): ...
@@ -0,0 +1,4 @@
+# Code by AkinoAlice@TyrantRey
+
+
+class ModelServerError(Exception): ...
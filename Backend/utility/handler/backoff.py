@@ -0,0 +1,25 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import random
+
+
+def backoff_delay(attempts: int, base: float, maximum: float) -> float:
+    """
+    Seconds to wait before retrying after the given number of failed attempts.
+
+    The delay doubles from `base` with every attempt up to `maximum`. Half of it is fixed and
+    half is jitter, so tasks failing together do not retry together.
+
+    Args:
+        attempts (int): Failed attempts so far, at least 1.
+        base (float): Delay after the first failure.
+        maximum (float): Upper bound of the delay before jitter.
+
+    Returns:
+        float: A delay between half of the capped delay and the capped delay.
+
+    """
+    delay = min(maximum, base * 2 ** (attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)  # noqa: S311
@@ -0,0 +1,327 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from os import getenv
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from Backend.utility.handler.log_handler import Logger
+from Backend.utility.model.handler.cache import ContentEmbeddingCacheStats, EmbeddingCacheStats
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# seconds before a hit rewrites an entry's `last_used`, the LRU order is kept to this resolution
+LAST_USED_RESOLUTION = 300
+
+
+def normalize_query(text: str) -> str:
+    """
+    Canonical form of a query for cache keys: NFKC, case-folded, whitespace collapsed.
+
+    NFKC folds full-width characters, so "ＬＥＤ 鞋面" and "led  鞋面" share an entry.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+class EmbeddingCache:
+    """
+    Bounded two-tier cache of query embeddings.
+
+    The memory tier is an LRU with a TTL. The optional SQLite tier, enabled by
+    `EMBEDDING_CACHE_PATH` and opened on first use, survives restarts and is promoted into
+    memory on a hit; when it cannot be read, lookups fall back to the memory tier.
+    Keys include the embedding model, so switching models never returns stale vectors.
+    """
+
+    def __init__(self) -> None:
+        self.logger = Logger().get_logger()
+        self.max_entries = int(getenv("EMBEDDING_CACHE_SIZE", "10000"))
+        self.ttl = float(getenv("EMBEDDING_CACHE_TTL", "86400"))
+
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        self._disk: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection | None:
+        # opened on first use under `_lock`, as `ContentEmbeddingCache._connect`
+        disk_path = getenv("EMBEDDING_CACHE_PATH")
+        if self._disk is not None or not disk_path:
+            return self._disk
+
+        Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+        # embeddings are computed in worker threads, every access is serialised by `_lock`
+        disk = sqlite3.connect(disk_path, check_same_thread=False)
+        disk.execute("CREATE TABLE IF NOT EXISTS embedding (key TEXT PRIMARY KEY, created_at REAL, vector BLOB)")
+        # expired entries are never served, drop them so the file stays bounded by the TTL
+        disk.execute("DELETE FROM embedding WHERE created_at < ?", (time.time() - self.ttl,))
+        disk.commit()
+
+        self._disk = disk
+        return disk
+
+    @staticmethod
+    def key(text: str, model: str) -> str:
+        return hashlib.sha256(f"{model}\0{normalize_query(text)}".encode()).hexdigest()
+
+    def get(self, text: str, model: str) -> list[float] | None:
+        """
+        Look up a query embedding, memory first, then disk.
+
+        Args:
+            text (str): The query text, normalised before lookup.
+            model (str): The embedding model name.
+
+        Returns:
+            list[float] | None: The cached embedding, None on a miss or an expired entry.
+
+        """
+        key = self.key(text, model)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self._memory_hits += 1
+                return entry[1]
+
+            try:
+                disk = self._connect()
+                row = (
+                    disk.execute("SELECT created_at, vector FROM embedding WHERE key = ?", (key,)).fetchone()
+                    if disk is not None
+                    else None
+                )
+            except (sqlite3.Error, OSError) as e:
+                # the file is shared by every worker, a locked or corrupt one is a miss, not a failed query
+                self.logger.warning("Embedding cache read failed: %s", e)
+                row = None
+
+            if row is not None and now - row[0] < self.ttl:
+                embedding = array("f", row[1]).tolist()
+                self._remember(key, row[0], embedding)
+                self._disk_hits += 1
+                return embedding
+
+            self._misses += 1
+            return None
+
+    def put(self, text: str, model: str, embedding: list[float]) -> None:
+        key = self.key(text, model)
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, now, embedding)
+
+            try:
+                disk = self._connect()
+                if disk is not None:
+                    disk.execute(
+                        "INSERT OR REPLACE INTO embedding (key, created_at, vector) VALUES (?, ?, ?)",
+                        (key, now, array("f", embedding).tobytes()),
+                    )
+                    disk.commit()
+            except (sqlite3.Error, OSError) as e:
+                # the disk tier is an optimisation, a full or locked file must not fail the query
+                self.logger.warning("Embedding cache write failed: %s", e)
+
+    def _remember(self, key: str, created_at: float, embedding: list[float]) -> None:
+        self._entries[key] = (created_at, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> EmbeddingCacheStats:
+        with self._lock:
+            try:
+                self._connect()
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning("Embedding cache disk tier is unavailable: %s", e)
+
+            lookups = self._memory_hits + self._disk_hits + self._misses
+            return EmbeddingCacheStats(
+                memory_entries=len(self._entries),
+                memory_hits=self._memory_hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                hit_rate=(self._memory_hits + self._disk_hits) / lookups if lookups else 0.0,
+                disk_enabled=self._disk is not None,
+            )
+
+
+class ContentEmbeddingCache:
+    """
+    Persistent content-addressed cache of document embeddings (OCR page text, images).
+
+    Keys are SHA-256 of the model name and the exact content bytes, so re-ingesting a patent
+    or embedding a boilerplate page again is a lookup. The SQLite file at
+    `CONTENT_EMBEDDING_CACHE_PATH`, opened on first use, is kept under
+    `CONTENT_EMBEDDING_CACHE_MAX_BYTES` by evicting the least recently used entries.
+    """
+
+    def __init__(self) -> None:
+        self.logger = Logger().get_logger()
+        self.path: Path | None = None
+        self.max_bytes = 0
+
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._entries = 0
+        self._bytes = 0
+        self._disk: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # opened on first use under `_lock`: importing the module creates no file, and the
+        # configuration is read when the cache is first needed
+        if self._disk is not None:
+            return self._disk
+
+        self.path = Path(getenv("CONTENT_EMBEDDING_CACHE_PATH", "./cache/content_embedding.sqlite3"))
+        self.max_bytes = int(getenv("CONTENT_EMBEDDING_CACHE_MAX_BYTES", str(1024**3)))
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # embeddings are computed in worker threads, every access is serialised by `_lock`
+        disk = sqlite3.connect(self.path, check_same_thread=False)
+        disk.execute(
+            "CREATE TABLE IF NOT EXISTS embedding ("
+            "key TEXT PRIMARY KEY, size INTEGER NOT NULL, last_used REAL NOT NULL, vector BLOB NOT NULL)"
+        )
+        disk.execute("CREATE INDEX IF NOT EXISTS embedding_last_used_idx ON embedding (last_used)")
+        disk.commit()
+
+        self._entries, self._bytes = disk.execute("SELECT count(*), coalesce(sum(size), 0) FROM embedding").fetchone()
+        self._disk = disk
+        return disk
+
+    @staticmethod
+    def key(model: str, content: bytes) -> str:
+        return hashlib.sha256(model.encode() + b"\0" + content).hexdigest()
+
+    def get(self, model: str, content: bytes) -> list[float] | None:
+        key = self.key(model, content)
+
+        with self._lock:
+            try:
+                disk = self._connect()
+                row = disk.execute("SELECT last_used, vector FROM embedding WHERE key = ?", (key,)).fetchone()
+            except (sqlite3.Error, OSError) as e:
+                # an unreadable file is a miss, the embedding is computed instead
+                self.logger.warning("Content embedding cache read failed: %s", e)
+                row = None
+
+            if row is None:
+                self._misses += 1
+                return None
+
+            # eviction only needs the rough recency, a hot entry is not rewritten on every hit
+            now = time.time()
+            if now - row[0] > LAST_USED_RESOLUTION:
+                try:
+                    disk.execute("UPDATE embedding SET last_used = ? WHERE key = ?", (now, key))
+                    disk.commit()
+                except sqlite3.Error as e:
+                    self.logger.warning("Content embedding cache update failed: %s", e)
+
+            self._hits += 1
+            return array("f", row[1]).tolist()
+
+    def put(self, model: str, content: bytes, embedding: list[float]) -> None:
+        key = self.key(model, content)
+        vector = array("f", embedding).tobytes()
+
+        with self._lock:
+            try:
+                disk = self._connect()
+                # the file is shared by every worker process: take the write lock first and size the
+                # file itself, so the limit holds however many processes are inserting
+                disk.execute("BEGIN IMMEDIATE")
+                disk.execute(
+                    "INSERT OR REPLACE INTO embedding (key, size, last_used, vector) VALUES (?, ?, ?, ?)",
+                    (key, len(vector), time.time(), vector),
+                )
+                self._entries, self._bytes = disk.execute(
+                    "SELECT count(*), coalesce(sum(size), 0) FROM embedding"
+                ).fetchone()
+
+                self._evict(disk)
+                disk.commit()
+            except (sqlite3.Error, OSError) as e:
+                if self._disk is not None and self._disk.in_transaction:
+                    self._disk.rollback()
+                # the cache is an optimisation, a full or locked file must not fail the ingestion
+                self.logger.warning("Content embedding cache write failed: %s", e)
+
+    def get_or_compute(self, model: str, content: bytes, compute: Callable[[], list[float]]) -> list[float]:
+        """
+        Return the cached embedding of the content, computing and storing it on a miss.
+
+        Args:
+            model (str): The embedding model name, part of the key.
+            content (bytes): The exact bytes that are embedded.
+            compute (Callable[[], list[float]]): Produces the embedding on a miss.
+
+        Returns:
+            list[float]: The embedding.
+
+        """
+        embedding = self.get(model, content)
+        if embedding is None:
+            embedding = compute()
+            self.put(model, content, embedding)
+
+        return embedding
+
+    def _evict(self, disk: sqlite3.Connection) -> None:
+        if self._bytes <= self.max_bytes:
+            return
+
+        # evict down to 90% so a full cache does not evict on every insert
+        target = self.max_bytes * 0.9
+        evicted = []
+        for key, size in disk.execute("SELECT key, size FROM embedding ORDER BY last_used"):
+            if self._bytes <= target:
+                break
+            evicted.append((key,))
+            self._bytes -= size
+
+        disk.executemany("DELETE FROM embedding WHERE key = ?", evicted)
+        self._entries -= len(evicted)
+        self._evictions += len(evicted)
+        self.logger.info("Evicted %d content embeddings", len(evicted))
+
+    def stats(self) -> ContentEmbeddingCacheStats:
+        with self._lock:
+            try:
+                self._connect()
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning("Content embedding cache is unavailable: %s", e)
+
+            lookups = self._hits + self._misses
+            return ContentEmbeddingCacheStats(
+                entries=self._entries,
+                size_bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                hit_rate=self._hits / lookups if lookups else 0.0,
+            )
+
+
+QueryEmbeddingCache = EmbeddingCache()
+DocumentEmbeddingCache = ContentEmbeddingCache()
@@ -24,7 +24,7 @@ class AuthorizationOperation:
         self.logger = Logger().get_logger()
         self.database = DatabaseConnection
 
-    def fetch_all_role(self) -> list[Role]:
+    async def fetch_all_role(self) -> list[Role]:
         """
         Fetches all role entries from the database and maps them to Role domain models.
 
@@ -37,7 +37,7 @@ class AuthorizationOperation:
 
         """
         operation = select(RoleScheme)
-        result = self.database.run_query(operation)
+        result = await self.database.run_query_async(operation)
         self.logger.info(result)
 
         if isinstance(result, bool):
@@ -52,7 +52,7 @@ class AuthorizationOperation:
             for r in result
         ]
 
-    def fetch_role_by_name(self, role_name: str) -> Role | None:
+    async def fetch_role_by_name(self, role_name: str) -> Role | None:
         """
         Retrieves a single role by its name and maps it to a Role domain model.
 
@@ -68,7 +68,7 @@ class AuthorizationOperation:
 
         """
         operation = select(RoleScheme).where(RoleScheme.role_name == role_name)
-        result = self.database.run_query(operation)
+        result = await self.database.run_query_async(operation)
         self.logger.info(result)
 
         if isinstance(result, bool) or result == []:
@@ -80,7 +80,7 @@ class AuthorizationOperation:
             role_description=result[0]["RoleScheme"].role_description,
         )
 
-    def fetch_role_by_id(self, role_id: int) -> Role | None:
+    async def fetch_role_by_id(self, role_id: int) -> Role | None:
         """
         Retrieves a single role by its ID and maps it to a Role domain model.
 
@@ -96,7 +96,7 @@ class AuthorizationOperation:
 
         """
         operation = select(RoleScheme).where(RoleScheme.role_id == role_id)
-        result = self.database.run_query(operation)
+        result = await self.database.run_query_async(operation)
         self.logger.info(result)
 
         if isinstance(result, bool) or result == []:
@@ -108,7 +108,7 @@ class AuthorizationOperation:
             role_description=result[0]["RoleScheme"].role_description,
         )
 
-    def fetch_role_id_by_role_name(self, role_name: str) -> int | None:
+    async def fetch_role_id_by_role_name(self, role_name: str) -> int | None:
         """
         Retrieve the role ID associated with the given role name.
 
@@ -121,7 +121,7 @@ class AuthorizationOperation:
         """
         check_exist_statement = select(RoleScheme.role_id).where(RoleScheme.role_name == role_name)
 
-        is_role_exist = self.database.run_query(check_exist_statement)
+        is_role_exist = await self.database.run_read_query_async(check_exist_statement)
         self.logger.debug(is_role_exist)
 
         if isinstance(is_role_exist, list) and is_role_exist:
@@ -129,7 +129,7 @@ class AuthorizationOperation:
 
         return None
 
-    def create_new_role(self, role_name: str, role_description: str) -> int:
+    async def create_new_role(self, role_name: str, role_description: str) -> int:
         """
         Check if role already exist in database. If yes Create new role, else return the role
         Args:
@@ -140,18 +140,18 @@ class AuthorizationOperation:
             int | None: role id or None on error
 
         """
-        existing_role_id = self.fetch_role_id_by_role_name(role_name)
+        existing_role_id = await self.fetch_role_id_by_role_name(role_name)
         if existing_role_id:
             return existing_role_id
 
         operation = insert(RoleScheme).values(role_name=role_name, role_description=role_description)
-        success = self.database.run_write(operation)
+        success = await self.database.run_write_async(operation)
 
         if not success:
             msg = f"Failed to insert new role: {role_name}"
             raise RoleIDNotFoundError(msg)
 
-        new_role_id = self.fetch_role_id_by_role_name(role_name)
+        new_role_id = await self.fetch_role_id_by_role_name(role_name)
         if new_role_id:
             self.logger.info("Created role: %s %s", new_role_id, role_name)
             return new_role_id
@@ -159,7 +159,7 @@ class AuthorizationOperation:
         msg = f"Failed to retrieve new role ID after creation: {role_name}"
         raise RoleIDNotFoundError(msg)
 
-    def fetch_user_by_name(self, user_name: str) -> User | None:
+    async def fetch_user_by_name(self, user_name: str) -> User | None:
         """
         Retrieves a user by their username and maps the result to a User domain model.
 
@@ -180,7 +180,7 @@ class AuthorizationOperation:
             UserScheme.username,
             UserScheme.email,
         ).where(UserScheme.username == user_name)
-        result = self.database.run_query(operation)
+        result = await self.database.run_read_query_async(operation)
         self.logger.info(result)
 
         if isinstance(result, bool) or result == []:
@@ -193,7 +193,7 @@ class AuthorizationOperation:
             role_name=result[0]["role_name"],
         )
 
-    def fetch_user_by_id(self, user_id: int) -> User | None:
+    async def fetch_user_by_id(self, user_id: int) -> User | None:
         """
         Retrieves a user by their user ID and maps the result to a User domain model.
 
@@ -214,7 +214,7 @@ class AuthorizationOperation:
             UserScheme.username,
             UserScheme.email,
         ).where(UserScheme.user_id == user_id)
-        result = self.database.run_query(operation)
+        result = await self.database.run_read_query_async(operation)
         self.logger.info(result)
 
         if isinstance(result, bool) or result == []:
@@ -227,7 +227,7 @@ class AuthorizationOperation:
             role_name=result[0]["role_name"],
         )
 
-    def create_new_user(self, role_id: int, user_name: str, hashed_password: str, email: str = "") -> int | None:
+    async def create_new_user(self, role_id: int, user_name: str, hashed_password: str, email: str = "") -> int | None:
         """
         Creates a new user in the database and returns the newly assigned user ID.
 
@@ -256,7 +256,7 @@ class AuthorizationOperation:
             .returning(UserScheme.user_id)
         )
 
-        result = self.database.transaction(operation)
+        result = await self.database.transaction_async(operation)
         self.logger.info(result)
 
         if isinstance(result, bool) or result == []:
@@ -264,7 +264,7 @@ class AuthorizationOperation:
 
         return result[0]["user_id"]
 
-    def create_default_role_and_user(self, hashed_password: str) -> list[User]:
+    async def create_default_role_and_user(self, hashed_password: str) -> list[User]:
         """
         Create default roles and corresponding users in the system.
 
@@ -279,18 +279,18 @@ class AuthorizationOperation:
                         Returns an empty list if any creation step fails.
 
         """
-        admin_role_id = self.create_new_role("ADMIN", "ADMIN")
-        user_role_id = self.create_new_role("USER", "USER")
+        admin_role_id = await self.create_new_role("ADMIN", "ADMIN")
+        user_role_id = await self.create_new_role("USER", "USER")
         self.logger.info(admin_role_id)
         self.logger.info(user_role_id)
 
-        admin_user_id = self.create_new_user(
+        admin_user_id = await self.create_new_user(
             role_id=admin_role_id,
             user_name="admin",
             hashed_password=hashed_password,
             email="asd@asd.com",
         )
-        user_user_id = self.create_new_user(
+        user_user_id = await self.create_new_user(
             role_id=user_role_id,
             user_name="user",
             hashed_password=hashed_password,
@@ -304,8 +304,8 @@ class AuthorizationOperation:
         if user_user_id is None:
             return []
 
-        admin = self.fetch_user_by_id(user_id=admin_user_id)
-        user = self.fetch_user_by_id(user_id=user_user_id)
+        admin = await self.fetch_user_by_id(user_id=admin_user_id)
+        user = await self.fetch_user_by_id(user_id=user_user_id)
 
         if admin is None:
             return []
@@ -314,7 +314,7 @@ class AuthorizationOperation:
 
         return [admin, user]
 
-    def fetch_user_hashed_password(self, user_id: int) -> str:
+    async def fetch_user_hashed_password(self, user_id: int) -> str:
         """
         Retrieve the hashed password of a user by their user ID.
 
@@ -332,12 +332,12 @@ class AuthorizationOperation:
             UserScheme.user_id == user_id,
         )
 
-        result = self.database.run_query(operation)
+        result = await self.database.run_read_query_async(operation)
         self.logger.info(result)
 
         return result[0]["hashed_password"] if result else ""
 
-    def login(
+    async def login(
         self,
         user_id: int,
         access_token: str,
@@ -382,10 +382,10 @@ class AuthorizationOperation:
                 },
             )
         )
-        result = self.database.run_query(operation)
+        result = await self.database.run_query_async(operation)
         return result == []
 
-    def logout(self, user_id: int) -> bool:
+    async def logout(self, user_id: int) -> bool:
         """
         Log out a user by deleting their login session from the database.
 
@@ -403,19 +403,19 @@ class AuthorizationOperation:
             LoginScheme.user_id == user_id,
         )
 
-        result = self.database.run_query(operation)
+        result = await self.database.run_query_async(operation)
         self.logger.info(result)
         return result == []
 
-    def fetch_refresh_token(self, user_id: int) -> str:
+    async def fetch_refresh_token(self, user_id: int) -> str:
         operation = select(LoginScheme.refresh_token).where(
             LoginScheme.user_id == user_id,
         )
-        result = self.database.run_query(operation)
+        result = await self.database.run_read_query_async(operation)
         self.logger.info(result)
         return result[0]["refresh_token"] if result else ""
 
-    def revoke_access_token(self, user_id: int) -> bool:
+    async def revoke_access_token(self, user_id: int) -> bool:
         operation = (
             update(LoginScheme)
             .where(
@@ -423,11 +423,11 @@ class AuthorizationOperation:
             )
             .values(access_token="")
         )
-        result = self.database.run_query(operation)
+        result = await self.database.run_query_async(operation)
 
         return result != []
 
-    def update_refresh_token(self, user_id: int, refresh_token: str) -> bool:
+    async def update_refresh_token(self, user_id: int, refresh_token: str) -> bool:
         operation = (
             update(LoginScheme)
             .where(
@@ -435,6 +435,6 @@ class AuthorizationOperation:
             )
             .values(refresh_token=refresh_token)
         )
-        result = self.database.run_query(operation)
+        result = await self.database.run_query_async(operation)
         self.logger.info(result)
         return result != []
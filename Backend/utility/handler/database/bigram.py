@@ -0,0 +1,125 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import delete, func, select, text
+
+from Backend.utility.handler.log_handler import Logger
+from Backend.utility.model.handler.database.scheme import ABSTRACT_PAGE, PatentBigramScheme
+
+from .database import DatabaseConnection
+from .substring_index import extract_bigrams
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sqlalchemy import Select, TextClause
+
+    from Backend.utility.model.handler.database.database import SUBSTRING_SEARCH_FIELD_LIST
+
+# server-side backfill, one statement per field: every 2-character substring of the column
+REBUILD_SQL = {
+    "title": """
+        INSERT INTO patent_bigram (field, bigram, patent_id)
+        SELECT DISTINCT 'title', substr(title, i, 2), patent_id
+        FROM patent, generate_series(1, length(title) - 1) AS i
+        ON CONFLICT DO NOTHING
+    """,
+    "applicant": """
+        INSERT INTO patent_bigram (field, bigram, patent_id)
+        SELECT DISTINCT 'applicant', substr(applicant, i, 2), patent_id
+        FROM patent, generate_series(1, length(applicant) - 1) AS i
+        ON CONFLICT DO NOTHING
+    """,
+    "abstract": f"""
+        INSERT INTO patent_bigram (field, bigram, patent_id)
+        SELECT DISTINCT 'abstract', substr(content, i, 2), patent_id
+        FROM patent_content_vector, generate_series(1, length(content) - 1) AS i
+        WHERE page = {ABSTRACT_PAGE}
+        ON CONFLICT DO NOTHING
+    """,
+}
+
+# three array parameters whatever the batch size, a VALUES row per bigram would hit the 65535 bind limit
+INDEX_SQL = """
+    INSERT INTO patent_bigram (field, bigram, patent_id)
+    SELECT * FROM unnest(CAST(:fields AS text[]), CAST(:bigrams AS text[]), CAST(:patent_ids AS integer[]))
+    ON CONFLICT DO NOTHING
+"""
+
+
+class BigramOperation:
+    def __init__(self) -> None:
+        self.logger = Logger().get_logger()
+        self.database = DatabaseConnection
+
+    @staticmethod
+    def index_operation(texts: Iterable[tuple[int, SUBSTRING_SEARCH_FIELD_LIST, str]]) -> TextClause | None:
+        """
+        Build one INSERT storing the bigrams of every given patent field.
+
+        The caller executes it in the transaction that writes the text, so a patent is never
+        committed without its bigrams.
+
+        Args:
+            texts (Iterable[tuple[int, SUBSTRING_SEARCH_FIELD_LIST, str]]): `(patent_id, field, text)`
+                tuples.
+
+        Returns:
+            TextClause | None: The batched INSERT, None if no text has a bigram.
+
+        """
+        rows = [
+            (field, bigram, patent_id) for patent_id, field, content in texts for bigram in extract_bigrams(content)
+        ]
+        if not rows:
+            return None
+
+        fields, bigrams, patent_ids = map(list, zip(*rows))
+        return text(INDEX_SQL).bindparams(fields=fields, bigrams=bigrams, patent_ids=patent_ids)
+
+    def candidate_patent_ids(self, field: SUBSTRING_SEARCH_FIELD_LIST, keyword: str) -> Select:
+        """
+        Build the subquery of patents holding every bigram of the keyword in the given field.
+
+        This is a necessary condition for `LIKE '%keyword%'`, not a sufficient one, so callers
+        must re-check the candidates with the LIKE predicate.
+
+        Args:
+            field (SUBSTRING_SEARCH_FIELD_LIST): The field to look in.
+            keyword (str): The keyword, at least two characters long.
+
+        Returns:
+            Select: A `SELECT patent_id` over `patent_bigram`.
+
+        """
+        bigrams = extract_bigrams(keyword)
+
+        return (
+            select(PatentBigramScheme.patent_id)
+            .where(PatentBigramScheme.field == field, PatentBigramScheme.bigram.in_(bigrams))
+            .group_by(PatentBigramScheme.patent_id)
+            .having(func.count(PatentBigramScheme.bigram.distinct()) == len(bigrams))
+        )
+
+    def rebuild(self) -> bool:
+        """
+        Recompute the whole bigram table from the patent and abstract text.
+
+        Used after switching `SUBSTRING_SEARCH_MODE` to `bigram` on an existing corpus.
+
+        Returns:
+            bool: True if every field was rebuilt, False otherwise.
+
+        """
+        if not self.database.run_write(delete(PatentBigramScheme)):
+            return False
+
+        for field, raw_sql in REBUILD_SQL.items():
+            self.logger.info("Rebuilding bigram index: %s", field)
+            if not self.database.run_raw_query(raw_sql):
+                return False
+
+        return bool(self.database.run_raw_query("ANALYZE patent_bigram"))
@@ -7,33 +7,80 @@
 
 from __future__ import annotations
 
+from contextlib import contextmanager
 from os import getenv
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from sqlalchemy import create_engine, text
+from pgvector.psycopg import register_vector_async
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.sql.expression import ClauseElement, Executable
 from sqlalchemy.schema import CreateTable
 
 from Backend.utility.error.common import EnvironmentVariableNotSetError
-from Backend.utility.error.database.database import ExtensionCreationError, IndexCreationError, NoConnectionError
+from Backend.utility.error.database.database import (
+    AlterError,
+    DropError,
+    ExtensionCreationError,
+    IndexCreationError,
+    NoConnectionError,
+)
+from Backend.utility.handler.database.pool import PoolMonitor
+from Backend.utility.handler.database.vector_index import (
+    VECTOR_TABLES,
+    create_vector_index_sql,
+    get_vector_index_config,
+    vector_index_name,
+)
 from Backend.utility.handler.log_handler import Logger
-from Backend.utility.model.handler.database.database import DatabaseConfig
-from Backend.utility.model.handler.database.scheme import BaseScheme
+from Backend.utility.model.handler.database.database import DatabaseConfig, DatabasePoolStats
+from Backend.utility.model.handler.database.scheme import PATENT_SEARCH_VECTOR, BaseScheme
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Awaitable, Callable, Iterable, Iterator, Sequence
 
+    from sqlalchemy.engine import Connection
     from sqlalchemy.engine.row import RowMapping
-    from sqlalchemy.sql import Delete, Executable, Insert, Select, Update
+    from sqlalchemy.ext.asyncio import AsyncConnection
+    from sqlalchemy.sql import CompoundSelect, Delete, Insert, Select, Update
+    from sqlalchemy.sql.compiler import SQLCompiler
+
+T = TypeVar("T")
 
 # development
 GLOBAL_DEBUG_MODE = getenv("DEBUG")
+# `pg_advisory_lock` key held while the schema is created or migrated
+SCHEMA_LOCK_KEY = 7_368_413
 if GLOBAL_DEBUG_MODE is None or GLOBAL_DEBUG_MODE == "True":
     from dotenv import load_dotenv
 
     load_dotenv("./.env")
 
 
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN` wrapper so a Select keeps its bind parameters and type processing."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select | CompoundSelect, analyze: bool = False, as_json: bool = False) -> None:
+        self.statement = statement
+        self.analyze = analyze
+        self.as_json = as_json
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler: SQLCompiler, **kw) -> str:
+    options = ["ANALYZE", "BUFFERS"] if element.analyze else []
+    if element.as_json:
+        options.append("FORMAT JSON")
+
+    prefix = f"EXPLAIN ({', '.join(options)}) " if options else "EXPLAIN "
+    return prefix + compiler.process(element.statement, **kw)
+
+
 class Database:
     def __init__(self) -> None:
         self.logger = Logger().get_logger()
@@ -75,35 +122,111 @@ class Database:
             password=self._POSTGRESQL_PASSWORD,
             database=self._POSTGRESQL_DATABASE,
             port=int(self._POSTGRESQL_PORT),
+            echo=getenv("POSTGRESQL_ECHO", self._POSTGRESQL_DEBUG) == "True",
+            pool_size=int(getenv("POSTGRESQL_POOL_SIZE", "5")),
+            max_overflow=int(getenv("POSTGRESQL_MAX_OVERFLOW", "10")),
+            pool_timeout=float(getenv("POSTGRESQL_POOL_TIMEOUT", "30")),
+            pool_pre_ping=getenv("POSTGRESQL_POOL_PRE_PING", "True") == "True",
+            pool_recycle=int(getenv("POSTGRESQL_POOL_RECYCLE", "1800")),
+            statement_timeout=int(getenv("POSTGRESQL_STATEMENT_TIMEOUT", "0")),
         )
 
         self.DATABASE_URL = f"postgresql+psycopg2://{self.config.username}:{self.config.password}@{self.config.host}:{self.config.port}/{self.config.database}"
 
-        self.engine = create_engine(self.DATABASE_URL, echo=True)
+        self.ASYNC_DATABASE_URL = f"postgresql+psycopg://{self.config.username}:{self.config.password}@{self.config.host}:{self.config.port}/{self.config.database}"
+
+        # each engine has its own pool, so the server sees up to twice `pool_size + max_overflow` connections
+        self.pool_monitor = PoolMonitor("sync", self.config)
+        self.async_pool_monitor = PoolMonitor("async", self.config)
+
+        self.engine = create_engine(
+            self.DATABASE_URL, poolclass=self.pool_monitor.pool_class(QueuePool), **self.__engine_options()
+        )
         self.session = sessionmaker(bind=self.engine)
 
-        if self._POSTGRESQL_DEBUG == "True":
-            self.logger.info("Deleting Exist Database")
-            self.__clear_database()
-            self.__initialize_database()
+        # asyncio-native engine for the request path, so a slow query does not block the event loop
+        self.async_engine = create_async_engine(
+            self.ASYNC_DATABASE_URL,
+            poolclass=self.async_pool_monitor.pool_class(AsyncAdaptedQueuePool),
+            **self.__engine_options(),
+        )
+        self.async_session = async_sessionmaker(bind=self.async_engine, expire_on_commit=False)
 
         if not self.test_connection():
             raise NoConnectionError(self.DATABASE_URL)
+
+        with self.__schema_lock():
+            if self._POSTGRESQL_DEBUG == "True":
+                self.logger.info("Deleting Exist Database")
+                self.__clear_database()
+            # idempotent, brings an existing database up to the current schema on every start
+            self.__initialize_database()
         self.logger.info("| Loaded Database |")
 
+    @contextmanager
+    def __schema_lock(self) -> Iterator[None]:
+        # the API and ingestion workers start together, one migrates while the others wait
+        with self.engine.connect() as connection:
+            connection.execute(select(func.pg_advisory_lock(SCHEMA_LOCK_KEY)))
+            try:
+                yield
+            finally:
+                # a session lock outlives the transaction, it must be released before the
+                # connection goes back to the pool
+                connection.execute(select(func.pg_advisory_unlock(SCHEMA_LOCK_KEY)))
+
+    def __engine_options(self) -> dict[str, Any]:
+        options: dict[str, Any] = {
+            "echo": self.config.echo,
+            "pool_size": self.config.pool_size,
+            "max_overflow": self.config.max_overflow,
+            "pool_timeout": self.config.pool_timeout,
+            "pool_pre_ping": self.config.pool_pre_ping,
+            "pool_recycle": self.config.pool_recycle,
+        }
+        if self.config.statement_timeout > 0:
+            # understood by both psycopg2 and psycopg 3
+            options["connect_args"] = {"options": f"-c statement_timeout={self.config.statement_timeout}"}
+
+        return options
+
+    def pool_stats(self) -> DatabasePoolStats:
+        """
+        Report the occupancy and acquisition counters of both connection pools.
+
+        Returns:
+            DatabasePoolStats: Checked-out connections, wait times, overflow and timeouts per pool.
+
+        """
+        return DatabasePoolStats(
+            sync_pool=self.pool_monitor.stats(self.engine.pool),  # type: ignore[arg-type]
+            async_pool=self.async_pool_monitor.stats(self.async_engine.pool),  # type: ignore[arg-type]
+        )
+
     def __initialize_database(self) -> None:
         """
         Initializes the database by creating all tables defined in the BaseScheme
-        metadata and ensuring the required full-text search index exists.
+        metadata together with their indexes.
+
+        Runs on every start and only creates what is missing, so it also migrates a database
+        created by an older version. A large existing table makes the first start slow while
+        its new indexes are built.
 
         This method performs the following:
+        - Creates the `vector` extension required by the embedding tables.
+        - Creates the `pg_trgm` extension required by the substring search indexes.
         - Logs the SQL DDL statements for table creation (for debug visibility).
-        - Executes table creation via SQLAlchemy's metadata binding.
-        - Executes a raw SQL statement to create a GIN full-text search index on the
-          `patent` table, if it does not already exist.
+        - Executes table creation via SQLAlchemy's metadata binding, which also builds
+          the generated `patent.search_vector` column and its GIN index.
+        - Migrates a database created before `search_vector`, see `__migrate_search_vector`,
+          and creates the declared indexes missing from tables that already existed.
+        - Creates the ANN indexes of the embedding tables, see `create_vector_indexes`.
 
         Raises:
-            IndexCreationError: If the full-text index creation fails.
+            ExtensionCreationError: If the vector or pg_trgm extension creation fails.
+            AlterError: If the `search_vector` column cannot be added.
+            DropError: If the replaced `patent_search_idx` cannot be dropped.
+            IndexCreationError: If a declared or embedding index cannot be created.
 
         """
         # vector extension
@@ -115,18 +238,87 @@ class Database:
             raise ExtensionCreationError(vector_extension)
         self.logger.info("Created extension: vector")
 
+        # trigram extension, required by the gin_trgm_ops substring indexes
+        create_trigram_extension = """CREATE EXTENSION IF NOT EXISTS pg_trgm;"""
+        is_trigram_extension = self.run_raw_query(create_trigram_extension)
+
+        if not is_trigram_extension:
+            trigram_extension = "pg_trgm extension"
+            raise ExtensionCreationError(trigram_extension)
+        self.logger.info("Created extension: pg_trgm")
+
+        declared_indexes = [index for table in BaseScheme.metadata.sorted_tables for index in table.indexes]
+        existing_indexes = {index.name for index in declared_indexes if self.__index_exists(index.name)}
+
         for table in BaseScheme.metadata.sorted_tables:
             self.logger.debug(str(CreateTable(table).compile(self.engine)))
         BaseScheme.metadata.create_all(self.engine)
+        self.__migrate_search_vector()
+
+        for index in declared_indexes:
+            if index.name in existing_indexes:
+                continue
+
+            # create_all only builds the indexes of the tables it creates
+            if not self.__index_exists(index.name):
+                try:
+                    index.create(self.engine)
+                except Exception as e:
+                    raise IndexCreationError(index.name) from e
+            self.logger.info("Created index: %s", index.name)
+
+        self.create_vector_indexes()
+
+    def __index_exists(self, index_name: str | None) -> bool:
+        rows = self.run_raw_query("SELECT to_regclass(:name) IS NOT NULL AS found", param={"name": index_name})
+        return not isinstance(rows, bool) and bool(rows[0]["found"])
 
-        # English full text search index
-        tsvector_index = """CREATE INDEX IF NOT EXISTS patent_search_idx ON patent USING GIN (to_tsvector('english', coalesce(application_number, '') || ' ' || coalesce(applicant, '') || ' ' || coalesce(ipc, '') || ' ' || coalesce(title, '')));"""
-        is_index_created = self.run_raw_query(tsvector_index)
+    def __migrate_search_vector(self) -> None:
+        """
+        Add the generated `search_vector` column to a `patent` table created before it, and
+        drop the expression index it replaces. Both steps are no-ops on an up-to-date database.
+        """
+        add_search_vector = (
+            "ALTER TABLE patent ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({PATENT_SEARCH_VECTOR}) STORED"
+        )
+        if not self.run_raw_query(add_search_vector):
+            msg = "patent.search_vector"
+            raise AlterError(msg)
+
+        if not self.run_raw_query("DROP INDEX IF EXISTS patent_search_idx"):
+            msg = "patent_search_idx"
+            raise DropError(msg)
+
+    def create_vector_indexes(self, rebuild: bool = False) -> None:
+        """
+        Creates the ANN index of every embedding table as configured by `VECTOR_INDEX_TYPE`.
+
+        IVFFlat derives its lists from the rows present at build time, so rebuild it after
+        a large backfill. Switching the index type also needs a rebuild.
+
+        Args:
+            rebuild (bool, optional): Drop the existing indexes first. Defaults to False.
+
+        Raises:
+            IndexCreationError: If an index cannot be dropped or created.
+
+        """
+        config = get_vector_index_config()
+
+        for table in VECTOR_TABLES:
+            index_name = vector_index_name(table)
+
+            if rebuild and not self.run_raw_query(f"DROP INDEX IF EXISTS {index_name}"):
+                raise IndexCreationError(index_name)
+
+            create_index = create_vector_index_sql(table, config)
+            if create_index is None or self.__index_exists(index_name):
+                continue
 
-        if not is_index_created:
-            patent_index = "patent_search_idx"
-            raise IndexCreationError(patent_index)
-        self.logger.info("Created index: patent_search_idx")
+            if not self.run_raw_query(create_index):
+                raise IndexCreationError(index_name)
+            self.logger.info("Created index: %s (%s)", index_name, config.index_type)
 
     def __clear_database(self) -> None:
         self.logger.warning("Dropping Database")
@@ -152,6 +344,43 @@ class Database:
         """
         self.logger.debug(sql_statement.compile())
 
+    def explain(self, query: Select | CompoundSelect, analyze: bool = False) -> list[str]:
+        """
+        Returns the PostgreSQL execution plan of a SELECT query.
+
+        Used to verify that a query is served by an index instead of a sequential scan.
+
+        Args:
+            query (Select | CompoundSelect): SQLAlchemy Select or UNION query.
+            analyze (bool, optional): Run the query and include actual timings. Defaults to False.
+
+        Returns:
+            list[str]: The plan lines, empty if the EXPLAIN failed.
+
+        """
+        plan = self.run_read_query(Explain(query, analyze=analyze))  # type: ignore[arg-type]
+        return [row["QUERY PLAN"] for row in plan]
+
+    def estimate_rows(self, query: Select | CompoundSelect) -> int:
+        """
+        Returns the planner's row estimate for a query without executing it.
+
+        Far cheaper than `COUNT(*)` on a broad match; accuracy follows the table statistics,
+        so it is only meant for "about N results" displays.
+
+        Args:
+            query (Select | CompoundSelect): SQLAlchemy Select or UNION query.
+
+        Returns:
+            int: The estimated row count, 0 if the EXPLAIN failed.
+
+        """
+        plan = self.run_read_query(Explain(query, as_json=True))  # type: ignore[arg-type]
+        if not plan:
+            return 0
+
+        return int(plan[0]["QUERY PLAN"][0]["Plan"]["Plan Rows"])
+
     def run_write(self, statement: Insert | Update | Delete) -> bool:
         """
         Executes an INSERT, UPDATE, or DELETE statement.
@@ -200,6 +429,31 @@ class Database:
                 self.logger.critical("SQL statement: %s", query)
                 return []
 
+    def run_read_query(self, query: Select | CompoundSelect) -> Sequence[RowMapping]:
+        """
+        Executes a read-only SELECT on a bare connection and returns the result rows.
+
+        Skips the ORM session and the COMMIT round trip of `run_query`; the implicit
+        transaction is rolled back when the connection returns to the pool. Do not pass
+        statements that write, their changes would be discarded.
+
+        Args:
+            query (Select | CompoundSelect): SQLAlchemy Select or UNION query.
+
+        Returns:
+            Sequence[RowMapping]: List of result rows, empty if the query failed.
+
+        """
+        self.log_sql(query)
+
+        try:
+            with self.engine.connect() as connection:
+                return connection.execute(query).mappings().all()
+        except Exception as e:
+            self.logger.critical("Query failed: %s", e)
+            self.logger.critical("SQL statement: %s", query)
+            return []
+
     def transaction(self, action: Executable) -> Sequence[RowMapping] | bool:
         """
         Executes a SQLAlchemy Executable (e.g., INSERT, UPDATE, DELETE, or raw SQL)
@@ -232,6 +486,26 @@ class Database:
                 session.rollback()
                 return False
 
+    def run_transaction(self, work: Callable[[Connection], T]) -> T | None:
+        """
+        Runs several statements on one connection in one transaction, for writes that depend
+        on what an earlier statement returned.
+
+        Args:
+            work (Callable[[Connection], T]): Executes the statements on the given connection.
+                Committed when it returns, rolled back if it raises.
+
+        Returns:
+            T | None: The value returned by `work`, None if the transaction was rolled back.
+
+        """
+        try:
+            with self.engine.begin() as connection:
+                return work(connection)
+        except Exception as e:
+            self.logger.critical("Transaction failed: %s", e)
+            return None
+
     def run_raw_query(self, raw_query: str, param: dict[str, Any] | None = None) -> Sequence[RowMapping] | bool:
         """
         Execute a raw SQL query using the provided query string and parameters.
@@ -292,6 +566,320 @@ class Database:
                 self.logger.critical("SQL statement: %s", query)
                 return []
 
+    async def __apply_settings_async(self, connection: AsyncConnection, settings: dict[str, str] | None) -> None:
+        # `is_local` keeps the values to the current transaction, so pooled connections stay clean
+        for name, value in (settings or {}).items():
+            await connection.execute(select(func.set_config(name, value, True)))
+
+    async def explain_async(self, query: Select | CompoundSelect, analyze: bool = False) -> list[str]:
+        """Awaitable variant of `explain`."""
+        plan = await self.run_read_query_async(Explain(query, analyze=analyze))  # type: ignore[arg-type]
+        return [row["QUERY PLAN"] for row in plan]
+
+    async def estimate_rows_async(self, query: Select | CompoundSelect) -> int:
+        """Awaitable variant of `estimate_rows`."""
+        plan = await self.run_read_query_async(Explain(query, as_json=True))  # type: ignore[arg-type]
+        if not plan:
+            return 0
+
+        return int(plan[0]["QUERY PLAN"][0]["Plan"]["Plan Rows"])
+
+    async def run_write_async(self, statement: Insert | Update | Delete) -> bool:
+        """
+        Awaitable variant of `run_write`, executed on the async engine.
+
+        Args:
+            statement (Insert | Update | Delete): SQLAlchemy write operation.
+
+        Returns:
+            bool: True if committed successfully, False otherwise.
+
+        """
+        self.log_sql(statement)
+
+        async with self.async_session() as session:
+            try:
+                await session.execute(statement)
+            except Exception as e:
+                self.logger.critical("Write operation failed: %s", e)
+                await session.rollback()
+                return False
+            else:
+                await session.commit()
+                return True
+
+    async def run_writes_async(self, statements: Sequence[Executable], settings: dict[str, str] | None = None) -> bool:
+        """
+        Executes several write statements in one transaction, all or nothing.
+
+        Args:
+            statements (Sequence[Executable]): SQLAlchemy write operations, run in order.
+            settings (dict[str, str] | None, optional): Planner settings for this transaction only,
+                as in `run_read_query_async`. Defaults to None.
+
+        Returns:
+            bool: True if committed successfully, False if rolled back.
+
+        """
+        async with self.async_session() as session:
+            try:
+                await self.__apply_settings_async(await session.connection(), settings)
+                for statement in statements:
+                    self.log_sql(statement)
+                    await session.execute(statement)
+            except Exception as e:
+                self.logger.critical("Write operation failed: %s", e)
+                await session.rollback()
+                return False
+            else:
+                await session.commit()
+                return True
+
+    async def run_transaction_async(self, work: Callable[[AsyncConnection], Awaitable[T]]) -> T | None:
+        """
+        Runs several statements on one connection in one transaction, for writes that depend
+        on what the transaction read or locked first.
+
+        Args:
+            work (Callable[[AsyncConnection], Awaitable[T]]): Executes the statements on the
+                given connection. Committed when it returns, rolled back if it raises.
+
+        Returns:
+            T | None: The value returned by `work`, None if the transaction was rolled back.
+
+        """
+        try:
+            async with self.async_engine.begin() as connection:
+                return await work(connection)
+        except Exception as e:
+            self.logger.critical("Transaction failed: %s", e)
+            return None
+
+    async def run_query_async(self, query: Select) -> Sequence[RowMapping]:
+        """
+        Awaitable variant of `run_query`, executed on the async engine.
+
+        Args:
+            query (Select): SQLAlchemy Select query.
+
+        Returns:
+            Sequence[RowMapping]: List of result rows.
+
+        """
+        self.log_sql(query)
+
+        async with self.async_session() as session:
+            try:
+                result = await session.execute(query)
+                # writes passed through here yield no rows, like the sync variant
+                rows = result.mappings().all() if result.returns_rows else []
+                await session.commit()
+            except Exception as e:
+                self.logger.critical("Query failed: %s", e)
+                self.logger.critical("SQL statement: %s", query)
+                return []
+            else:
+                return rows
+
+    async def run_read_query_async(
+        self, query: Select | CompoundSelect, settings: dict[str, str] | None = None
+    ) -> Sequence[RowMapping]:
+        """
+        Awaitable variant of `run_read_query`, executed on the async engine.
+
+        Args:
+            query (Select | CompoundSelect): SQLAlchemy Select or UNION query.
+            settings (dict[str, str] | None, optional): Server settings scoped to this query's
+                transaction, e.g. `{"hnsw.ef_search": "100"}`. Defaults to None.
+
+        Returns:
+            Sequence[RowMapping]: List of result rows, empty if the query failed.
+
+        """
+        self.log_sql(query)
+
+        try:
+            async with self.async_engine.connect() as connection:
+                await self.__apply_settings_async(connection, settings)
+                result = await connection.execute(query)
+                return result.mappings().all()
+        except Exception as e:
+            self.logger.critical("Query failed: %s", e)
+            self.logger.critical("SQL statement: %s", query)
+            return []
+
+    async def run_read_query_vector_async(
+        self, query: Select, settings: dict[str, str] | None = None
+    ) -> Sequence[Any]:
+        """
+        Read-only variant of `run_query_vector_async`, see `run_read_query`.
+
+        Args:
+            query (Select): SQLAlchemy Select query.
+            settings (dict[str, str] | None, optional): Server settings scoped to this query's
+                transaction. Defaults to None.
+
+        Returns:
+            Sequence[Any]: The first column of every result row.
+
+        """
+        self.log_sql(query)
+
+        try:
+            async with self.async_engine.connect() as connection:
+                await self.__apply_settings_async(connection, settings)
+                result = await connection.scalars(query)
+                return result.all()
+        except Exception as e:
+            self.logger.critical("Query failed: %s", e)
+            self.logger.critical("SQL statement: %s", query)
+            return []
+
+    async def transaction_async(self, action: Executable) -> Sequence[RowMapping] | bool:
+        """
+        Awaitable variant of `transaction`, executed on the async engine.
+
+        Args:
+            action (Executable): A SQLAlchemy Core Executable, such as a text query or
+                insert/update/delete statement.
+
+        Returns:
+            Sequence[RowMapping] | bool: List of result rows if the statement returns
+            data; True if executed successfully without a result set; False on failure.
+
+        """
+        self.log_sql(action)
+
+        async with self.async_session() as session:
+            try:
+                result = await session.execute(action)
+                rows = result.mappings().all() if result.returns_rows else True
+                await session.commit()
+            except Exception as e:
+                self.logger.critical("Transaction failed: %s", e)
+                self.logger.critical("SQL statement: %s", action)
+                await session.rollback()
+                return False
+            else:
+                return rows
+
+    async def run_raw_query_async(
+        self, raw_query: str, param: dict[str, Any] | None = None
+    ) -> Sequence[RowMapping] | bool:
+        """
+        Awaitable variant of `run_raw_query`, executed on the async engine.
+
+        Args:
+            raw_query (str): The SQL query string to be executed.
+            param (dict | None, optional): A dictionary of parameters to pass to the query. Defaults to None.
+
+        Returns:
+            Sequence[RowMapping] | bool: The rows if the query returns any, otherwise True on
+            success and False on failure.
+
+        """
+        statement = text(raw_query)
+        self.log_sql(statement)
+
+        async with self.async_engine.begin() as connection:
+            try:
+                result = await connection.execute(statement=statement, parameters=param)
+
+                if result.returns_rows:
+                    return result.mappings().all()
+
+            except Exception as e:
+                self.logger.critical("Transaction failed: %s", e)
+                self.logger.critical("Raw query: %s", raw_query)
+                return False
+            else:
+                return True
+
+    async def copy_rows_async(
+        self,
+        table: str,
+        columns: Sequence[str],
+        types: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        *,
+        before: Sequence[Executable] = (),
+        after: Sequence[Executable] = (),
+    ) -> int:
+        """
+        Streams rows into a table with binary `COPY ... FROM STDIN` in one transaction.
+
+        One round trip for the whole batch instead of one INSERT per row, and vectors are
+        sent in pgvector's binary format instead of as text.
+
+        Args:
+            table (str): Target table name, trusted (never user input).
+            columns (Sequence[str]): Target column names, trusted.
+            types (Sequence[str]): PostgreSQL type name of each column, e.g. `int4`, `text`, `vector`.
+            rows (Iterable[Sequence[Any]]): Values in `columns` order.
+            before (Sequence[Executable], optional): Statements run first in the same transaction,
+                such as deleting the rows being replaced. Defaults to ().
+            after (Sequence[Executable], optional): Statements run after the COPY in the same
+                transaction, such as indexing the copied rows. Defaults to ().
+
+        Returns:
+            int: The number of rows copied, -1 if the COPY failed and was rolled back.
+
+        """
+        copy_sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT BINARY)"
+        self.logger.debug(copy_sql)
+
+        count = 0
+        try:
+            async with self.async_engine.begin() as connection:
+                for statement in before:
+                    self.log_sql(statement)
+                    await connection.execute(statement)
+
+                raw_connection = await connection.get_raw_connection()
+                driver_connection = raw_connection.driver_connection
+                await register_vector_async(driver_connection)
+
+                async with driver_connection.cursor() as cursor, cursor.copy(copy_sql) as copy:
+                    copy.set_types(types)
+                    for row in rows:
+                        await copy.write_row(row)
+                        count += 1
+
+                for statement in after:
+                    self.log_sql(statement)
+                    await connection.execute(statement)
+        except Exception as e:
+            self.logger.critical("COPY failed: %s", e)
+            self.logger.critical("SQL statement: %s", copy_sql)
+            return -1
+
+        return count
+
+    async def run_query_vector_async(self, query: Select) -> Sequence[Any]:
+        """
+        Awaitable variant of `run_query_vector`, executed on the async engine.
+
+        Args:
+            query (Select): SQLAlchemy Select query.
+
+        Returns:
+            Sequence[Any]: The first column of every result row.
+
+        """
+        self.log_sql(query)
+
+        async with self.async_session() as session:
+            try:
+                result = await session.scalars(query)
+                rows = result.all()
+                await session.commit()
+            except Exception as e:
+                self.logger.critical("Query failed: %s", e)
+                self.logger.critical("SQL statement: %s", query)
+                return []
+            else:
+                return rows
+
 
 DatabaseConnection = Database()
 
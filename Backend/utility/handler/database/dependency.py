@@ -18,7 +18,7 @@ class DependencyOperation:
         self.logger = Logger().get_logger()
         self.database = DatabaseConnection
 
-    def verify_token(
+    async def verify_token(
         self, user_id: int, token: str, token_type: Literal["access", "refresh"]
     ) -> bool:
         """
@@ -58,7 +58,7 @@ class DependencyOperation:
             case _:
                 raise InvalidTokenTypeError(token_type)
 
-        result = self.database.run_query(operation)
+        result = await self.database.run_read_query_async(operation)
         self.logger.debug(result)
 
         return result != []
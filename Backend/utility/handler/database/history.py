@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
-from sqlalchemy import insert, select
+import datetime
+import threading
+import time
+from os import getenv
+
+from sqlalchemy import func, insert, select
 
 from Backend.utility.error.database.database import InsertError
 from Backend.utility.handler.database.database import DatabaseConnection
 from Backend.utility.handler.log_handler import Logger
-from Backend.utility.model.application.history import LoginHistoryRecord, SearchHistoryRecord
+from Backend.utility.model.application.history import (
+    LoginHistoryRecord,
+    SearchHistoryRecord,
+    SearchHistoryWriterStats,
+)
 from Backend.utility.model.handler.database.scheme import LoginScheme, ResponseHistoryScheme, SearchHistoryScheme
 
 
@@ -16,14 +25,14 @@ class HistoryOperation:
         self.database = DatabaseConnection
         self.logger = Logger().get_logger()
 
-    def fetch_search_history(self, user_id: int) -> list[SearchHistoryRecord]:
+    async def fetch_search_history(self, user_id: int) -> list[SearchHistoryRecord]:
         operation = (
             select(SearchHistoryScheme.user_id, SearchHistoryScheme.patent_id, SearchHistoryScheme.search_time)
             .where(SearchHistoryScheme.user_id == user_id)
             .order_by(SearchHistoryScheme.search_time.desc())
         )
 
-        result = self.database.run_query(operation)
+        result = await self.database.run_read_query_async(operation)
 
         self.logger.debug(result)
         if isinstance(result, bool) or result == []:
@@ -37,12 +46,12 @@ class HistoryOperation:
             for r in result
         ]
 
-    def fetch_last_login(self, user_id: int) -> LoginHistoryRecord | None:
+    async def fetch_last_login(self, user_id: int) -> LoginHistoryRecord | None:
         operation = select(LoginScheme.user_id, LoginScheme.access_token_created_at).where(
             LoginScheme.user_id == user_id
         )
 
-        result = self.database.run_query(operation)
+        result = await self.database.run_read_query_async(operation)
         self.logger.debug(result)
 
         if isinstance(result, bool) or result == []:
@@ -53,10 +62,10 @@ class HistoryOperation:
             last_login_time=result[0]["LoginScheme"].access_token_created_at,
         )
 
-    def insert_search_history(self, user_id: int, patent_id: int, keyword: str) -> bool:
+    async def insert_search_history(self, user_id: int, patent_id: int, keyword: str) -> bool:
         operation = insert(SearchHistoryScheme).values(user_id=user_id, patent_id=patent_id, keyword=keyword)
 
-        success = self.database.run_write(operation)
+        success = await self.database.run_write_async(operation)
 
         if not success:
             msg = f"Failed to insert SearchHistory: {user_id}"
@@ -64,12 +73,178 @@ class HistoryOperation:
 
         return success
 
-    def insert_response_history(self, user_id: int, query: str, response: str, token: int) -> bool:
+    async def insert_response_history(self, user_id: int, query: str, response: str, token: int) -> bool:
         operation = insert(ResponseHistoryScheme).values(user_id=user_id, query=query, response=response, token=token)
 
-        success = self.database.run_write(operation)
+        success = await self.database.run_write_async(operation)
         if not success:
             msg = f"Failed to insert ResponseHistory: {user_id}"
             raise InsertError(msg)
 
         return success
+
+
+class SearchHistoryWriter:
+    """
+    Write-behind buffer for search history rows.
+
+    A search that returns N patents records N history rows. Instead of one transaction per
+    row on the request path, rows are queued in memory and written by a background thread
+    as one multi-row INSERT once `SEARCH_HISTORY_BATCH_SIZE` rows are waiting or every
+    `SEARCH_HISTORY_FLUSH_INTERVAL` seconds, whichever comes first. `close()` must be called
+    at shutdown to write what is still queued.
+    """
+
+    def __init__(self, batch_size: int | None = None, flush_interval: float | None = None) -> None:
+        self.database = DatabaseConnection
+        self.logger = Logger().get_logger()
+
+        self.batch_size = batch_size or int(getenv("SEARCH_HISTORY_BATCH_SIZE", "500"))
+        self.flush_interval = flush_interval or float(getenv("SEARCH_HISTORY_FLUSH_INTERVAL", "2"))
+        # rows of failed flushes are re-queued up to this depth, then dropped
+        self.max_queue_size = self.batch_size * 20
+
+        self._buffer: list[dict] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self._enqueued_rows = 0
+        self._flushed_rows = 0
+        self._dropped_rows = 0
+        self._flush_count = 0
+        self._failed_flush_count = 0
+        self._last_flush_latency = 0.0
+        self._max_flush_latency = 0.0
+        self._total_flush_latency = 0.0
+
+    def _start(self) -> None:
+        if self._thread is None and not self._closed.is_set():
+            self._thread = threading.Thread(target=self._run, name="search-history-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def add(self, user_id: int, patent_ids: list[int], keyword: str) -> None:
+        """
+        Queue the history rows of one search.
+
+        The search time is the time of this call, not of the flush.
+
+        Args:
+            user_id (int): The user who searched.
+            patent_ids (list[int]): The patents returned to the user.
+            keyword (str): The searched keyword.
+
+        """
+        queued_at = time.monotonic()
+        rows = [
+            {"user_id": user_id, "patent_id": patent_id, "keyword": keyword, "queued_at": queued_at}
+            for patent_id in patent_ids
+        ]
+
+        with self._buffer_lock:
+            self._start()
+            self._buffer.extend(rows)
+            self._enqueued_rows += len(rows)
+            is_full = len(self._buffer) >= self.batch_size
+
+        if self._closed.is_set():
+            # no background thread after shutdown, write through
+            self.flush()
+        elif is_full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Write every queued row in batches of at most `batch_size` rows.
+
+        Returns:
+            int: The number of rows written.
+
+        """
+        written = 0
+
+        with self._flush_lock:
+            while True:
+                with self._buffer_lock:
+                    rows = self._buffer[: self.batch_size]
+                    del self._buffer[: self.batch_size]
+
+                if not rows:
+                    return written
+
+                start = time.perf_counter()
+                success = self.database.run_write(insert(SearchHistoryScheme).values(self._values(rows)))
+                latency = time.perf_counter() - start
+
+                with self._buffer_lock:
+                    self._flush_count += 1
+                    self._last_flush_latency = latency
+                    self._max_flush_latency = max(self._max_flush_latency, latency)
+                    self._total_flush_latency += latency
+
+                    if success:
+                        self._flushed_rows += len(rows)
+                    else:
+                        self._failed_flush_count += 1
+                        if len(self._buffer) + len(rows) <= self.max_queue_size:
+                            self._buffer[:0] = rows
+                        else:
+                            self._dropped_rows += len(rows)
+
+                if not success:
+                    self.logger.critical("Failed to flush %s SearchHistory rows", len(rows))
+                    return written
+
+                written += len(rows)
+                self.logger.debug("Flushed %s SearchHistory rows in %.3fs", len(rows), latency)
+
+    @staticmethod
+    def _values(rows: list[dict]) -> list[dict]:
+        # `search_time` is a naive column filled by the server's `now()` everywhere else; the
+        # time spent in the queue is subtracted on the server so both use the same clock and zone
+        now = time.monotonic()
+        return [
+            {
+                "user_id": row["user_id"],
+                "patent_id": row["patent_id"],
+                "keyword": row["keyword"],
+                "search_time": func.now() - datetime.timedelta(seconds=now - row["queued_at"]),
+            }
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        """Stop the background thread and write the remaining rows."""
+        self._closed.set()
+        self._wake.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+
+    def stats(self) -> SearchHistoryWriterStats:
+        with self._buffer_lock:
+            return SearchHistoryWriterStats(
+                queue_depth=len(self._buffer),
+                enqueued_rows=self._enqueued_rows,
+                flushed_rows=self._flushed_rows,
+                dropped_rows=self._dropped_rows,
+                flush_count=self._flush_count,
+                failed_flush_count=self._failed_flush_count,
+                last_flush_latency_ms=self._last_flush_latency * 1000,
+                max_flush_latency_ms=self._max_flush_latency * 1000,
+                average_flush_latency_ms=self._total_flush_latency * 1000 / max(self._flush_count, 1),
+            )
+
+
+SearchHistoryBuffer = SearchHistoryWriter()
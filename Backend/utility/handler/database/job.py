@@ -0,0 +1,197 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func, insert, or_, select, update
+
+from Backend.utility.handler.log_handler import Logger
+from Backend.utility.model.application.job import IngestionCheckpoint, IngestionJob, IngestionStageProgress
+from Backend.utility.model.handler.pipeline import PipelineStageStats
+from Backend.utility.model.handler.database.scheme import IngestionJobScheme
+
+from .database import DatabaseConnection
+
+if TYPE_CHECKING:
+    from sqlalchemy import RowMapping
+
+    from Backend.utility.model.application.job import INGESTION_JOB_STATUS_LIST, INGESTION_STAGE_LIST
+
+JOB_COLUMNS = (
+    IngestionJobScheme.job_id,
+    IngestionJobScheme.user_id,
+    IngestionJobScheme.keyword,
+    IngestionJobScheme.status,
+    IngestionJobScheme.stage,
+    IngestionJobScheme.progress,
+    IngestionJobScheme.checkpoint,
+    IngestionJobScheme.pipeline,
+    IngestionJobScheme.error,
+    IngestionJobScheme.attempts,
+    IngestionJobScheme.created_at,
+    IngestionJobScheme.updated_at,
+    IngestionJobScheme.finished_at,
+)
+
+
+class IngestionJobOperation:
+    def __init__(self) -> None:
+        self.logger = Logger().get_logger()
+        self.database = DatabaseConnection
+
+    @staticmethod
+    def _to_model(row: RowMapping) -> IngestionJob:
+        checkpoint = IngestionCheckpoint.model_validate(row["checkpoint"])
+        return IngestionJob(
+            job_id=row["job_id"],
+            user_id=row["user_id"],
+            keyword=row["keyword"],
+            status=row["status"],
+            stage=row["stage"],
+            progress={
+                stage: IngestionStageProgress.model_validate(progress) for stage, progress in row["progress"].items()
+            },
+            patent_ids=[patent.patent_id for patent in checkpoint.patents],
+            pipeline=[PipelineStageStats.model_validate(stage) for stage in row["pipeline"]],
+            error=row["error"],
+            attempts=row["attempts"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            finished_at=row["finished_at"],
+        )
+
+    async def create(self, user_id: int, keyword: str) -> IngestionJob | None:
+        operation = (
+            insert(IngestionJobScheme)
+            .values(user_id=user_id, keyword=keyword, status="queued", progress={}, checkpoint={}, pipeline=[])
+            .returning(*JOB_COLUMNS)
+        )
+        result = await self.database.transaction_async(operation)
+
+        if isinstance(result, bool) or result == []:
+            return None
+        return self._to_model(result[0])
+
+    async def fetch(self, job_id: int) -> IngestionJob | None:
+        operation = select(*JOB_COLUMNS).where(IngestionJobScheme.job_id == job_id)
+        result = await self.database.run_read_query_async(operation)
+
+        if result == []:
+            return None
+        return self._to_model(result[0])
+
+    async def fetch_checkpoint(self, job_id: int) -> IngestionCheckpoint:
+        operation = select(IngestionJobScheme.checkpoint).where(IngestionJobScheme.job_id == job_id)
+        result = await self.database.run_read_query_async(operation)
+
+        if result == []:
+            return IngestionCheckpoint()
+        return IngestionCheckpoint.model_validate(result[0]["checkpoint"])
+
+    async def resumable(self, stale_after: float) -> list[tuple[int, int]]:
+        """
+        Unfinished jobs to pick up after a restart.
+
+        Queued jobs always qualify; running jobs only once they stopped reporting progress for
+        `stale_after` seconds, since another worker may still be running them.
+
+        Returns:
+            list[tuple[int, int]]: `(job_id, attempts)` of each job, oldest first.
+
+        """
+        operation = (
+            select(IngestionJobScheme.job_id, IngestionJobScheme.attempts)
+            .where(
+                or_(
+                    IngestionJobScheme.status == "queued",
+                    (IngestionJobScheme.status == "running")
+                    & (IngestionJobScheme.updated_at < func.now() - datetime.timedelta(seconds=stale_after)),
+                )
+            )
+            .order_by(IngestionJobScheme.job_id)
+        )
+        result = await self.database.run_read_query_async(operation)
+
+        return [(row["job_id"], row["attempts"]) for row in result]
+
+    async def claim(self, job_id: int, attempts: int) -> int | None:
+        """
+        Mark a job as running by this worker.
+
+        Args:
+            job_id (int): The job.
+            attempts (int): The attempt count the caller read, the claim fails if it changed.
+
+        Returns:
+            int | None: The new attempt count, the caller's token for later updates; None if
+            another worker claimed the job first or it is already finished.
+
+        """
+        operation = (
+            update(IngestionJobScheme)
+            .where(
+                IngestionJobScheme.job_id == job_id,
+                IngestionJobScheme.attempts == attempts,
+                IngestionJobScheme.status.in_(["queued", "running"]),
+            )
+            .values(status="running", attempts=attempts + 1, error=None, updated_at=func.now())
+            .returning(IngestionJobScheme.attempts)
+        )
+        result = await self.database.transaction_async(operation)
+
+        if isinstance(result, bool) or result == []:
+            return None
+        return result[0]["attempts"]
+
+    async def update(
+        self,
+        job_id: int,
+        attempts: int,
+        stage: INGESTION_STAGE_LIST,
+        progress: dict[INGESTION_STAGE_LIST, IngestionStageProgress],
+        checkpoint: IngestionCheckpoint,
+        pipeline: list[PipelineStageStats] | None = None,
+    ) -> bool:
+        """
+        Store the progress, checkpoint and pipeline stage stats of a running job.
+
+        Returns:
+            bool: False if the job was claimed by another worker since, or the write failed.
+
+        """
+        operation = (
+            update(IngestionJobScheme)
+            .where(IngestionJobScheme.job_id == job_id, IngestionJobScheme.attempts == attempts)
+            .values(
+                stage=stage,
+                progress={name: value.model_dump() for name, value in progress.items()},
+                checkpoint=checkpoint.model_dump(),
+                pipeline=[stage.model_dump() for stage in pipeline or []],
+                updated_at=func.now(),
+            )
+            .returning(IngestionJobScheme.job_id)
+        )
+        result = await self.database.transaction_async(operation)
+
+        return not isinstance(result, bool) and result != []
+
+    async def finish(
+        self, job_id: int, attempts: int, status: INGESTION_JOB_STATUS_LIST, error: str | None = None
+    ) -> bool:
+        # a job going back to `queued` is not finished, it is picked up again on the next start
+        operation = (
+            update(IngestionJobScheme)
+            .where(IngestionJobScheme.job_id == job_id, IngestionJobScheme.attempts == attempts)
+            .values(
+                status=status,
+                error=error,
+                updated_at=func.now(),
+                finished_at=None if status == "queued" else func.now(),
+            )
+            .returning(IngestionJobScheme.job_id)
+        )
+        result = await self.database.transaction_async(operation)
+
+        return not isinstance(result, bool) and result != []
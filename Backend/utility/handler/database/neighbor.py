@@ -0,0 +1,265 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import time
+from os import getenv
+from typing import TYPE_CHECKING, Literal
+
+from sqlalchemy import delete, func, insert, literal, or_, select
+
+from Backend.utility.handler.log_handler import Logger
+from Backend.utility.model.application.search import GraphEdge, GraphNode, GraphTraversalEnd
+from Backend.utility.model.handler.database.scheme import ContentVectorScheme, PatentNeighborScheme, PatentScheme
+
+from .database import DatabaseConnection
+from .search import SearchEngineOperation
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+class NeighborOperation:
+    def __init__(self) -> None:
+        self.logger = Logger().get_logger()
+        self.database = DatabaseConnection
+        self.search = SearchEngineOperation()
+        # neighbours stored per patent, graph requests with a larger k fall back to live search
+        self.k = int(getenv("PATENT_NEIGHBOR_K", "10"))
+        # patents near a new one checked for a displaced neighbour, see `refresh_affected`
+        self.reverse_k = int(getenv("PATENT_NEIGHBOR_REVERSE_K", str(5 * self.k)))
+
+    async def fetch(self, patent_id: int, k: int) -> list[int] | None:
+        """
+        Read the precomputed neighbours of a patent.
+
+        Args:
+            patent_id (int): The source patent.
+            k (int): The number of neighbours wanted.
+
+        Returns:
+            list[int] | None: Up to k patent IDs nearest first, None if the patent has not been
+            processed yet or k exceeds the stored neighbour count.
+
+        """
+        if k > self.k:
+            return None
+
+        operation = (
+            select(PatentNeighborScheme.neighbor_id)
+            .where(PatentNeighborScheme.patent_id == patent_id)
+            .order_by(PatentNeighborScheme.rank)
+            .limit(k)
+        )
+        neighbor_ids = await self.database.run_read_query_vector_async(operation)
+
+        return [int(neighbor_id) for neighbor_id in neighbor_ids] or None
+
+    async def refresh(self, patent_id: int) -> list[int]:
+        """
+        Recompute and store the neighbours of one patent, replacing the previous ones.
+
+        Args:
+            patent_id (int): The patent to refresh.
+
+        Returns:
+            list[int]: The new neighbour IDs, empty if the patent has no embeddings or the write failed.
+
+        """
+        neighbours = self.search.similar_patents_query(patent_id, self.k).subquery("neighbours")
+        ranked = select(
+            literal(patent_id),
+            func.row_number().over(order_by=neighbours.c.distance),
+            neighbours.c.patent_id,
+            neighbours.c.distance,
+        )
+
+        is_success = await self.database.run_writes_async(
+            [
+                delete(PatentNeighborScheme).where(PatentNeighborScheme.patent_id == patent_id),
+                insert(PatentNeighborScheme).from_select(
+                    ["patent_id", "rank", "neighbor_id", "distance"],
+                    ranked,
+                ),
+            ],
+            settings=await self.search.similar_patents_settings(patent_id, self.k),
+        )
+        if not is_success:
+            return []
+
+        return await self.fetch(patent_id, self.k) or []
+
+    async def refresh_affected(self, patent_ids: list[int]) -> int:
+        """
+        Refresh the neighbours after an ingestion.
+
+        The new patents get their neighbour lists, and so do the existing patents a new one
+        is now closer to than their k-th stored neighbour. Those are not the new patent's own
+        neighbours, k-NN is not symmetric, so they are looked up among the `reverse_k`
+        patents nearest to it before its neighbours are refreshed.
+
+        This is an approximation: a patent further than `reverse_k` patents away, or one the
+        ANN index misses, keeps its old list. Rebuild the whole table with `refresh_all`
+        (`POST /api/v1/system/rebuild-patent-neighbors/`, admin only) after large imports.
+
+        Args:
+            patent_ids (list[int]): The newly ingested patents.
+
+        Returns:
+            int: The number of patents refreshed.
+
+        """
+        refreshed: set[int] = set()
+        affected: set[int] = set()
+
+        for patent_id in patent_ids:
+            affected.update(await self._displaced(patent_id))
+            await self.refresh(patent_id)
+            refreshed.add(patent_id)
+
+        for patent_id in affected - refreshed:
+            await self.refresh(patent_id)
+            refreshed.add(patent_id)
+
+        self.logger.info("Refreshed neighbours of %d patents", len(refreshed))
+        return len(refreshed)
+
+    async def _displaced(self, patent_id: int) -> list[int]:
+        # patent distances are symmetric, a candidate's list changes when the new patent is
+        # nearer than its k-th neighbour, or it has fewer than k
+        candidates = self.search.similar_patents_query(patent_id, self.reverse_k).subquery("candidates")
+        kth_distance = (
+            select(PatentNeighborScheme.distance)
+            .where(PatentNeighborScheme.patent_id == candidates.c.patent_id, PatentNeighborScheme.rank == self.k)
+            .scalar_subquery()
+        )
+        operation = select(candidates.c.patent_id).where(
+            or_(kth_distance.is_(None), candidates.c.distance < kth_distance)
+        )
+        settings = await self.search.similar_patents_settings(patent_id, self.reverse_k)
+
+        return [int(i) for i in await self.database.run_read_query_vector_async(operation, settings=settings)]
+
+    async def refresh_all(self) -> int:
+        """
+        Recompute the neighbours of every patent with content embeddings.
+
+        Returns:
+            int: The number of patents refreshed.
+
+        """
+        operation = select(ContentVectorScheme.patent_id).distinct().order_by(ContentVectorScheme.patent_id)
+        patent_ids = await self.database.run_read_query_vector_async(operation)
+
+        for index, patent_id in enumerate(patent_ids, start=1):
+            await self.refresh(int(patent_id))
+            if index % 1000 == 0:
+                self.logger.info("Refreshed neighbours: %d / %d", index, len(patent_ids))
+
+        return len(patent_ids)
+
+    async def _neighbor_edges(
+        self, patent_ids: list[int], fan_out: int, deadline: float
+    ) -> dict[int, list[tuple[int, float]]]:
+        # one lookup for the stored neighbours of the whole BFS level
+        operation = (
+            select(PatentNeighborScheme.patent_id, PatentNeighborScheme.neighbor_id, PatentNeighborScheme.distance)
+            .where(PatentNeighborScheme.patent_id.in_(patent_ids), PatentNeighborScheme.rank <= fan_out)
+            .order_by(PatentNeighborScheme.patent_id, PatentNeighborScheme.rank)
+        )
+
+        edges: dict[int, list[tuple[int, float]]] = {}
+        for row in await self.database.run_read_query_async(operation):
+            edges.setdefault(row["patent_id"], []).append((row["neighbor_id"], row["distance"]))
+
+        # live search for patents not processed yet, or when fan_out exceeds the stored k
+        for patent_id in patent_ids:
+            if fan_out <= self.k and patent_id in edges:
+                continue
+            if time.monotonic() >= deadline:
+                break
+            live = await self.database.run_read_query_async(
+                self.search.similar_patents_query(patent_id, fan_out),
+                settings=await self.search.similar_patents_settings(patent_id, fan_out),
+            )
+            edges[patent_id] = [(row["patent_id"], row["distance"]) for row in live]
+
+        return edges
+
+    async def _titles(self, patent_ids: list[int]) -> dict[int, str]:
+        operation = select(PatentScheme.patent_id, PatentScheme.title).where(PatentScheme.patent_id.in_(patent_ids))
+        return {row["patent_id"]: row["title"] for row in await self.database.run_read_query_async(operation)}
+
+    async def traverse(
+        self, patent_id: int, depth: int, fan_out: int, max_nodes: int, time_budget: float
+    ) -> AsyncIterator[GraphNode | GraphEdge | GraphTraversalEnd]:
+        """
+        Breadth-first expansion of a patent's similarity neighbourhood.
+
+        Nodes and edges are yielded level by level as they are discovered, so a client can
+        render while the traversal continues. Each patent is expanded once; edges to patents
+        already visited are still reported, without duplicates.
+
+        Args:
+            patent_id (int): The start patent, yielded at depth 0.
+            depth (int): The number of hops to expand.
+            fan_out (int): Neighbours followed per patent.
+            max_nodes (int): Stop once this many patents are visited.
+            time_budget (float): Stop expanding after this many seconds.
+
+        Yields:
+            GraphNode | GraphEdge | GraphTraversalEnd: The discovered graph, then one end record
+            with the totals and why the traversal stopped.
+
+        """
+        deadline = time.monotonic() + time_budget
+        titles = await self._titles([patent_id])
+        if patent_id not in titles:
+            yield GraphTraversalEnd(nodes=0, edges=0, reason="complete")
+            return
+
+        yield GraphNode(patent_id=patent_id, title=titles[patent_id], depth=0)
+
+        visited = {patent_id}
+        seen_edges: set[frozenset[int]] = set()
+        frontier = [patent_id]
+        reason: Literal["complete", "node_budget", "time_budget"] = "complete"
+
+        for level in range(1, depth + 1):
+            if not frontier:
+                break
+            if time.monotonic() >= deadline:
+                reason = "time_budget"
+                break
+
+            edges = await self._neighbor_edges(frontier, fan_out, deadline)
+            if time.monotonic() >= deadline:
+                reason = "time_budget"
+
+            discovered: list[int] = []
+            level_edges: list[GraphEdge] = []
+            for source in frontier:
+                for target, distance in edges.get(source, []):
+                    if target not in visited:
+                        if len(visited) >= max_nodes:
+                            reason = "node_budget"
+                            continue
+                        visited.add(target)
+                        discovered.append(target)
+
+                    edge_key = frozenset((source, target))
+                    if edge_key not in seen_edges:
+                        seen_edges.add(edge_key)
+                        level_edges.append(GraphEdge(source=source, target=target, similarity=1 - distance))
+
+            titles = await self._titles(discovered) if discovered else {}
+            for target in discovered:
+                yield GraphNode(patent_id=target, title=titles.get(target, ""), depth=level)
+            for edge in level_edges:
+                yield edge
+
+            if reason != "complete":
+                break
+            frontier = discovered
+
+        yield GraphTraversalEnd(nodes=len(visited), edges=len(seen_edges), reason=reason)
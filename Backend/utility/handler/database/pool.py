@@ -0,0 +1,120 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import time
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from Backend.utility.handler.log_handler import Logger
+from Backend.utility.model.handler.database.database import ConnectionPoolStats
+
+if TYPE_CHECKING:
+    from sqlalchemy.pool import PoolProxiedConnection, QueuePool
+
+    from Backend.utility.model.handler.database.database import DatabaseConfig
+
+
+class PoolMonitor:
+    """
+    Counts connection acquisitions of one engine's pool.
+
+    SQLAlchemy's `checkout` event fires once a connection is handed out, not when the caller
+    starts waiting, so the wait is measured around the public `Pool.connect`, which every
+    engine checkout goes through, in a subclass built by `pool_class`. The limits come from
+    the `DatabaseConfig` the pool was built with.
+    """
+
+    def __init__(self, name: str, config: DatabaseConfig) -> None:
+        self.logger = Logger().get_logger()
+        self.name = name
+        self.max_overflow = config.max_overflow
+        # warn while requests still get a connection, before they start timing out
+        self.wait_warning_seconds = config.pool_timeout / 2
+
+        self._lock = Lock()
+        self._acquire_count = 0
+        self._overflow_count = 0
+        self._timeout_count = 0
+        self._total_wait = 0.0
+        self._last_wait = 0.0
+        self._max_wait = 0.0
+
+    def pool_class(self, base: type[QueuePool]) -> type[QueuePool]:
+        """
+        Build a pool class reporting to this monitor.
+
+        The monitor is bound to the class rather than the instance, so it survives
+        `Pool.recreate()` after `engine.dispose()`.
+
+        Args:
+            base (type[QueuePool]): `QueuePool` or `AsyncAdaptedQueuePool`.
+
+        Returns:
+            type[QueuePool]: The instrumented subclass, passed to `create_engine(poolclass=...)`.
+
+        """
+        monitor = self
+
+        class InstrumentedPool(base):  # type: ignore[valid-type, misc]
+            def connect(self) -> PoolProxiedConnection:
+                overflow_before = self.overflow()
+                start = time.perf_counter()
+                try:
+                    connection = super().connect()
+                except PoolTimeoutError:
+                    monitor.record_timeout(time.perf_counter() - start)
+                    raise
+
+                overflowed = self.overflow() > max(overflow_before, 0)
+                monitor.record_acquire(time.perf_counter() - start, overflowed)
+                return connection
+
+        InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+        return InstrumentedPool
+
+    def record_acquire(self, wait: float, overflowed: bool) -> None:
+        with self._lock:
+            self._acquire_count += 1
+            self._overflow_count += overflowed
+            self._total_wait += wait
+            self._last_wait = wait
+            self._max_wait = max(self._max_wait, wait)
+
+        if wait >= self.wait_warning_seconds:
+            self.logger.warning("%s pool: waited %.2fs for a connection", self.name, wait)
+
+    def record_timeout(self, wait: float) -> None:
+        with self._lock:
+            self._timeout_count += 1
+            self._max_wait = max(self._max_wait, wait)
+
+        self.logger.error("%s pool: no connection available after %.2fs", self.name, wait)
+
+    def stats(self, pool: QueuePool) -> ConnectionPoolStats:
+        """
+        Snapshot of the pool occupancy and the acquisition counters.
+
+        Args:
+            pool (QueuePool): The engine's current pool, `engine.pool`.
+
+        Returns:
+            ConnectionPoolStats: Checked-out connections, overflow and wait times.
+
+        """
+        with self._lock:
+            return ConnectionPoolStats(
+                pool_size=pool.size(),
+                max_overflow=self.max_overflow,
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                acquire_count=self._acquire_count,
+                overflow_count=self._overflow_count,
+                timeout_count=self._timeout_count,
+                last_wait_ms=self._last_wait * 1000,
+                max_wait_ms=self._max_wait * 1000,
+                average_wait_ms=self._total_wait / self._acquire_count * 1000 if self._acquire_count else 0.0,
+            )
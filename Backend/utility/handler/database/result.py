@@ -16,7 +16,7 @@ class ResultOperation:
         self.logger = Logger().get_logger()
         self.database = DatabaseConnection
 
-    def search_patent_by_id(self, patent_id: int) -> PatentInfoModel | None:
+    async def search_patent_by_id(self, patent_id: int) -> PatentInfoModel | None:
         """
         Retrieve detailed patent information for IDs.
 
@@ -32,7 +32,7 @@ class ResultOperation:
         """
         operation = select(PatentScheme).where(PatentScheme.patent_id == patent_id)
 
-        patent = self.database.run_query(operation)
+        patent = await self.database.run_query_async(operation)
         self.logger.info(patent)
 
         if isinstance(patent, bool) or patent == []:
@@ -2,19 +2,28 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from sqlalchemy import insert
 
 from Backend.utility.handler.log_handler import Logger
 from Backend.utility.model.handler.database.scheme import PatentScheme
 from Backend.utility.model.handler.scraper import PatentModel
 
+from .bigram import BigramOperation
 from .database import DatabaseConnection
+from .substring_index import get_substring_search_mode
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
 
 
 class ScraperOperation:
     def __init__(self):
         self.logger = Logger().get_logger()
         self.database = DatabaseConnection
+        self.bigram = BigramOperation()
+        self.substring_search_mode = get_substring_search_mode()
 
     def insert_patent(self, patent: PatentModel) -> int | None:
         operation = (
@@ -39,14 +48,25 @@ class ScraperOperation:
             .returning(PatentScheme.patent_id)
         )
 
-        result = self.database.transaction(operation)
+        def work(connection: Connection) -> int:
+            patent_id = connection.execute(operation).scalar_one()
+
+            # in the patent's transaction, a failed bigram insert rolls the patent back too
+            if self.substring_search_mode == "bigram":
+                bigram_operation = self.bigram.index_operation(
+                    [(patent_id, "title", patent.Title), (patent_id, "applicant", patent.Applicant)]
+                )
+                if bigram_operation is not None:
+                    connection.execute(bigram_operation)
+
+            return patent_id
 
-        self.logger.info(result)
+        self.database.log_sql(operation)
+        patent_id = self.database.run_transaction(work)
 
-        if isinstance(result, bool) or result == []:
-            return None
+        self.logger.info(patent_id)
 
-        return result[0]["patent_id"]
+        return patent_id
 
     # def insert_vector(self, embedding: list[float], patent_id: int, page: int, is_image: bool = False) -> bool:
     #     """
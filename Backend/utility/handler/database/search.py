@@ -2,37 +2,192 @@
 
 from __future__ import annotations
 
-from sqlalchemy import func, insert, or_, select
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Float, case, cast, delete, func, insert, literal, select, text, true, tuple_, union
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import aliased
 
 from Backend.utility.handler.log_handler import Logger
 from Backend.utility.model.application.history import SearchHistoryRecord
-from Backend.utility.model.handler.database.scheme import ContentVectorScheme, PatentScheme, SearchHistoryScheme
+from Backend.utility.model.application.search import (
+    BulkInsertResult,
+    HybridSearchHit,
+    HybridSearchPage,
+    PatentSearchPage,
+    PatentSimilarity,
+    SearchCursor,
+)
+from Backend.utility.model.handler.database.scheme import (
+    ABSTRACT_PAGE,
+    ContentVectorScheme,
+    ImageVectorScheme,
+    PatentScheme,
+    SearchHistoryScheme,
+)
 from Backend.utility.model.handler.scraper import PatentInfoModel
 
+from .bigram import BigramOperation
 from .database import DatabaseConnection
+from .search_ranking import decode_cursor, encode_cursor, reciprocal_rank_fusion
+from .substring_index import TRIGRAM_MIN_LENGTH, get_substring_search_mode
+from .vector_index import HNSW_MAX_EF_SEARCH, candidate_search_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from sqlalchemy import ColumnElement, CompoundSelect, Select
+    from sqlalchemy.sql.expression import Executable
+
+    from Backend.utility.model.handler.database.database import (
+        SIMILARITY_AGGREGATION_LIST,
+        SUBSTRING_SEARCH_MODE_LIST,
+    )
+
+# chunks read per wanted neighbour in `similar_patents_query`, a close patent matches on several pages
+SIMILAR_CHUNKS_PER_PATENT = 4
 
 
 class SearchEngineOperation:
-    def __init__(self) -> None:
+    def __init__(self, substring_search_mode: SUBSTRING_SEARCH_MODE_LIST | None = None) -> None:
         self.logger = Logger().get_logger()
         self.database = DatabaseConnection
+        self.bigram = BigramOperation()
+        self.substring_search_mode = substring_search_mode or get_substring_search_mode()
+
+    def _lexical_match(self, search_keywords: str) -> ColumnElement[bool]:
+        """
+        Build the `search_vector @@ query` predicate served by `patent_search_vector_idx`.
+
+        The query config must stay `'simple'`, the same config the generated column is built
+        with, otherwise PostgreSQL cannot use the GIN index.
+        """
+        return PatentScheme.search_vector.bool_op("@@")(func.websearch_to_tsquery("simple", search_keywords))
+
+    @staticmethod
+    def _like_pattern(search_keywords: str) -> str:
+        """Escape LIKE wildcards so the keyword is matched literally as a substring."""
+        escaped = search_keywords.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{escaped}%"
 
-    def full_text_search(self, search_keywords: str) -> list[PatentInfoModel]:
-        operation = select(PatentScheme).where(
-            or_(
-                func.to_tsvector("simple", PatentScheme.title).bool_op("@@")(
-                    func.websearch_to_tsquery("simple", search_keywords)
-                ),
-                PatentScheme.title.like("%" + search_keywords + "%"),
+    def _substring_matches(self, search_keywords: str) -> list[Select]:
+        """
+        Build one `SELECT patent_id` per field matching `LIKE '%keyword%'`.
+
+        Each field gets its own query instead of one OR-ed predicate so every branch can be
+        served by its own index.
+
+        - `trigram` mode relies on the pg_trgm GIN indexes, which need a keyword of at least
+          three characters to extract a trigram; shorter keywords scan.
+        - `bigram` mode, the default, picks per keyword: two-character keywords, common in
+          CJK, are narrowed to the `patent_bigram` candidates and re-checked with LIKE, longer
+          ones use the pg_trgm indexes as above. Single characters have no bigram and fall
+          back to a plain scan.
+
+        Args:
+            search_keywords (str): The keyword to match as a substring.
+
+        Returns:
+            list[Select]: The per-field patent id queries.
+
+        """
+        pattern = self._like_pattern(search_keywords)
+        abstract_page = literal(ABSTRACT_PAGE, literal_execute=True)
+
+        title_match = select(PatentScheme.patent_id).where(PatentScheme.title.like(pattern, escape="\\"))
+        applicant_match = select(PatentScheme.patent_id).where(PatentScheme.applicant.like(pattern, escape="\\"))
+        abstract_match = select(ContentVectorScheme.patent_id).where(
+            ContentVectorScheme.page == abstract_page,
+            ContentVectorScheme.content.like(pattern, escape="\\"),
+        )
+
+        if self.substring_search_mode == "bigram" and 2 <= len(search_keywords) < TRIGRAM_MIN_LENGTH:  # noqa: PLR2004
+            title_match = title_match.where(
+                PatentScheme.patent_id.in_(self.bigram.candidate_patent_ids("title", search_keywords))
+            )
+            applicant_match = applicant_match.where(
+                PatentScheme.patent_id.in_(self.bigram.candidate_patent_ids("applicant", search_keywords))
+            )
+            abstract_match = abstract_match.where(
+                ContentVectorScheme.patent_id.in_(self.bigram.candidate_patent_ids("abstract", search_keywords))
             )
+
+        return [title_match, applicant_match, abstract_match]
+
+    def _matching_patent_ids(self, search_keywords: str) -> CompoundSelect:
+        """The ids of patents matching the keyword lexically or as a substring, deduplicated."""
+        lexical_match = select(PatentScheme.patent_id).where(self._lexical_match(search_keywords))
+        return union(lexical_match, *self._substring_matches(search_keywords))
+
+    def _rank(self, search_keywords: str) -> ColumnElement[float]:
+        """
+        Relevance of a matched patent.
+
+        `ts_rank` over the weighted `search_vector` (title A, applicant B, IPC C), plus a
+        substring bonus mirroring those weights, since CJK substring hits have no lexical rank.
+        """
+        pattern = self._like_pattern(search_keywords)
+        lexical_rank = func.ts_rank(PatentScheme.search_vector, func.websearch_to_tsquery("simple", search_keywords))
+        title_bonus = case((PatentScheme.title.like(pattern, escape="\\"), 1.0), else_=0.0)
+        applicant_bonus = case((PatentScheme.applicant.like(pattern, escape="\\"), 0.4), else_=0.0)
+
+        return cast(lexical_rank + title_bonus + applicant_bonus, Float)
+
+    async def full_text_search(
+        self, search_keywords: str, limit: int = 20, cursor: str | None = None
+    ) -> PatentSearchPage:
+        """
+        Search patents by keyword, ranked by relevance and paginated with a keyset cursor.
+
+        A patent matches when the keyword hits its indexed `search_vector` (title, applicant,
+        IPC and application number) or appears as a substring of its title, applicant or
+        abstract. The `'simple'` text-search config does not segment CJK text, so the
+        substring branches are what find "鞋面" inside "一種鞋面結構"; how they are indexed is
+        chosen by `SUBSTRING_SEARCH_MODE`.
+
+        Pages are ordered by `(rank, patent_id)` descending and continue strictly after the
+        cursor position, so no OFFSET rows are read and thrown away, and only `limit` patents
+        are fetched. Every page still matches and ranks all the matching patents before the
+        top-N sort, so its cost grows with the match count, not with the page depth.
+        `total_estimate` comes from the planner, not `COUNT(*)`, and only on the first page.
+
+        Args:
+            search_keywords (str): The keyword(s) to search for.
+            limit (int, optional): Page size. Defaults to 20.
+            cursor (str | None, optional): The `next_cursor` of the previous page. Defaults to None.
+
+        Returns:
+            PatentSearchPage: The page of patents, the cursor of the next page and, on the first
+            page, the estimated total.
+
+        Raises:
+            InvalidCursorError: If the cursor cannot be decoded.
+
+        """
+        matched_ids = self._matching_patent_ids(search_keywords)
+
+        ranked = (
+            select(PatentScheme.patent_id, self._rank(search_keywords).label("rank"))
+            .where(PatentScheme.patent_id.in_(select(matched_ids.subquery().c.patent_id)))
+            .subquery()
         )
 
-        result = self.database.run_query(operation)
+        operation = select(PatentScheme, ranked.c.rank).join(ranked, PatentScheme.patent_id == ranked.c.patent_id)
+
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            operation = operation.where(
+                tuple_(ranked.c.rank, ranked.c.patent_id) < tuple_(position.rank, position.patent_id)
+            )
+
+        # one extra row tells whether another page exists
+        operation = operation.order_by(ranked.c.rank.desc(), ranked.c.patent_id.desc()).limit(limit + 1)
+        result = await self.database.run_query_async(operation)
 
         self.logger.info(result)
 
-        # for i in result:
-        #     self.logger.debug(i[0].id)
         patent_list: list[PatentInfoModel] = [
             PatentInfoModel(
                 Patent_id=patent["PatentScheme"].patent_id,
@@ -52,15 +207,43 @@ class SearchEngineOperation:
                 PatentURL=patent["PatentScheme"].patent_url,
                 PatentFilePath=patent["PatentScheme"].patent_file_path,
             )
-            for patent in result
+            for patent in result[:limit]
         ]
         self.logger.info(patent_list)
 
-        return patent_list
+        next_cursor = None
+        if len(result) > limit:
+            last = result[limit - 1]
+            next_cursor = encode_cursor(SearchCursor(rank=last["rank"], patent_id=last["PatentScheme"].patent_id))
+
+        # the estimate is an EXPLAIN round trip, the following pages reuse the first page's
+        total_estimate = await self.database.estimate_rows_async(matched_ids) if cursor is None else None
+
+        return PatentSearchPage(patents=patent_list, next_cursor=next_cursor, total_estimate=total_estimate)
+
+    async def explain_full_text_search(self, search_keywords: str, analyze: bool = False) -> list[str]:
+        """
+        Return the execution plan of the full-text match query.
+
+        The lexical branch should show a `Bitmap Index Scan on patent_search_vector_idx`; a
+        `Seq Scan on patent` there means the query and index expressions have drifted apart.
+        The substring branches should use the `*_trgm_idx` indexes or `patent_bigram`,
+        depending on `SUBSTRING_SEARCH_MODE`.
+
+        Args:
+            search_keywords (str): The keyword(s) to search for.
+            analyze (bool, optional): Execute the query and include timings. Defaults to False.
+
+        Returns:
+            list[str]: The EXPLAIN output lines.
+
+        """
+        operation = self._matching_patent_ids(search_keywords)
+        return await self.database.explain_async(operation, analyze=analyze)
 
     # def vector_search(self) -> list[PatentModel]: ...
 
-    def log_search_history(self, search_keywords: str, search_result: SearchHistoryRecord) -> bool:
+    async def log_search_history(self, search_keywords: str, search_result: SearchHistoryRecord) -> bool:
         operation = insert(SearchHistoryScheme).values(
             user_id=search_result.user_id,
             patent_id=search_result.patent_id,
@@ -68,12 +251,12 @@ class SearchEngineOperation:
             search_time=search_result.search_time,
         )
 
-        result = self.database.run_write(operation)
+        result = await self.database.run_write_async(operation)
         self.logger.info(result)
 
         return result
 
-    def insert_vector(
+    async def insert_vector(
         self, embedding: list[float], patent_id: int, page: int, content: str, is_image: bool = False
     ) -> bool:
         """
@@ -115,7 +298,7 @@ class SearchEngineOperation:
                     :embedding
                 )"""
 
-            result = self.database.run_raw_query(
+            result = await self.database.run_raw_query_async(
                 raw_sql,
                 param={
                     "patent_id": patent_id,
@@ -138,15 +321,16 @@ class SearchEngineOperation:
                     :embedding
                 )"""
 
-            result = self.database.run_raw_query(
-                raw_sql,
-                param={
-                    "patent_id": patent_id,
-                    "page": page,
-                    "content": content,
-                    "embedding": embedding,
-                },
-            )
+            statements: list[Executable] = [
+                text(raw_sql).bindparams(patent_id=patent_id, page=page, content=content, embedding=embedding)
+            ]
+            # the abstract's bigrams are written in its transaction, so it is never searchable without them
+            if page == ABSTRACT_PAGE and self.substring_search_mode == "bigram":
+                bigram_operation = self.bigram.index_operation([(patent_id, "abstract", content)])
+                if bigram_operation is not None:
+                    statements.append(bigram_operation)
+
+            result = await self.database.run_writes_async(statements)
 
         # `run_raw_query` returns ``True`` on success and ``False`` on failure
         # for statements that do not yield rows (like the INSERTs above).  The
@@ -157,75 +341,358 @@ class SearchEngineOperation:
 
         return bool(result)
 
-    def search_patent_similarity_by_vector(self, embedding_vector: list[float]) -> list[int]:
+    async def bulk_insert_vectors(
+        self, rows: Sequence[tuple[int, int, str, list[float]]], is_image: bool = False, replace: bool = False
+    ) -> BulkInsertResult:
+        """
+        Inserts a batch of vector embeddings with one binary COPY in a single transaction.
+
+        Use this instead of `insert_vector` when ingesting whole patents: one round trip
+        per batch rather than one transaction per page chunk or image.
+
+        Args:
+            rows (Sequence[tuple[int, int, str, list[float]]]): `(patent_id, page, content, embedding)`
+                tuples, where content is the page text or, with `is_image`, the image path.
+            is_image (bool, optional): Insert into `patent_image_vector` instead of
+                `patent_content_vector`. Defaults to False.
+            replace (bool, optional): Delete the vectors the rows' patents already have in the
+                table, in the same transaction as the COPY. Defaults to False.
+
+        Returns:
+            BulkInsertResult: Rows written and throughput, `rows` is 0 if the batch was rolled back.
+
+        """
+        table, content_column = (
+            ("patent_image_vector", "image_path") if is_image else ("patent_content_vector", "content")
+        )
+        scheme = ImageVectorScheme if is_image else ContentVectorScheme
+        patent_ids = list({row[0] for row in rows})
+        before = [delete(scheme).where(scheme.patent_id.in_(patent_ids))] if replace else []
+        after: list[Executable] = []
+        if not is_image and self.substring_search_mode == "bigram":
+            bigram_operation = self.bigram.index_operation(
+                (patent_id, "abstract", content) for patent_id, page, content, _ in rows if page == ABSTRACT_PAGE
+            )
+            if bigram_operation is not None:
+                after.append(bigram_operation)
+
+        start = time.perf_counter()
+        count = await self.database.copy_rows_async(
+            table,
+            columns=("patent_id", "page", content_column, "embedding"),
+            types=("int4", "int4", "text", "vector"),
+            rows=rows,
+            before=before,
+            after=after,
+        )
+        seconds = time.perf_counter() - start
+
+        result = BulkInsertResult(
+            rows=max(count, 0),
+            seconds=seconds,
+            rows_per_second=max(count, 0) / seconds if seconds > 0 else 0.0,
+        )
+        self.logger.info("Bulk inserted %d rows into %s (%.1f rows/s)", result.rows, table, result.rows_per_second)
+        return result
+
+    def _patent_similarity_query(
+        self,
+        embedding_vector: list[float],
+        k: int,
+        candidates: int,
+        aggregation: SIMILARITY_AGGREGATION_LIST,
+        top_m: int,
+    ) -> Select:
+        distance = ContentVectorScheme.embedding.cosine_distance(embedding_vector)
+        # the nearest chunks first, so the ANN index bounds the work
+        chunks = (
+            select(
+                ContentVectorScheme.patent_id,
+                ContentVectorScheme.page,
+                (1 - distance).label("similarity"),
+            )
+            .order_by(distance)
+            .limit(candidates)
+            .subquery("chunks")
+        )
+
+        ranked = select(
+            chunks,
+            func.row_number()
+            .over(partition_by=chunks.c.patent_id, order_by=chunks.c.similarity.desc())
+            .label("chunk_rank"),
+        ).subquery("ranked")
+
+        score = func.max(ranked.c.similarity) if aggregation == "max" else func.sum(ranked.c.similarity)
+
+        return (
+            select(
+                ranked.c.patent_id,
+                cast(score, Float).label("score"),
+                func.array_agg(aggregate_order_by(ranked.c.page, ranked.c.similarity.desc())).label("pages"),
+            )
+            .where(ranked.c.chunk_rank <= top_m)
+            .group_by(ranked.c.patent_id)
+            .order_by(score.desc(), ranked.c.patent_id)
+            .limit(k)
+        )
+
+    async def search_patent_similarity(
+        self,
+        embedding_vector: list[float],
+        k: int = 3,
+        candidates: int = 100,
+        aggregation: SIMILARITY_AGGREGATION_LIST = "max",
+        top_m: int = 3,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[PatentSimilarity]:
+        """
+        Rank patents, not chunks, by similarity to the given embedding vector.
+
+        The `candidates` nearest chunks are grouped per patent in SQL and only k rows come back.
+        `max` scores a patent by its best chunk; `sum` adds its best `top_m` chunks, favouring
+        patents that match on several pages. The index is always searched wide enough to
+        return all `candidates` chunks, see `candidate_search_settings`.
+
+        Args:
+            embedding_vector (list[float]): The embedding vector to use as the similarity query.
+            k (int, optional): The number of distinct patents. Defaults to 3.
+            candidates (int, optional): Chunks fetched before aggregation, keep it well above k
+                so k distinct patents remain; at most 1000 are returned under HNSW. Defaults to 100.
+            aggregation (SIMILARITY_AGGREGATION_LIST, optional): `max` or `sum`. Defaults to "max".
+            top_m (int, optional): Chunks per patent kept for the score and `pages`. Defaults to 3.
+            ef_search (int | None, optional): HNSW `ef_search` for this query, raised to
+                `candidates` if lower. Defaults to None.
+            probes (int | None, optional): IVFFlat `probes` for this query. Defaults to None.
+
+        Returns:
+            list[PatentSimilarity]: Up to k patents, best score first, with their matched pages.
+
+        """
+        operation = self._patent_similarity_query(embedding_vector, k, candidates, aggregation, top_m)
+
+        result = await self.database.run_read_query_async(
+            operation, settings=candidate_search_settings(candidates, ef_search, probes)
+        )
+        self.logger.info(result)
+
+        return [
+            PatentSimilarity(patent_id=row["patent_id"], score=row["score"], pages=row["pages"]) for row in result
+        ]
+
+    async def search_patent_similarity_by_vector(
+        self, embedding_vector: list[float], ef_search: int | None = None, probes: int | None = None
+    ) -> list[int]:
         """
         Retrieve the top-3 most similar patent IDs to the given embedding vector.
 
         Args:
             embedding_vector (list[float]): The embedding vector to use as the similarity query.
+            ef_search (int | None, optional): HNSW `ef_search` for this query. Defaults to None.
+            probes (int | None, optional): IVFFlat `probes` for this query. Defaults to None.
 
         Returns:
-            list[int]: A list of up to three patent IDs most similar to the input vector.
+            list[int]: Up to three distinct patent IDs most similar to the input vector, best first.
                     Returns an empty list if no similar patents are found.
 
         Raises:
             DatabaseError: If the similarity search fails.
 
         """
-        search_operation = (
-            select(ContentVectorScheme.patent_id)
-            .order_by(ContentVectorScheme.embedding.cosine_distance(embedding_vector).label("dist"))
-            .limit(3)
+        similar_patents = await self.search_patent_similarity(
+            embedding_vector, k=3, ef_search=ef_search, probes=probes
         )
+        self.logger.info("Found similar patent IDs: %s", similar_patents)
 
-        target_patents = self.database.run_query_vector(search_operation)
-        self.logger.info("Found similar patent IDs: %s", target_patents)
+        return [patent.patent_id for patent in similar_patents]
 
-        if isinstance(target_patents, bool) or target_patents == []:
-            return []
+    async def lexical_candidates(self, search_keywords: str, limit: int) -> list[int]:
+        """
+        The `limit` best keyword matches, ranked like `full_text_search`.
+
+        Args:
+            search_keywords (str): The keyword(s) to search for.
+            limit (int): The number of candidates.
+
+        Returns:
+            list[int]: Patent IDs, best first.
+
+        """
+        matched_ids = self._matching_patent_ids(search_keywords)
+        operation = (
+            select(PatentScheme.patent_id)
+            .where(PatentScheme.patent_id.in_(select(matched_ids.subquery().c.patent_id)))
+            .order_by(self._rank(search_keywords).desc(), PatentScheme.patent_id.desc())
+            .limit(limit)
+        )
+
+        return [int(patent_id) for patent_id in await self.database.run_read_query_vector_async(operation)]
+
+    async def hybrid_search(
+        self,
+        search_keywords: str,
+        embed_text: Callable[[str], list[float]],
+        limit: int = 20,
+        offset: int = 0,
+        lexical_limit: int = 100,
+        vector_limit: int = 100,
+    ) -> HybridSearchPage:
+        """
+        Keyword and semantic search fused into one ranking with reciprocal-rank fusion.
+
+        The lexical stage runs while the query is embedded and searched in the vector index.
+        Each stage returns at most its own limit, so the fused list, and the latency, stay
+        bounded however broad the keyword is; pages are slices of that list. The vector stage
+        reads four chunks per wanted patent, at most 1000 under HNSW, and can return fewer
+        than `vector_limit` patents when their chunks crowd the nearest ones.
 
-        # ``run_query_vector`` returns the scalar value of the selected column
-        # (the patent id in this case).  The previous implementation attempted
-        # to treat each entry as a row mapping which resulted in a
-        # ``TypeError``.  Simply cast each returned value to ``int``.
+        Args:
+            search_keywords (str): The query.
+            embed_text (Callable[[str], list[float]]): Blocking embedding function, run in a thread.
+            limit (int, optional): Page size. Defaults to 20.
+            offset (int, optional): Position in the fused list. Defaults to 0.
+            lexical_limit (int, optional): Keyword candidates. Defaults to 100.
+            vector_limit (int, optional): Semantic candidates, distinct patents. Defaults to 100.
+
+        Returns:
+            HybridSearchPage: The page of patents with fused scores, and the next offset.
+
+        """
+
+        async def vector_stage() -> list[int]:
+            embedding = await asyncio.to_thread(embed_text, search_keywords)
+            candidates = min(vector_limit * 4, HNSW_MAX_EF_SEARCH)
+            similar_patents = await self.search_patent_similarity(embedding, k=vector_limit, candidates=candidates)
+            if len(similar_patents) < vector_limit:
+                self.logger.debug(
+                    "Vector stage found %s of %s patents in %s chunks", len(similar_patents), vector_limit, candidates
+                )
+            return [patent.patent_id for patent in similar_patents]
+
+        lexical_ids, vector_ids = await asyncio.gather(
+            self.lexical_candidates(search_keywords, lexical_limit), vector_stage()
+        )
+
+        fused = reciprocal_rank_fusion([lexical_ids, vector_ids])
+        page = fused[offset : offset + limit]
 
-        return [int(patent) for patent in target_patents]
+        patents = {patent.Patent_id: patent for patent in await self.search_patent_by_id({i for i, _ in page})}
+        lexical_rank = {patent_id: rank for rank, patent_id in enumerate(lexical_ids, start=1)}
+        vector_rank = {patent_id: rank for rank, patent_id in enumerate(vector_ids, start=1)}
 
-    def search_patent_similarity_by_id(self, patent_id: int) -> set[int]:
+        return HybridSearchPage(
+            hits=[
+                HybridSearchHit(
+                    patent=patents[patent_id],
+                    score=score,
+                    lexical_rank=lexical_rank.get(patent_id),
+                    vector_rank=vector_rank.get(patent_id),
+                )
+                for patent_id, score in page
+                if patent_id in patents
+            ],
+            next_offset=offset + limit if offset + limit < len(fused) else None,
+        )
+
+    def similar_patents_query(self, patent_id: int, k: int) -> Select:
         """
-        Find the top-3 most similar patents to a given patent, based on embedding cosine distance.
+        Build the single-query neighbour search of a patent over all its page embeddings.
+
+        Args:
+            patent_id (int): The source patent.
+            k (int): The number of neighbour patents.
+
+        Returns:
+            Select: `(patent_id, distance)` rows of up to k other patents, nearest first.
+
+        """
+        source = aliased(ContentVectorScheme, name="source")
+        candidate = aliased(ContentVectorScheme, name="candidate")
+
+        distance = candidate.embedding.cosine_distance(source.embedding)
+        # per source page, the nearest chunks of other patents, several per wanted neighbour since
+        # the limit counts chunks, not patents; the ANN index serves each lateral subquery, and the
+        # source patent's own chunks are filtered out of its candidates
+        neighbour = (
+            select(candidate.patent_id, distance.label("distance"))
+            .where(candidate.patent_id != patent_id)
+            .order_by(distance)
+            .limit(k * SIMILAR_CHUNKS_PER_PATENT)
+            .lateral("neighbour")
+        )
+
+        return (
+            select(neighbour.c.patent_id, func.min(neighbour.c.distance).label("distance"))
+            .select_from(source)
+            .join(neighbour, true())
+            .where(source.patent_id == patent_id)
+            .group_by(neighbour.c.patent_id)
+            .order_by(func.min(neighbour.c.distance))
+            .limit(k)
+        )
+
+    async def similar_patents_settings(
+        self, patent_id: int, k: int, ef_search: int | None = None, probes: int | None = None
+    ) -> dict[str, str]:
+        """
+        ANN settings for `similar_patents_query`, to apply in the transaction that runs it.
+
+        The `patent_id` filter runs after the index scan, and the source patent's own pages are
+        the nearest to each of its pages, so every page's scan has to reach past all of them
+        before the other patents' chunks come back.
+
+        Args:
+            patent_id (int): The source patent.
+            k (int): The number of neighbour patents.
+            ef_search (int | None, optional): A caller's HNSW `ef_search`, kept if larger. Defaults to None.
+            probes (int | None, optional): A caller's IVFFlat `probes`, kept if larger. Defaults to None.
+
+        Returns:
+            dict[str, str]: The settings, see `candidate_search_settings`.
+
+        """
+        operation = (
+            select(func.count()).select_from(ContentVectorScheme).where(ContentVectorScheme.patent_id == patent_id)
+        )
+        source_pages = await self.database.run_read_query_vector_async(operation)
+        candidates = (int(source_pages[0]) if source_pages else 0) + k * SIMILAR_CHUNKS_PER_PATENT
+
+        return candidate_search_settings(candidates, ef_search, probes)
+
+    async def search_patent_similarity_by_id(
+        self, patent_id: int, k: int = 3, ef_search: int | None = None, probes: int | None = None
+    ) -> list[int]:
+        """
+        Find the k most similar patents to a given patent, based on embedding cosine distance.
+
+        Every page embedding of the patent is searched in one `LATERAL` query, so the cost is a
+        single round trip whatever the page count. A neighbour's distance is that of its closest
+        page to any page of the source patent.
 
         Args:
             patent_id (int): The ID of the patent to use as the similarity query.
+            k (int, optional): The number of neighbour patents. Defaults to 3.
+            ef_search (int | None, optional): HNSW `ef_search` for the query, raised to reach past
+                the source patent's own pages if lower. Defaults to None.
+            probes (int | None, optional): IVFFlat `probes` for the query. Defaults to None.
 
         Returns:
-            set[int]: A set of patent IDs corresponding to the three most similar patents by embedding.
+            list[int]: Up to k patent IDs, nearest first, never including `patent_id` itself.
 
         Raises:
-            DatabaseError: If the embedding query or similarity search fails.
+            DatabaseError: If the similarity search fails.
 
         """
-        embedding_query = select(ContentVectorScheme.embedding).where(ContentVectorScheme.patent_id == patent_id)
-        target_embeddings = self.database.run_query(embedding_query)
-        self.logger.info(target_embeddings)
-
-        patent_list: set[int] = set()
-        for embedding in target_embeddings:
-            search = (
-                select(ContentVectorScheme.patent_id)
-                .order_by(
-                    ContentVectorScheme.embedding.cosine_distance(embedding["embedding"]).label("dist"),
-                )
-                .limit(3)
-            )
+        operation = self.similar_patents_query(patent_id, k)
+        settings = await self.similar_patents_settings(patent_id, k, ef_search, probes)
 
-            patent_id_list = {int(i) for i in self.database.run_query_vector(search)}
-            patent_list = patent_list | patent_id_list
+        patent_list = [int(i) for i in await self.database.run_read_query_vector_async(operation, settings=settings)]
 
         self.logger.info(patent_list)
         return patent_list
 
-    def search_patent_by_id(self, patent_ids: set[int]) -> list[PatentInfoModel]:
+    async def search_patent_by_id(self, patent_ids: set[int]) -> list[PatentInfoModel]:
         """
         Retrieve detailed patent information for a set of patent IDs.
 
@@ -242,7 +709,7 @@ class SearchEngineOperation:
         """
         operation = select(PatentScheme).where(PatentScheme.patent_id.in_(patent_ids))
 
-        patents = self.database.run_query(operation)
+        patents = await self.database.run_query_async(operation)
         self.logger.info(patents)
 
         if isinstance(patents, bool) or patents == []:
@@ -0,0 +1,53 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import base64
+import binascii
+
+from Backend.utility.error.database.database import InvalidCursorError
+from Backend.utility.model.application.search import SearchCursor
+
+# reciprocal-rank fusion constant from Cormack et al., robust across result list lengths
+RRF_K = 60
+
+
+def encode_cursor(cursor: SearchCursor) -> str:
+    return base64.urlsafe_b64encode(cursor.model_dump_json().encode()).decode()
+
+
+def decode_cursor(cursor: str) -> SearchCursor:
+    """
+    Decode an opaque `next_cursor` token.
+
+    Raises:
+        InvalidCursorError: If the token was not produced by `encode_cursor`.
+
+    """
+    try:
+        return SearchCursor.model_validate_json(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error) as e:
+        raise InvalidCursorError(cursor) from e
+
+
+def reciprocal_rank_fusion(rankings: list[list[int]], k: int = RRF_K) -> list[tuple[int, float]]:
+    """
+    Merge ranked lists by summing `1 / (k + rank)` per list a patent appears in.
+
+    Only ranks are used, so the lexical and vector scores need no calibration against
+    each other.
+
+    Args:
+        rankings (list[list[int]]): Patent IDs per stage, best first.
+        k (int, optional): Damping constant, larger values flatten the top ranks. Defaults to 60.
+
+    Returns:
+        list[tuple[int, float]]: `(patent_id, score)`, best first.
+
+    """
+    scores: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, patent_id in enumerate(ranking, start=1):
+            scores[patent_id] = scores.get(patent_id, 0.0) + 1 / (k + rank)
+
+    return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
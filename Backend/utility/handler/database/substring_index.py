@@ -0,0 +1,49 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+from os import getenv
+from typing import get_args
+
+from Backend.utility.error.database.database import InvalidSubstringSearchModeError
+from Backend.utility.model.handler.database.database import SUBSTRING_SEARCH_MODE_LIST
+
+# shortest keyword pg_trgm extracts a trigram from, shorter ones need the bigram table
+TRIGRAM_MIN_LENGTH = 3
+
+
+def get_substring_search_mode() -> SUBSTRING_SEARCH_MODE_LIST:
+    """
+    Read the substring index strategy from `SUBSTRING_SEARCH_MODE`, defaulting to `bigram`.
+
+    Two-character keywords such as "鞋面" are common CJK searches and pg_trgm cannot index
+    them, so the bigram table is maintained by default. A corpus ingested in `trigram` mode
+    needs `BigramOperation().rebuild()` once before it is searched in `bigram` mode.
+
+    Raises:
+        InvalidSubstringSearchModeError: If the variable holds an unknown mode.
+
+    """
+    mode = getenv("SUBSTRING_SEARCH_MODE", "bigram")
+
+    if mode not in get_args(SUBSTRING_SEARCH_MODE_LIST):
+        raise InvalidSubstringSearchModeError(mode)
+
+    return mode  # type: ignore[return-value]
+
+
+def extract_bigrams(text: str) -> set[str]:
+    """
+    Split text into its set of overlapping 2-character substrings.
+
+    No case folding or whitespace stripping is applied, so a keyword's bigrams are present
+    in a text whenever `text LIKE '%keyword%'` holds.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        set[str]: The distinct bigrams, empty for text shorter than two characters.
+
+    """
+    return {text[i : i + 2] for i in range(len(text) - 1)}
@@ -0,0 +1,325 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import datetime
+from os import getenv
+from typing import TYPE_CHECKING, get_args
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from Backend.utility.handler.log_handler import Logger
+from Backend.utility.model.application.job import (
+    INGESTION_STAGE_LIST,
+    IngestionCheckpoint,
+    IngestionFollowUp,
+    IngestionTask,
+    NeighborsTaskPayload,
+)
+from Backend.utility.model.handler.database.scheme import IngestionJobScheme, IngestionTaskScheme
+
+from .database import DatabaseConnection
+
+if TYPE_CHECKING:
+    from sqlalchemy import ColumnElement
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+    from Backend.utility.model.application.job import INGESTION_TASK_KIND_LIST
+
+TASK_COLUMNS = (
+    IngestionTaskScheme.task_id,
+    IngestionTaskScheme.job_id,
+    IngestionTaskScheme.kind,
+    IngestionTaskScheme.payload,
+    IngestionTaskScheme.result,
+    IngestionTaskScheme.attempts,
+    IngestionTaskScheme.max_attempts,
+)
+
+# job progress is reported per stage, images are embedded while crawling
+STAGE_OF_KIND: dict[INGESTION_TASK_KIND_LIST, INGESTION_STAGE_LIST] = {
+    "scrape": "crawl",
+    "images": "crawl",
+    "ocr": "ocr",
+    "embed": "embedding",
+    "neighbors": "neighbors",
+}
+
+
+class IngestionTaskOperation:
+    def __init__(self) -> None:
+        self.logger = Logger().get_logger()
+        self.database = DatabaseConnection
+        self.max_attempts = int(getenv("INGESTION_TASK_MAX_ATTEMPTS", "5"))
+
+    def _insert(self, job_id: int, follow_ups: list[IngestionFollowUp]):  # noqa: ANN202
+        return (
+            insert(IngestionTaskScheme)
+            .values(
+                [
+                    {
+                        "job_id": job_id,
+                        "kind": follow_up.kind,
+                        "status": "pending",
+                        "payload": follow_up.payload,
+                        "result": {},
+                        "dedupe_key": follow_up.dedupe_key,
+                        "max_attempts": self.max_attempts,
+                    }
+                    for follow_up in follow_ups
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["dedupe_key"])
+        )
+
+    async def enqueue(self, job_id: int, follow_ups: list[IngestionFollowUp]) -> bool:
+        return await self.database.run_write_async(self._insert(job_id, follow_ups))
+
+    async def claim(
+        self, worker_id: str, kinds: list[INGESTION_TASK_KIND_LIST], lease: float
+    ) -> IngestionTask | None:
+        """
+        Take the next runnable task of the given kinds.
+
+        Runnable are pending tasks past their `run_after`, and running tasks whose lease
+        expired because their worker stopped sending heartbeats. `SKIP LOCKED` lets any
+        number of workers claim at once without waiting on each other's rows.
+
+        Args:
+            worker_id (str): The claiming worker, written into the task.
+            kinds (list[INGESTION_TASK_KIND_LIST]): The task kinds this worker runs.
+            lease (float): Seconds the task is held without a heartbeat.
+
+        Returns:
+            IngestionTask | None: The claimed task with its attempt count bumped, None if
+            nothing is runnable.
+
+        """
+        claimable = (
+            select(IngestionTaskScheme.task_id)
+            .where(
+                IngestionTaskScheme.kind.in_(kinds),
+                or_(
+                    and_(IngestionTaskScheme.status == "pending", IngestionTaskScheme.run_after <= func.now()),
+                    and_(IngestionTaskScheme.status == "running", IngestionTaskScheme.lease_expires_at < func.now()),
+                ),
+            )
+            .order_by(IngestionTaskScheme.run_after, IngestionTaskScheme.task_id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        operation = (
+            update(IngestionTaskScheme)
+            .where(IngestionTaskScheme.task_id == claimable)
+            .values(
+                status="running",
+                worker_id=worker_id,
+                attempts=IngestionTaskScheme.attempts + 1,
+                lease_expires_at=func.now() + datetime.timedelta(seconds=lease),
+                heartbeat_at=func.now(),
+            )
+            .returning(*TASK_COLUMNS)
+        )
+        result = await self.database.transaction_async(operation)
+
+        if isinstance(result, bool) or result == []:
+            return None
+
+        task = IngestionTask.model_validate(dict(result[0]))
+        await self.database.run_write_async(
+            update(IngestionJobScheme)
+            .where(IngestionJobScheme.job_id == task.job_id, IngestionJobScheme.status == "queued")
+            .values(status="running", updated_at=func.now())
+        )
+        return task
+
+    @staticmethod
+    def _held_by(task: IngestionTask, worker_id: str) -> ColumnElement[bool]:
+        # the claim this worker made is still the current one
+        return and_(
+            IngestionTaskScheme.task_id == task.task_id,
+            IngestionTaskScheme.worker_id == worker_id,
+            IngestionTaskScheme.attempts == task.attempts,
+            IngestionTaskScheme.status == "running",
+        )
+
+    async def heartbeat(self, task: IngestionTask, worker_id: str, lease: float) -> bool | None:
+        """
+        Extend the lease of a running task.
+
+        Returns:
+            bool | None: False if the lease already expired and another worker claimed the task,
+            None if the database could not be reached and the lease is unchanged.
+
+        """
+        operation = (
+            update(IngestionTaskScheme)
+            .where(self._held_by(task, worker_id))
+            .values(lease_expires_at=func.now() + datetime.timedelta(seconds=lease), heartbeat_at=func.now())
+            .returning(IngestionTaskScheme.task_id)
+        )
+        result = await self.database.transaction_async(operation)
+        if isinstance(result, bool):
+            return None
+
+        return result != []
+
+    async def checkpoint(
+        self, task: IngestionTask, worker_id: str, result: dict, follow_ups: list[IngestionFollowUp]
+    ) -> bool:
+        """
+        Store the partial result of a running task and queue the follow-ups it produced so far.
+
+        Returns:
+            bool: False if the worker lost the task, nothing is stored then.
+
+        """
+        return await self._finish(task, worker_id, follow_ups, result=result)
+
+    async def complete(
+        self, task: IngestionTask, worker_id: str, result: dict, follow_ups: list[IngestionFollowUp]
+    ) -> bool:
+        """
+        Mark a task succeeded and queue its follow-ups, in one transaction.
+
+        Returns:
+            bool: False if the worker lost the task, its result is discarded then.
+
+        """
+        return await self._finish(
+            task, worker_id, follow_ups, result=result, status="succeeded", finished_at=func.now()
+        )
+
+    async def fail(self, task: IngestionTask, worker_id: str, error: str, retry_in: float | None) -> bool:
+        """
+        Record a failed attempt.
+
+        Args:
+            task (IngestionTask): The task.
+            worker_id (str): The worker holding it.
+            error (str): What went wrong.
+            retry_in (float | None): Seconds until the next attempt, None to fail the task for good.
+
+        Returns:
+            bool: False if the worker had lost the task already.
+
+        """
+        if retry_in is None:
+            return await self._finish(task, worker_id, [], error=error, status="failed", finished_at=func.now())
+
+        return await self._finish(
+            task,
+            worker_id,
+            [],
+            error=error,
+            status="pending",
+            worker_id=None,
+            lease_expires_at=None,
+            run_after=func.now() + datetime.timedelta(seconds=retry_in),
+        )
+
+    async def _finish(
+        self, task: IngestionTask, worker_id: str, follow_ups: list[IngestionFollowUp], **values: object
+    ) -> bool:
+        async def work(connection: AsyncConnection) -> bool:
+            # serialises the job's task updates, so exactly one of the last tasks to finish
+            # sees that nothing is left and queues the neighbour refresh
+            await connection.execute(
+                select(IngestionJobScheme.job_id).where(IngestionJobScheme.job_id == task.job_id).with_for_update()
+            )
+
+            updated = await connection.execute(
+                update(IngestionTaskScheme)
+                .where(self._held_by(task, worker_id))
+                .values(**values)
+                .returning(IngestionTaskScheme.task_id)
+            )
+            if updated.first() is None:
+                return False
+
+            if follow_ups:
+                await connection.execute(self._insert(task.job_id, follow_ups))
+
+            await self._sync_job(connection, task.job_id)
+            return True
+
+        return bool(await self.database.run_transaction_async(work))
+
+    async def _sync_job(self, connection: AsyncConnection, job_id: int) -> None:
+        counts = await connection.execute(
+            select(IngestionTaskScheme.kind, IngestionTaskScheme.status, func.count())
+            .where(IngestionTaskScheme.job_id == job_id)
+            .group_by(IngestionTaskScheme.kind, IngestionTaskScheme.status)
+        )
+
+        progress: dict[INGESTION_STAGE_LIST, dict[str, int]] = {}
+        unfinished: set[INGESTION_STAGE_LIST] = set()
+        failed: set[INGESTION_STAGE_LIST] = set()
+        has_neighbors = False
+        for kind, status, count in counts:
+            stage = STAGE_OF_KIND[kind]
+            stage_progress = progress.setdefault(stage, {"done": 0, "total": 0})
+            stage_progress["total"] += count
+            if status == "succeeded":
+                stage_progress["done"] += count
+            elif status == "failed":
+                failed.add(stage)
+            else:
+                unfinished.add(stage)
+            has_neighbors = has_neighbors or kind == "neighbors"
+
+        scrape_result = await connection.scalar(
+            select(IngestionTaskScheme.result).where(
+                IngestionTaskScheme.job_id == job_id, IngestionTaskScheme.kind == "scrape"
+            )
+        )
+        checkpoint = IngestionCheckpoint.model_validate(scrape_result or {})
+        checkpoint.stages_done = [stage for stage in progress if stage not in unfinished]
+
+        stages = get_args(INGESTION_STAGE_LIST)
+        has_failed = bool(failed)
+        values: dict[str, object] = {"updated_at": func.now(), "status": "running"}
+        if unfinished:
+            values["stage"] = next(stage for stage in stages if stage in unfinished)
+        elif has_failed and not has_neighbors:
+            # a patent is missing, the job fails without refreshing the neighbours of the others
+            values["stage"] = next(stage for stage in stages if stage in failed)
+            values["status"] = "failed"
+            values["finished_at"] = func.now()
+        elif not has_neighbors:
+            # every patent is stored, refresh the related patents of the whole job at once
+            patent_ids = [patent.patent_id for patent in checkpoint.patents]
+            await connection.execute(
+                self._insert(
+                    job_id,
+                    [
+                        IngestionFollowUp(
+                            kind="neighbors",
+                            payload=NeighborsTaskPayload(patent_ids=patent_ids).model_dump(),
+                            dedupe_key=f"{job_id}:neighbors",
+                        )
+                    ],
+                )
+            )
+            values["stage"] = "neighbors"
+            progress["neighbors"] = {"done": 0, "total": 1}
+        else:
+            values["stage"] = "neighbors"
+            values["status"] = "failed" if has_failed else "succeeded"
+            values["finished_at"] = func.now()
+
+        if has_failed:
+            values["error"] = await connection.scalar(
+                select(IngestionTaskScheme.error)
+                .where(IngestionTaskScheme.job_id == job_id, IngestionTaskScheme.status == "failed")
+                .order_by(IngestionTaskScheme.finished_at.desc())
+                .limit(1)
+            )
+
+        await connection.execute(
+            update(IngestionJobScheme)
+            .where(IngestionJobScheme.job_id == job_id)
+            .values(progress=progress, checkpoint=checkpoint.model_dump(), **values)
+        )
@@ -0,0 +1,119 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import math
+from os import getenv
+from typing import get_args
+
+from Backend.utility.error.database.database import InvalidVectorIndexTypeError
+from Backend.utility.model.handler.database.database import VECTOR_INDEX_TYPE_LIST, VectorIndexConfig
+
+# embedding tables, all queried with cosine distance
+VECTOR_TABLES = ("patent_content_vector", "patent_image_vector")
+# the largest `hnsw.ef_search` pgvector accepts
+HNSW_MAX_EF_SEARCH = 1000
+
+
+def get_vector_index_config() -> VectorIndexConfig:
+    """
+    Read the ANN index settings from the environment.
+
+    `VECTOR_INDEX_TYPE` (`hnsw`, `ivfflat` or `none`, default `hnsw`), `VECTOR_HNSW_M`,
+    `VECTOR_HNSW_EF_CONSTRUCTION` and `VECTOR_IVFFLAT_LISTS`.
+
+    Raises:
+        InvalidVectorIndexTypeError: If `VECTOR_INDEX_TYPE` holds an unknown index type.
+
+    """
+    index_type = getenv("VECTOR_INDEX_TYPE", "hnsw")
+
+    if index_type not in get_args(VECTOR_INDEX_TYPE_LIST):
+        raise InvalidVectorIndexTypeError(index_type)
+
+    return VectorIndexConfig(
+        index_type=index_type,  # type: ignore[arg-type]
+        m=int(getenv("VECTOR_HNSW_M", "16")),
+        ef_construction=int(getenv("VECTOR_HNSW_EF_CONSTRUCTION", "64")),
+        lists=int(getenv("VECTOR_IVFFLAT_LISTS", "100")),
+    )
+
+
+def vector_index_name(table: str) -> str:
+    return f"{table}_embedding_idx"
+
+
+def create_vector_index_sql(table: str, config: VectorIndexConfig) -> str | None:
+    """
+    Build the `CREATE INDEX` statement of one embedding table.
+
+    Args:
+        table (str): One of `VECTOR_TABLES`.
+        config (VectorIndexConfig): Index type and build parameters.
+
+    Returns:
+        str | None: The DDL, None when `index_type` is `none`.
+
+    """
+    if config.index_type == "hnsw":
+        options = f"m = {int(config.m)}, ef_construction = {int(config.ef_construction)}"
+    elif config.index_type == "ivfflat":
+        options = f"lists = {int(config.lists)}"
+    else:
+        return None
+
+    return (
+        f"CREATE INDEX IF NOT EXISTS {vector_index_name(table)} ON {table} "
+        f"USING {config.index_type} (embedding vector_cosine_ops) WITH ({options})"
+    )
+
+
+def ann_search_settings(ef_search: int | None = None, probes: int | None = None) -> dict[str, str]:
+    """
+    Per-query ANN tuning, applied with `set_config(..., true)` inside the query's transaction.
+
+    Higher values trade latency for recall; settings of the index type not in use are ignored
+    by PostgreSQL.
+
+    Args:
+        ef_search (int | None, optional): `hnsw.ef_search`, candidate list size. Defaults to None.
+        probes (int | None, optional): `ivfflat.probes`, lists scanned. Defaults to None.
+
+    Returns:
+        dict[str, str]: The settings to apply, empty to keep the server defaults.
+
+    """
+    settings: dict[str, str] = {}
+    if ef_search is not None:
+        settings["hnsw.ef_search"] = str(ef_search)
+    if probes is not None:
+        settings["ivfflat.probes"] = str(probes)
+
+    return settings
+
+
+def candidate_search_settings(
+    candidates: int, ef_search: int | None = None, probes: int | None = None
+) -> dict[str, str]:
+    """
+    `ann_search_settings` for a query that needs `candidates` rows out of the index.
+
+    An HNSW scan returns at most `hnsw.ef_search` rows (40 by default) whatever the query's
+    LIMIT, so it is raised to the candidate count, up to pgvector's maximum of 1000. IVFFlat
+    returns every row of the lists it probes, but a single list may hold fewer than
+    `candidates` rows, so at least the square root of the list count is probed.
+
+    Args:
+        candidates (int): The rows the query reads from the index.
+        ef_search (int | None, optional): A caller's `hnsw.ef_search`, kept if larger. Defaults to None.
+        probes (int | None, optional): A caller's `ivfflat.probes`, kept if larger. Defaults to None.
+
+    Returns:
+        dict[str, str]: The settings to apply.
+
+    """
+    lists = get_vector_index_config().lists
+    return ann_search_settings(
+        ef_search=min(HNSW_MAX_EF_SEARCH, max(ef_search or 0, candidates)),
+        probes=max(probes or 1, math.ceil(math.sqrt(lists))),
+    )
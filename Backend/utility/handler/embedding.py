@@ -1,27 +1,215 @@
 # Code by AkinoAlice@TyrantRey
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from os import getenv
+from pathlib import Path
+from typing import get_args
+
+import numpy as np
+import torch
+from filelock import FileLock
 from PIL import Image
-from transformers import CLIPModel, CLIPProcessor
+from transformers import CLIPProcessor, CLIPVisionModelWithProjection
 
+from Backend.utility.error.embedding import ClipBackendUnavailableError, InvalidClipBackendError
+from Backend.utility.handler.cache import DocumentEmbeddingCache
 from Backend.utility.handler.log_handler import Logger
+from Backend.utility.model.handler.embedding import CLIP_BACKEND_LIST
+
+
+class TorchClipBackend:
+    """
+    The CLIP vision tower and projection in transformers; the text tower is never loaded.
+
+    With `quantize`, every Linear layer is dynamically quantised to int8, which covers the
+    bulk of the ViT-L weights and roughly quarters their memory.
+    """
+
+    def __init__(self, model_name: str, quantize: bool = False) -> None:
+        self.model = CLIPVisionModelWithProjection.from_pretrained(model_name)
+        self.model.eval()
+
+        if quantize:
+            self.model = torch.ao.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        self.dimension = self.model.config.projection_dim
+
+    def embed(self, pixel_values: np.ndarray) -> np.ndarray:
+        with torch.inference_mode():
+            features = self.model(pixel_values=torch.from_numpy(pixel_values)).image_embeds
+
+        return features.cpu().numpy()
+
+
+class OnnxClipBackend:
+    """
+    The vision tower exported to ONNX and run by ONNX Runtime, without torch at inference.
+
+    The model is exported to `onnx_path` on first use, later workers only load the file.
+    """
+
+    def __init__(self, model_name: str, onnx_path: Path) -> None:
+        try:
+            import onnxruntime  # noqa: PLC0415
+        except ImportError as e:
+            msg = "onnxruntime is not installed, install the `onnx` extra"
+            raise ClipBackendUnavailableError(msg) from e
+
+        if not onnx_path.exists():
+            self.export(model_name, onnx_path)
+
+        options = onnxruntime.SessionOptions()
+        torch_threads = getenv("CLIP_TORCH_THREADS")
+        if torch_threads is not None:
+            options.intra_op_num_threads = int(torch_threads)
+
+        self.session = onnxruntime.InferenceSession(
+            str(onnx_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.dimension = self.session.get_outputs()[0].shape[-1]
+
+    @staticmethod
+    def export(model_name: str, onnx_path: Path) -> None:
+        """
+        Export the vision tower to `onnx_path`, once however many workers start together.
+
+        Workers wait on a lock file next to the model and the first one exports. It writes a
+        temporary file in the same directory and renames it into place, so no worker ever
+        loads a partly written model.
+        """
+        onnx_path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(f"{onnx_path}.lock"):
+            if onnx_path.exists():
+                return
+
+            model = CLIPVisionModelWithProjection.from_pretrained(model_name)
+            model.eval()
+            model.config.return_dict = False
+
+            temporary_path = onnx_path.with_name(f"{onnx_path.stem}.{os.getpid()}.tmp{onnx_path.suffix}")
+            dummy = torch.zeros(1, 3, model.config.image_size, model.config.image_size)
+            try:
+                with torch.inference_mode():
+                    torch.onnx.export(
+                        model,
+                        (dummy,),
+                        str(temporary_path),
+                        input_names=["pixel_values"],
+                        output_names=["image_embeds"],
+                        dynamic_axes={"pixel_values": {0: "batch"}, "image_embeds": {0: "batch"}},
+                        opset_version=17,
+                    )
+                temporary_path.replace(onnx_path)
+            finally:
+                temporary_path.unlink(missing_ok=True)
+
+    def embed(self, pixel_values: np.ndarray) -> np.ndarray:
+        return self.session.run(["image_embeds"], {"pixel_values": pixel_values})[0]
+
+
+def get_clip_backend() -> CLIP_BACKEND_LIST:
+    """
+    Read the image embedding backend from `CLIP_BACKEND`, defaulting to `torch`.
+
+    Raises:
+        InvalidClipBackendError: If the variable holds an unknown backend.
+
+    """
+    backend = getenv("CLIP_BACKEND", "torch")
+
+    if backend not in get_args(CLIP_BACKEND_LIST):
+        raise InvalidClipBackendError(backend)
+
+    return backend  # type: ignore[return-value]
 
 
 class ImageEmbedding:
-    def __init__(self):
+    def __init__(self, backend: CLIP_BACKEND_LIST | None = None):
         self.logger = Logger().get_logger()
-        self.processor = CLIPProcessor.from_pretrained("openai/clip-vit-large-patch14")
-        self.model = CLIPModel.from_pretrained("openai/clip-vit-large-patch14")
+        self.model_name = "openai/clip-vit-large-patch14"
+        self.backend_name = backend or get_clip_backend()
+        # int8 and ONNX embeddings differ slightly from fp32, keep their cache entries apart
+        self.cache_model_name = (
+            self.model_name if self.backend_name == "torch" else f"{self.model_name}:{self.backend_name}"
+        )
+
+        self.batch_size = int(getenv("CLIP_BATCH_SIZE", "16"))
+        self.decode_workers = int(getenv("CLIP_DECODE_WORKERS", "4"))
+
+        # intra-op threads of the CPU forward pass, torch defaults to every core
+        torch_threads = getenv("CLIP_TORCH_THREADS")
+        if torch_threads is not None:
+            torch.set_num_threads(int(torch_threads))
+
+        self.logger.info("Loading CLIP backend: %s", self.backend_name)
+        self.processor = CLIPProcessor.from_pretrained(self.model_name)
+        if self.backend_name == "onnx":
+            onnx_path = Path(getenv("CLIP_ONNX_PATH", "./cache/clip-vit-large-patch14-vision.onnx"))
+            self.backend: TorchClipBackend | OnnxClipBackend = OnnxClipBackend(self.model_name, onnx_path)
+        else:
+            self.backend = TorchClipBackend(self.model_name, quantize=self.backend_name == "int8")
 
     def process(self, image_path: str) -> list[float]:
         """
-        Process the image and return its embedding using CLIP model.
+        Return the image's CLIP embedding, from the content embedding cache when the same
+        image bytes were embedded before.
         """
-        self.logger.info("Processing image: %s", image_path)
-        _image = Image.open(image_path)
-        inputs = self.processor(images=_image, return_tensors="pt")
-        feature = self.model.get_image_features(**inputs)
+        content = Path(image_path).read_bytes()
+        return DocumentEmbeddingCache.get_or_compute(
+            self.cache_model_name, content, lambda: self._embed(image_path)
+        )
+
+    def _embed(self, image_path: str) -> list[float]:
+        return self._embed_images([self._decode(image_path)])[0].tolist()
+
+    @staticmethod
+    def _decode(image_path: str) -> Image.Image:
+        with Image.open(image_path) as image:
+            return image.convert("RGB")
+
+    def _embed_images(self, images: list[Image.Image]) -> np.ndarray:
+        inputs = self.processor(images=images, return_tensors="np")
+        features = self.backend.embed(inputs["pixel_values"].astype(np.float32))
+
+        return np.ascontiguousarray(features, dtype=np.float32)
+
+    def process_batch(self, image_paths: list[str], batch_size: int | None = None) -> np.ndarray:
+        """
+        Embed many images, a batch per forward pass.
+
+        Cached images are looked up by content; the rest are decoded in a thread pool
+        (PIL releases the GIL while decoding) and run through the configured CLIP backend
+        `batch_size` at a time.
+
+        Args:
+            image_paths (list[str]): The images to embed.
+            batch_size (int | None, optional): Images per forward pass. Defaults to `CLIP_BATCH_SIZE`.
+
+        Returns:
+            np.ndarray: Contiguous float32 array of shape `(len(image_paths), 768)`, rows in input order.
+
+        """
+        if not image_paths:
+            return np.empty((0, self.backend.dimension), dtype=np.float32)
+
+        batch_size = batch_size or self.batch_size
+        contents = [Path(image_path).read_bytes() for image_path in image_paths]
+        cached = [DocumentEmbeddingCache.get(self.cache_model_name, content) for content in contents]
+        missing = [index for index, embedding in enumerate(cached) if embedding is None]
+        self.logger.info("Processing %d images, %d cached", len(image_paths), len(image_paths) - len(missing))
+
+        with ThreadPoolExecutor(max_workers=self.decode_workers) as executor:
+            for start in range(0, len(missing), batch_size):
+                batch = missing[start : start + batch_size]
+                images = list(executor.map(self._decode, [image_paths[index] for index in batch]))
+
+                for index, embedding in zip(batch, self._embed_images(images)):
+                    vector = embedding.tolist()
+                    cached[index] = vector
+                    DocumentEmbeddingCache.put(self.cache_model_name, contents[index], vector)
 
-        return feature.detach().cpu().numpy()[0].tolist()
+        return np.ascontiguousarray(cached, dtype=np.float32)
 
 
 # class TextEmbedding:
@@ -0,0 +1,777 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import re
+from os import getenv
+from pathlib import Path
+from typing import TYPE_CHECKING, get_args
+
+from Backend.utility.error.common import EnvironmentVariableNotSetError
+from Backend.utility.error.job import IngestionJobLostError, IngestionTaskError, InvalidIngestionModeError
+from Backend.utility.handler.database.job import IngestionJobOperation
+from Backend.utility.handler.database.neighbor import NeighborOperation
+from Backend.utility.handler.database.scraper import ScraperOperation
+from Backend.utility.handler.database.search import SearchEngineOperation
+from Backend.utility.handler.database.task import IngestionTaskOperation
+from Backend.utility.handler.lazy import ImageEmbeddingHandler, LLMHandler, PDFExtractorHandler
+from Backend.utility.handler.log_handler import Logger
+from Backend.utility.handler.pdf_pages import iter_pages, page_count, write_pages
+from Backend.utility.handler.pipeline import PipelineStage, run_stages
+from Backend.utility.model.application.job import (
+    INGESTION_MODE_LIST,
+    INGESTION_STAGE_LIST,
+    EmbedTaskPayload,
+    ImagesTaskPayload,
+    IngestionCheckpoint,
+    IngestionFollowUp,
+    IngestionJob,
+    IngestionStageProgress,
+    IngestionTask,
+    NeighborsTaskPayload,
+    OCRTaskPayload,
+    ScrapeTaskPayload,
+)
+from Backend.utility.model.application.search import PDFInfo
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    import numpy as np
+    from PIL.Image import Image
+
+    from Backend.utility.handler.scraper import PatentScraper
+    from Backend.utility.model.handler.pipeline import PipelineStageStats
+    from Backend.utility.model.handler.scraper import PatentImageModel
+
+    # items passed between the `IngestionStream` stages
+    # (patent, page, page count, rendered page)
+    RenderedPage = tuple[PDFInfo, int, int, Image]
+    # (patent, page, page count, text), text is None where OCR failed
+    OCRPage = tuple[PDFInfo, int, int, str | None]
+    # (patent, `(patent_id, page, content)` of its pages)
+    PatentChunks = tuple[PDFInfo, list[tuple[int, int, str]]]
+    EmbeddedChunks = tuple[PDFInfo, list[tuple[int, int, str]], np.ndarray]
+
+PAGE_PATTERN = r"---\s*Page\s*(\d+)\s*---\s*([\s\S]*?)(?=(?:---\s*Page\s*\d+\s*---)|$)"
+
+
+def get_ingestion_mode() -> INGESTION_MODE_LIST:
+    """
+    Read where ingestion jobs run from `INGESTION_MODE`, defaulting to `local`.
+
+    Raises:
+        InvalidIngestionModeError: If the variable holds an unknown mode.
+
+    """
+    mode = getenv("INGESTION_MODE", "local")
+
+    if mode not in get_args(INGESTION_MODE_LIST):
+        raise InvalidIngestionModeError(mode)
+
+    return mode  # type: ignore[return-value]
+
+
+class IngestionJobState:
+    """Progress and checkpoint of the job being run, written through to its row."""
+
+    def __init__(
+        self,
+        job_id: int,
+        attempts: int,
+        keyword: str,
+        checkpoint: IngestionCheckpoint,
+        operation: IngestionJobOperation,
+    ) -> None:
+        self.job_id = job_id
+        self.attempts = attempts
+        self.keyword = keyword
+        self.checkpoint = checkpoint
+        self.stage: INGESTION_STAGE_LIST = "crawl"
+        self.progress: dict[INGESTION_STAGE_LIST, IngestionStageProgress] = {}
+        self.pipeline: list[PipelineStageStats] = []
+        self._operation = operation
+        # concurrent stages save the job, a snapshot must not overwrite a later one
+        self._lock = asyncio.Lock()
+
+    def track(self, stage: INGESTION_STAGE_LIST, done: int, total: int | None = None, failed: int = 0) -> None:
+        self.progress[stage] = IngestionStageProgress(done=done, total=total, failed=failed)
+
+    async def save(self, stage: INGESTION_STAGE_LIST | None = None) -> None:
+        """
+        Store the progress together with the checkpoint.
+
+        Raises:
+            IngestionJobLostError: If another worker claimed the job in the meantime.
+
+        """
+        async with self._lock:
+            if stage is not None:
+                self.stage = stage
+
+            is_success = await self._operation.update(
+                self.job_id,
+                self.attempts,
+                stage=self.stage,
+                progress=self.progress,
+                checkpoint=self.checkpoint,
+                pipeline=self.pipeline,
+            )
+        if not is_success:
+            msg = f"Ingestion job {self.job_id} was claimed by another worker"
+            raise IngestionJobLostError(msg)
+
+    async def report(self, stage: INGESTION_STAGE_LIST, done: int, total: int | None = None) -> None:
+        self.track(stage, done, total)
+        await self.save(stage)
+
+    async def complete(self, stage: INGESTION_STAGE_LIST) -> None:
+        self.checkpoint.stages_done.append(stage)
+        await self.save(stage)
+
+
+class IngestionPipeline:
+    """
+    Scrape a keyword's patents and store them with their embeddings, the work behind
+    `POST /search/scraper/`.
+
+    Crawling, OCR and embedding run as one `IngestionStream`, so the next patent downloads
+    while the previous one is OCR'd; the neighbour refresh follows once every patent is stored.
+    Progress is checkpointed into the job, a resumed job skips the patents already done.
+    """
+
+    def __init__(self) -> None:
+        self.logger = Logger().get_logger()
+        self.search_database = SearchEngineOperation()
+        self.scraper_database = ScraperOperation()
+        self.neighbor_database = NeighborOperation()
+
+        # patents (or their text) held between two stages
+        self.queue_size = int(getenv("INGESTION_QUEUE_SIZE", "2"))
+        # rendered pages waiting for OCR, each is tens of MB at 300 dpi
+        self.page_queue_size = int(getenv("INGESTION_PAGE_QUEUE_SIZE", "4"))
+        self.ocr_concurrency = int(getenv("INGESTION_OCR_CONCURRENCY", "3"))
+        self.embed_concurrency = int(getenv("INGESTION_EMBED_CONCURRENCY", "1"))
+        self.report_interval = float(getenv("INGESTION_REPORT_SECONDS", "2"))
+
+    async def run(self, job: IngestionJobState) -> None:
+        poppler_path = getenv("POPPLER_PATH")
+        if poppler_path is None:
+            msg = "POPPLER_PATH"
+            raise EnvironmentVariableNotSetError(msg)
+
+        if "embedding" not in job.checkpoint.stages_done:
+            await IngestionStream(self, job, poppler_path).run()
+        if "neighbors" not in job.checkpoint.stages_done:
+            await self.refresh_neighbors(job)
+
+    @staticmethod
+    def read_pages(output_path: str) -> list[tuple[int, str]]:
+        with Path.open(Path(output_path), mode="r", encoding="utf-8") as f:
+            return [(int(page), content) for page, content in re.findall(pattern=PAGE_PATTERN, string=f.read())]
+
+    async def fetch_patent(self, scraper: PatentScraper, url: str) -> tuple[PDFInfo, list[PatentImageModel]]:
+        """
+        Scrape a patent page with its downloads and store the patent.
+
+        The patent is inserted last, so a page that fails midway leaves no row behind.
+
+        Returns:
+            tuple[PDFInfo, list[PatentImageModel]]: The stored patent and its images.
+
+        Raises:
+            IngestionTaskError: If the patent could not be stored.
+
+        """
+        patent_data = await asyncio.to_thread(scraper.get_patent_information, url)
+        self.logger.info(patent_data)
+        image_path_list = await asyncio.to_thread(scraper.get_patent_image, url)
+        self.logger.info(image_path_list)
+
+        patent_id = await asyncio.to_thread(self.scraper_database.insert_patent, patent_data)
+        if patent_id is None:
+            msg = f"Storing the patent of {url} failed"
+            raise IngestionTaskError(msg)
+
+        patent = PDFInfo(
+            patent_id=patent_id, patent_file_path=patent_data.PatentFilePath, patent_title=patent_data.Title
+        )
+        return patent, image_path_list.image_list
+
+    async def store_images(self, patent_id: int, images: list[PatentImageModel]) -> int:
+        """
+        Embed a patent's images with CLIP and replace its image vectors.
+
+        Returns:
+            int: The number of vectors stored, 0 if the insert was rolled back.
+
+        """
+        embedding_model = await asyncio.to_thread(ImageEmbeddingHandler.get)
+        image_embeddings = await asyncio.to_thread(
+            embedding_model.process_batch, [image.image_path for image in images]
+        )
+
+        # the patent is new, any vectors it has are from an interrupted attempt; they are
+        # replaced in the COPY's transaction, a failed insert keeps them
+        result = await self.search_database.bulk_insert_vectors(
+            [
+                (patent_id, image.page, image.image_path, embedding.tolist())
+                for image, embedding in zip(images, image_embeddings)
+            ],
+            is_image=True,
+            replace=True,
+        )
+        return result.rows
+
+    async def store_text(self, pdf_chunks: list[tuple[int, int, str]]) -> int:
+        """
+        Embed OCR pages and replace the text vectors of their patents.
+
+        Args:
+            pdf_chunks (list[tuple[int, int, str]]): `(patent_id, page, content)` of every page.
+
+        Returns:
+            int: The number of vectors stored, 0 if the insert was rolled back.
+
+        """
+        embeddings = await self.embed_text(pdf_chunks)
+        return await self.insert_text(pdf_chunks, embeddings)
+
+    @staticmethod
+    async def embed_text(pdf_chunks: list[tuple[int, int, str]]) -> np.ndarray:
+        llm_client = LLMHandler.get()
+        # batched requests instead of one embedding call per page
+        return await asyncio.to_thread(llm_client.embed_documents, [chunk[2] for chunk in pdf_chunks])
+
+    async def insert_text(self, pdf_chunks: list[tuple[int, int, str]], embeddings: np.ndarray) -> int:
+        # the patents are new, any text vectors they have are from an interrupted attempt and
+        # are replaced in the COPY's transaction
+        result = await self.search_database.bulk_insert_vectors(
+            [
+                (patent_id, page, content, embedding.tolist())
+                for (patent_id, page, content), embedding in zip(pdf_chunks, embeddings)
+            ],
+            replace=True,
+        )
+        return result.rows
+
+    async def refresh_neighbors(self, job: IngestionJobState) -> None:
+        patent_ids = [patent.patent_id for patent in job.checkpoint.patents]
+        await job.report("neighbors", 0, len(patent_ids))
+
+        refreshed = await self.neighbor_database.refresh_affected(patent_ids)
+
+        await job.report("neighbors", refreshed, refreshed)
+        await job.complete("neighbors")
+
+
+class IngestionStream:
+    """
+    One run of a local job through concurrent stages linked by bounded queues:
+
+        fetch ─┬─> images
+               └─> render ─> ocr ─> chunk ─> embed ─> insert
+
+    `fetch` stores a patent page and its downloads, `images` embeds the drawings with CLIP,
+    `render` rasterises the PDF page by page, `ocr` reads the pages
+    (`INGESTION_OCR_CONCURRENCY` at once), `chunk` assembles a patent's pages into its text
+    file, `embed` embeds them and `insert` replaces the patent's text vectors. A full queue
+    holds its upstream back, so the crawl runs at most `INGESTION_QUEUE_SIZE` patents ahead
+    of OCR and at most `INGESTION_PAGE_QUEUE_SIZE` rendered pages wait for it.
+
+    The checkpoint is stored after every fetched patent and, with the throughput and queue
+    occupancy of every stage, every `INGESTION_REPORT_SECONDS`.
+    """
+
+    def __init__(self, pipeline: IngestionPipeline, job: IngestionJobState, poppler_path: str) -> None:
+        self.logger = pipeline.logger
+        self.pipeline = pipeline
+        self.job = job
+        self.checkpoint = job.checkpoint
+        self.poppler_path = poppler_path
+        # created by the feeder, one driver per job, jobs may run side by side
+        self.scraper: PatentScraper
+        self.url_total = len(self.checkpoint.urls_done)
+        # OCR'd pages of each patent until the last one arrives, None where OCR failed
+        self.pages: dict[int, dict[int, str | None]] = {}
+        self._stopped = asyncio.Event()
+
+        queue_size = pipeline.queue_size
+        page_queue_size = pipeline.page_queue_size
+        # a lost job must stop, any other error only skips the item
+        fatal = (IngestionJobLostError,)
+        self.fetch: PipelineStage[str] = PipelineStage("fetch", self._fetch, queue_size, fatal=fatal)
+        self.images: PipelineStage[int] = PipelineStage("images", self._images, queue_size, fatal=fatal)
+        self.render: PipelineStage[PDFInfo] = PipelineStage("render", self._render, queue_size, fatal=fatal)
+        self.ocr: PipelineStage[RenderedPage] = PipelineStage(
+            "ocr", self._ocr, page_queue_size, pipeline.ocr_concurrency, fatal=fatal
+        )
+        self.chunk: PipelineStage[OCRPage] = PipelineStage("chunk", self._chunk, page_queue_size, fatal=fatal)
+        self.embed: PipelineStage[PatentChunks] = PipelineStage(
+            "embed", self._embed, queue_size, pipeline.embed_concurrency, fatal=fatal
+        )
+        self.insert: PipelineStage[EmbeddedChunks] = PipelineStage("insert", self._insert, queue_size, fatal=fatal)
+
+        self.fetch.feeds(self.images, self.render)
+        self.render.feeds(self.ocr)
+        self.ocr.feeds(self.chunk)
+        self.chunk.feeds(self.embed)
+        self.embed.feeds(self.insert)
+        self.stages: list[PipelineStage] = [
+            self.fetch,
+            self.images,
+            self.render,
+            self.ocr,
+            self.chunk,
+            self.embed,
+            self.insert,
+        ]
+
+    async def run(self) -> None:
+        await run_stages(self._feed(), self._run_stages(), self._report())
+
+        self.checkpoint.stages_done.extend(["ocr", "embedding"])
+        await self._save()
+        self.logger.info(
+            "Ingestion job %d stages: %s",
+            self.job.job_id,
+            ", ".join(f"{stage.name} {stage.processed} at {stage.throughput:.2f}/s" for stage in self.job.pipeline),
+        )
+
+    async def _run_stages(self) -> None:
+        try:
+            await asyncio.gather(*(stage.run() for stage in self.stages))
+        finally:
+            self._stopped.set()
+
+    async def _report(self) -> None:
+        while not self._stopped.is_set():
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._stopped.wait(), self.pipeline.report_interval)
+            await self._save()
+
+    async def _save(self) -> None:
+        checkpoint = self.checkpoint
+        self.job.track("ocr", len(checkpoint.ocr_outputs), len(checkpoint.patents))
+        self.job.track(
+            "embedding", len(checkpoint.texts_done), len(checkpoint.patents), len(checkpoint.texts_failed)
+        )
+        self.job.pipeline = [stage.stats() for stage in self.stages]
+
+        # the earliest stage that still has work
+        stage: INGESTION_STAGE_LIST = "embedding"
+        if not self.fetch.finished.is_set():
+            stage = "crawl"
+        elif not self.chunk.finished.is_set():
+            stage = "ocr"
+        await self.job.save(stage)
+
+    async def _feed(self) -> None:
+        checkpoint = self.checkpoint
+
+        # patents a previous attempt stored but did not finish
+        for patent_id in list(checkpoint.images_pending):
+            await self.images.put(patent_id)
+        for patent in checkpoint.patents:
+            if patent.patent_id in checkpoint.texts_done:
+                continue
+
+            output_path = checkpoint.ocr_outputs.get(patent.patent_file_path)
+            if output_path is None:
+                await self.render.put(patent)
+            else:
+                await self.embed.put((patent, self._read_chunks(patent, output_path)))
+
+        if "crawl" in checkpoint.stages_done:
+            await self.fetch.close()
+            return
+
+        # selenium is only imported by the jobs
+        from Backend.utility.handler.scraper import PatentScraper  # noqa: PLC0415
+
+        self.scraper = PatentScraper()
+        await asyncio.to_thread(self.scraper.create_scraper)
+        try:
+            self.scraper.keyword = self.job.keyword
+            url_list = await asyncio.to_thread(self.scraper.get_patent_url, 1)
+            self.url_total = len(url_list)
+            self.job.track("crawl", len(checkpoint.urls_done), self.url_total, len(checkpoint.urls_failed))
+
+            for url in url_list:
+                if url not in checkpoint.urls_done:
+                    await self.fetch.put(url)
+            await self.fetch.close()
+            await self.fetch.finished.wait()
+        finally:
+            # the browser is not needed for the rest of the job
+            await asyncio.to_thread(self.scraper.destroy_scraper)
+
+        await self.job.complete("crawl")
+
+    async def _fetch(self, url: str) -> None:
+        checkpoint = self.checkpoint
+
+        patent = None
+        try:
+            patent, images = await self.pipeline.fetch_patent(self.scraper, url)
+        except Exception as e:
+            # like an unreadable PDF page, one broken patent page does not fail the job
+            self.logger.exception("Fetching %s failed", url)
+            checkpoint.urls_failed[url] = repr(e)
+        else:
+            checkpoint.patents.append(patent)
+            checkpoint.images_pending[patent.patent_id] = images
+
+        checkpoint.urls_done.append(url)
+        self.job.track("crawl", len(checkpoint.urls_done), self.url_total, len(checkpoint.urls_failed))
+        # stored before moving on, a patent inserted again after a restart would be a duplicate
+        await self.job.save("crawl")
+
+        if patent is not None:
+            await self.images.put(patent.patent_id)
+            await self.render.put(patent)
+
+    async def _images(self, patent_id: int) -> None:
+        images = self.checkpoint.images_pending[patent_id]
+        try:
+            rows = await self.pipeline.store_images(patent_id, images)
+        except Exception as e:
+            self.logger.exception("Storing the image vectors of patent %d failed", patent_id)
+            self.checkpoint.images_failed[patent_id] = repr(e)
+        else:
+            if images and rows == 0:
+                self.logger.error("Storing the image vectors of patent %d failed", patent_id)
+                self.checkpoint.images_failed[patent_id] = "The image vectors were rolled back"
+
+        del self.checkpoint.images_pending[patent_id]
+
+    async def _render(self, patent: PDFInfo) -> None:
+        # pages are rendered a window at a time as OCR takes them, not the whole PDF up front
+        page = 0
+        pages = 0
+        try:
+            pages = await asyncio.to_thread(page_count, patent.patent_file_path, self.poppler_path)
+            images = iter_pages(patent.patent_file_path, self.poppler_path)
+            while (image := await asyncio.to_thread(next, images, None)) is not None:
+                page += 1
+                await self.ocr.put((patent, page, pages, image))
+        except Exception as e:
+            msg = f"Error processing {patent.patent_file_path}: {e!r}"
+            self.logger.exception(msg)
+
+        if pages == 0:
+            self._skip_text(patent)
+            return
+
+        # pages that were never rendered count as failed, the patent is completed by `chunk`
+        for missing_page in range(page + 1, pages + 1):
+            await self.chunk.put((patent, missing_page, pages, None))
+
+    async def _ocr(self, rendered_page: RenderedPage) -> None:
+        patent, page, page_count, image = rendered_page
+        pdf_extractor = await asyncio.to_thread(PDFExtractorHandler.get)
+
+        text = None
+        try:
+            text = await asyncio.to_thread(pdf_extractor.ocr_image, image)
+        except Exception as e:
+            msg = f"Error processing {patent.patent_file_path} page {page}: {e!r}"
+            self.logger.exception(msg)
+
+        await self.chunk.put((patent, page, page_count, text))
+
+    async def _chunk(self, ocr_page: OCRPage) -> None:
+        patent, page, page_count, text = ocr_page
+        pages = self.pages.setdefault(patent.patent_id, {})
+        pages[page] = text
+        if len(pages) < page_count:
+            return
+
+        del self.pages[patent.patent_id]
+        page_texts = [(page, text) for page, text in sorted(pages.items()) if text is not None]
+        if len(page_texts) < page_count:
+            # like a failed `process_single_pdf`, a patent with an unreadable page gets no text
+            self._skip_text(patent)
+            return
+
+        output_path = await asyncio.to_thread(write_pages, patent.patent_file_path, page_texts)
+        self.checkpoint.ocr_outputs[patent.patent_file_path] = output_path
+        self.logger.info("Successfully processed %s -> %s", patent.patent_file_path, output_path)
+
+        await self.embed.put((patent, self._read_chunks(patent, output_path)))
+
+    async def _embed(self, patent_chunks: PatentChunks) -> None:
+        patent, pdf_chunks = patent_chunks
+        if not pdf_chunks:
+            self.checkpoint.texts_done.append(patent.patent_id)
+            return
+
+        try:
+            embeddings = await self.pipeline.embed_text(pdf_chunks)
+        except Exception as e:
+            self.logger.exception("Embedding the text of patent %d failed", patent.patent_id)
+            self.checkpoint.texts_failed[patent.patent_id] = repr(e)
+            self.checkpoint.texts_done.append(patent.patent_id)
+            return
+
+        await self.insert.put((patent, pdf_chunks, embeddings))
+
+    async def _insert(self, embedded_chunks: EmbeddedChunks) -> None:
+        patent, pdf_chunks, embeddings = embedded_chunks
+        rows = await self.pipeline.insert_text(pdf_chunks, embeddings)
+        if rows == 0:
+            self.logger.error("Storing the text vectors of patent %d failed", patent.patent_id)
+            self.checkpoint.texts_failed[patent.patent_id] = "The text vectors were rolled back"
+
+        self.checkpoint.texts_done.append(patent.patent_id)
+
+    def _read_chunks(self, patent: PDFInfo, output_path: str) -> list[tuple[int, int, str]]:
+        # read back from the file, a resumed job embeds exactly what a fresh one does
+        return [(patent.patent_id, page, content) for page, content in self.pipeline.read_pages(output_path)]
+
+    def _skip_text(self, patent: PDFInfo) -> None:
+        self.checkpoint.ocr_outputs[patent.patent_file_path] = None
+        self.checkpoint.texts_done.append(patent.patent_id)
+
+
+class IngestionTaskExecutor:
+    """
+    Runs one claimed `ingestion_task`, the queue counterpart of the `IngestionPipeline` stages.
+
+    A scrape task queues an `images` and an `ocr` task per stored patent, each OCR task queues
+    the `embed` task of its pages. Downloaded PDFs and images are read by whichever worker
+    claims the follow-up, so with several hosts the download directories must be shared.
+    """
+
+    def __init__(self, pipeline: IngestionPipeline) -> None:
+        self.logger = Logger().get_logger()
+        self.pipeline = pipeline
+
+    async def run(
+        self, task: IngestionTask, checkpoint: Callable[[dict, list[IngestionFollowUp]], Awaitable[None]]
+    ) -> tuple[dict, list[IngestionFollowUp]]:
+        """
+        Run a task.
+
+        Args:
+            task (IngestionTask): The claimed task.
+            checkpoint (Callable[[dict, list[IngestionFollowUp]], Awaitable[None]]): Stores the
+                partial result and follow-ups of a long task, raises if the task was lost.
+
+        Returns:
+            tuple[dict, list[IngestionFollowUp]]: The result and the tasks to queue next.
+
+        Raises:
+            IngestionTaskError: If the task's output could not be stored.
+
+        """
+        if task.kind == "scrape":
+            return await self.scrape(task, checkpoint)
+        if task.kind == "images":
+            return await self.images(task)
+        if task.kind == "ocr":
+            return await self.ocr(task)
+        if task.kind == "embed":
+            return await self.embed(task)
+        return await self.neighbors(task)
+
+    async def scrape(
+        self, task: IngestionTask, checkpoint: Callable[[dict, list[IngestionFollowUp]], Awaitable[None]]
+    ) -> tuple[dict, list[IngestionFollowUp]]:
+        from Backend.utility.handler.scraper import PatentScraper  # noqa: PLC0415
+
+        payload = ScrapeTaskPayload.model_validate(task.payload)
+        # a retried scrape skips the patents the previous attempt stored
+        progress = IngestionCheckpoint.model_validate(task.result)
+        scraper = PatentScraper()
+
+        await asyncio.to_thread(scraper.create_scraper)
+        try:
+            scraper.keyword = payload.keyword
+            url_list = await asyncio.to_thread(scraper.get_patent_url, 1)
+
+            for url in url_list:
+                if url in progress.urls_done:
+                    continue
+
+                follow_ups: list[IngestionFollowUp] = []
+                try:
+                    patent, image_list = await self.pipeline.fetch_patent(scraper, url)
+                except Exception as e:
+                    # recorded and skipped, a retry of the whole task would not fix one broken page
+                    self.logger.exception("Fetching %s failed", url)
+                    progress.urls_failed[url] = repr(e)
+                else:
+                    patent_id = patent.patent_id
+                    progress.patents.append(patent)
+                    images = ImagesTaskPayload(patent_id=patent_id, images=image_list)
+                    ocr = OCRTaskPayload(patent_id=patent_id, pdf_path=patent.patent_file_path)
+                    follow_ups = [
+                        IngestionFollowUp(
+                            kind="images", payload=images.model_dump(), dedupe_key=f"{task.job_id}:images:{patent_id}"
+                        ),
+                        IngestionFollowUp(
+                            kind="ocr", payload=ocr.model_dump(), dedupe_key=f"{task.job_id}:ocr:{patent_id}"
+                        ),
+                    ]
+
+                progress.urls_done.append(url)
+                await checkpoint(progress.model_dump(), follow_ups)
+        finally:
+            await asyncio.to_thread(scraper.destroy_scraper)
+
+        return progress.model_dump(), []
+
+    async def images(self, task: IngestionTask) -> tuple[dict, list[IngestionFollowUp]]:
+        payload = ImagesTaskPayload.model_validate(task.payload)
+        rows = await self.pipeline.store_images(payload.patent_id, payload.images)
+
+        if payload.images and rows == 0:
+            msg = f"Storing the image vectors of patent {payload.patent_id} failed"
+            raise IngestionTaskError(msg)
+        return {"rows": rows}, []
+
+    async def ocr(self, task: IngestionTask) -> tuple[dict, list[IngestionFollowUp]]:
+        poppler_path = getenv("POPPLER_PATH")
+        if poppler_path is None:
+            msg = "POPPLER_PATH"
+            raise EnvironmentVariableNotSetError(msg)
+
+        payload = OCRTaskPayload.model_validate(task.payload)
+        pdf_extractor = await asyncio.to_thread(PDFExtractorHandler.get)
+        output_path = await asyncio.to_thread(pdf_extractor.process_single_pdf, payload.pdf_path, poppler_path)
+        pages = self.pipeline.read_pages(output_path)
+
+        follow_up = IngestionFollowUp(
+            kind="embed",
+            payload=EmbedTaskPayload(patent_id=payload.patent_id, pages=pages).model_dump(),
+            dedupe_key=f"{task.job_id}:embed:{payload.patent_id}",
+        )
+        return {"output_path": output_path, "pages": len(pages)}, [follow_up]
+
+    async def embed(self, task: IngestionTask) -> tuple[dict, list[IngestionFollowUp]]:
+        payload = EmbedTaskPayload.model_validate(task.payload)
+        rows = await self.pipeline.store_text([(payload.patent_id, page, content) for page, content in payload.pages])
+
+        if payload.pages and rows == 0:
+            msg = f"Storing the text vectors of patent {payload.patent_id} failed"
+            raise IngestionTaskError(msg)
+        return {"rows": rows}, []
+
+    async def neighbors(self, task: IngestionTask) -> tuple[dict, list[IngestionFollowUp]]:
+        payload = NeighborsTaskPayload.model_validate(task.payload)
+        refreshed = await self.pipeline.neighbor_database.refresh_affected(payload.patent_ids)
+
+        return {"refreshed": refreshed}, []
+
+
+class IngestionJobRunner:
+    """
+    Runs ingestion jobs as tasks of the API's event loop.
+
+    At most `INGESTION_JOB_CONCURRENCY` jobs run at once, the rest wait as `queued`. Jobs are
+    rows of `ingestion_job`: on startup `resume()` picks up queued jobs and running jobs that
+    stopped reporting for `INGESTION_JOB_STALE_SECONDS`, and continues them from their
+    checkpoint.
+
+    With `INGESTION_MODE=queue` the API only queues a job's scrape task, `Backend.worker`
+    processes run it and everything it leads to.
+    """
+
+    def __init__(self) -> None:
+        self.logger = Logger().get_logger()
+        self.mode = get_ingestion_mode()
+        self.jobs = IngestionJobOperation()
+        self.tasks = IngestionTaskOperation()
+        self.pipeline = IngestionPipeline()
+        self.concurrency = int(getenv("INGESTION_JOB_CONCURRENCY", "1"))
+        self.stale_after = float(getenv("INGESTION_JOB_STALE_SECONDS", "900"))
+
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, user_id: int, keyword: str) -> IngestionJob | None:
+        """
+        Store a new job and start it as soon as a slot is free.
+
+        Returns:
+            IngestionJob | None: The queued job, None if it could not be stored.
+
+        """
+        job = await self.jobs.create(user_id=user_id, keyword=keyword)
+        if job is None:
+            return None
+
+        if self.mode == "local":
+            self._start(job.job_id, job.attempts)
+            return job
+
+        scrape = IngestionFollowUp(
+            kind="scrape",
+            payload=ScrapeTaskPayload(keyword=keyword).model_dump(),
+            dedupe_key=f"{job.job_id}:scrape",
+        )
+        if not await self.tasks.enqueue(job.job_id, [scrape]):
+            await self.jobs.finish(job.job_id, job.attempts, "failed", error="Failed to queue the scrape task")
+            return None
+
+        return job
+
+    async def resume(self) -> int:
+        if self.mode == "queue":
+            # the workers pick up queued tasks and expired leases themselves
+            return 0
+
+        jobs = await self.jobs.resumable(self.stale_after)
+        for job_id, attempts in jobs:
+            self._start(job_id, attempts)
+
+        if jobs:
+            self.logger.info("Resuming %d ingestion jobs", len(jobs))
+        return len(jobs)
+
+    async def close(self) -> None:
+        # cancelled jobs go back to `queued` and continue on the next start
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _start(self, job_id: int, attempts: int) -> None:
+        task = asyncio.create_task(self._run(job_id, attempts))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job_id: int, attempts: int) -> None:
+        async with self._semaphore:
+            claimed_attempts = await self.jobs.claim(job_id, attempts)
+            if claimed_attempts is None:
+                self.logger.info("Ingestion job %d was claimed by another worker", job_id)
+                return
+
+            job = await self.jobs.fetch(job_id)
+            if job is None:
+                return
+
+            state = IngestionJobState(
+                job_id, claimed_attempts, job.keyword, await self.jobs.fetch_checkpoint(job_id), self.jobs
+            )
+            state.progress = job.progress
+            self.logger.info("Running ingestion job %d, attempt %d", job_id, claimed_attempts)
+
+            try:
+                await self.pipeline.run(state)
+            except IngestionJobLostError:
+                self.logger.warning("Ingestion job %d lost to another worker", job_id)
+            except asyncio.CancelledError:
+                await self.jobs.finish(job_id, claimed_attempts, "queued")
+                raise
+            except Exception as e:
+                self.logger.exception("Ingestion job %d failed", job_id)
+                await self.jobs.finish(job_id, claimed_attempts, "failed", error=repr(e))
+            else:
+                await self.jobs.finish(job_id, claimed_attempts, "succeeded")
+
+
+IngestionJobs = IngestionJobRunner()
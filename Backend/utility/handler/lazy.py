@@ -0,0 +1,98 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import time
+from threading import Lock
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from Backend.utility.handler.log_handler import Logger
+from Backend.utility.handler.model_server import ImageEmbeddingClient, PDFExtractorClient, get_model_server_address
+from Backend.utility.model.handler.lazy import LAZY_HANDLER_LIST, LazyHandlerStatus
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from Backend.utility.handler.embedding import ImageEmbedding
+    from Backend.utility.handler.llm.llm import LLMResponser
+    from Backend.utility.handler.pdf_extractor import PDFExtractor
+
+T = TypeVar("T")
+
+
+class LazyHandler(Generic[T]):
+    """
+    A handler built on first use instead of at import.
+
+    `get()` is safe to call from the event loop's worker threads at once: the first caller
+    builds the handler under a lock, the others wait for it and share the same instance.
+    A failed build is not remembered, the next call tries again.
+    """
+
+    def __init__(self, name: LAZY_HANDLER_LIST, factory: Callable[[], T]) -> None:
+        self.logger = Logger().get_logger()
+        self.name = name
+        self._factory = factory
+        self._lock = Lock()
+        self._instance: T | None = None
+        self._load_seconds: float | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> T:
+        instance = self._instance
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if self._instance is None:
+                self.logger.info("Loading handler: %s", self.name)
+                start = time.perf_counter()
+                self._instance = self._factory()
+                self._load_seconds = time.perf_counter() - start
+                self.logger.info("Loaded handler %s in %.1fs", self.name, self._load_seconds)
+
+            return self._instance
+
+    def status(self) -> LazyHandlerStatus:
+        return LazyHandlerStatus(name=self.name, loaded=self.loaded, load_seconds=self._load_seconds)
+
+
+# the modules themselves import torch, EasyOCR and openai, so they are imported
+# by the factories as well, not only instantiated there; with MODEL_SERVER_ADDRESS set the
+# models live in the shared model server and only its clients are built
+
+
+def _pdf_extractor() -> PDFExtractor | PDFExtractorClient:
+    if get_model_server_address() is not None:
+        return PDFExtractorClient()
+
+    from Backend.utility.handler.pdf_extractor import PDFExtractor  # noqa: PLC0415
+
+    return PDFExtractor()
+
+
+def _image_embedding() -> ImageEmbedding | ImageEmbeddingClient:
+    if get_model_server_address() is not None:
+        return ImageEmbeddingClient()
+
+    from Backend.utility.handler.embedding import ImageEmbedding  # noqa: PLC0415
+
+    return ImageEmbedding()
+
+
+def _llm() -> LLMResponser:
+    from Backend.utility.handler.llm.llm import LLMResponser  # noqa: PLC0415
+
+    return LLMResponser()
+
+
+PDFExtractorHandler = LazyHandler("pdf_extractor", _pdf_extractor)
+ImageEmbeddingHandler = LazyHandler("image_embedding", _image_embedding)
+LLMHandler = LazyHandler("llm", _llm)
+
+LazyHandlers: dict[LAZY_HANDLER_LIST, LazyHandler] = {
+    handler.name: handler for handler in (PDFExtractorHandler, ImageEmbeddingHandler, LLMHandler)
+}
@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
 from os import getenv
 from typing import get_args
 
-from openai import OpenAI
+import numpy as np
+from openai import APIConnectionError, APIStatusError, OpenAI, OpenAIError, RateLimitError
 
 from Backend.utility.error.common import EnvironmentVariableNotSetError
 from Backend.utility.error.llm.llm import InvalidOpenAIChatModelError
+from Backend.utility.handler.cache import DocumentEmbeddingCache, QueryEmbeddingCache
 from Backend.utility.handler.log_handler import Logger
+from Backend.utility.model.handler.database.scheme import TEXT_EMBEDDING_DIMENSION
 from Backend.utility.model.handler.llm import OPENAI_CHAT_MODEL_LIST
 
 from .prompt import SEARCH_PROMPT, SUMMARY_PROMPT
@@ -41,6 +47,12 @@ class LLMResponser:
 
         self.client.api_key = self._openai_api_key
 
+        # provider limits per embeddings request, see `embed_texts`
+        self.embedding_batch_max_items = int(getenv("EMBEDDING_BATCH_MAX_ITEMS", "2048"))
+        self.embedding_batch_max_tokens = int(getenv("EMBEDDING_BATCH_MAX_TOKENS", "300000"))
+        self.embedding_batch_concurrency = int(getenv("EMBEDDING_BATCH_CONCURRENCY", "4"))
+        self.embedding_batch_retries = int(getenv("EMBEDDING_BATCH_RETRIES", "3"))
+
     def search_response(
         self,
         query: str,
@@ -152,6 +164,169 @@ class LLMResponser:
         )
         return response.data[0].embedding
 
+    def embed_query(self, text: str) -> list[float]:
+        """
+        Encode a search query, served from the query embedding cache when possible.
+
+        Use `embed_text` for document chunks: they are embedded once, so caching them would
+        only evict the queries.
+
+        Args:
+            text (str): The search query.
+
+        Returns:
+            list[float]: The vector embedding of the query.
+
+        """
+        if self._openai_embedding_model is None:
+            msg = "OPENAI_EMBEDDING_MODEL"
+            raise EnvironmentVariableNotSetError(msg)
+
+        embedding = QueryEmbeddingCache.get(text, self._openai_embedding_model)
+        if embedding is None:
+            embedding = self.embed_text(text)
+            QueryEmbeddingCache.put(text, self._openai_embedding_model, embedding)
+
+        return embedding
+
+    def embed_document(self, text: str) -> list[float]:
+        """
+        Encode a document chunk, served from the content embedding cache when the exact same
+        text was embedded before (re-ingestion, boilerplate pages).
+
+        Args:
+            text (str): The chunk text.
+
+        Returns:
+            list[float]: The vector embedding of the chunk.
+
+        """
+        if self._openai_embedding_model is None:
+            msg = "OPENAI_EMBEDDING_MODEL"
+            raise EnvironmentVariableNotSetError(msg)
+
+        return DocumentEmbeddingCache.get_or_compute(
+            self._openai_embedding_model, text.encode(), lambda: self.embed_text(text)
+        )
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        # upper bound without a tokenizer: about one token per 2 UTF-8 bytes covers both
+        # English (~4 bytes per token) and CJK (3 bytes per character, ~1.5 tokens)
+        return max(1, math.ceil(len(text.encode()) / 2))
+
+    def _pack_batches(self, texts: list[str]) -> list[list[int]]:
+        batches: list[list[int]] = []
+        batch: list[int] = []
+        batch_tokens = 0
+
+        for index, text in enumerate(texts):
+            tokens = self.estimate_tokens(text)
+            if batch and (
+                len(batch) >= self.embedding_batch_max_items or batch_tokens + tokens > self.embedding_batch_max_tokens
+            ):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+
+            batch.append(index)
+            batch_tokens += tokens
+
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    @staticmethod
+    def _is_transient(error: OpenAIError) -> bool:
+        # rate limits, timeouts (an `APIConnectionError`), lost connections and server errors
+        # may pass on a retry; a bad request, key or model fails the same way every time
+        if isinstance(error, (RateLimitError, APIConnectionError)):
+            return True
+        return isinstance(error, APIStatusError) and error.status_code >= 500  # noqa: PLR2004
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        for attempt in range(self.embedding_batch_retries + 1):
+            try:
+                response = self.client.embeddings.create(
+                    model=self._openai_embedding_model,  # type: ignore[arg-type]
+                    input=texts,
+                )
+            except OpenAIError as e:
+                if attempt == self.embedding_batch_retries or not self._is_transient(e):
+                    raise
+                delay = 2**attempt
+                self.logger.warning("Embedding batch of %d failed (%s), retrying in %ds", len(texts), e, delay)
+                time.sleep(delay)
+            else:
+                # `data` carries the input position, do not rely on the response order
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+        return []
+
+    def embed_texts(self, texts: list[str]) -> np.ndarray:
+        """
+        Encode many texts with as few embedding requests as the provider limits allow.
+
+        Inputs are packed into batches of at most `EMBEDDING_BATCH_MAX_ITEMS` texts and about
+        `EMBEDDING_BATCH_MAX_TOKENS` tokens, up to `EMBEDDING_BATCH_CONCURRENCY` batches are
+        sent at once, and a batch that hit a rate limit, timeout, connection or server error is
+        retried with exponential backoff.
+
+        Args:
+            texts (list[str]): The texts to encode.
+
+        Returns:
+            np.ndarray: float32 array of shape `(len(texts), dimension)`, rows in input order.
+
+        Raises:
+            OpenAIError: If a batch is rejected, or still fails after `EMBEDDING_BATCH_RETRIES` retries.
+
+        """
+        if self._openai_embedding_model is None:
+            msg = "OPENAI_EMBEDDING_MODEL"
+            raise EnvironmentVariableNotSetError(msg)
+
+        if not texts:
+            return np.empty((0, TEXT_EMBEDDING_DIMENSION), dtype=np.float32)
+
+        batches = self._pack_batches(texts)
+        self.logger.info("Embedding %d texts in %d batches", len(texts), len(batches))
+
+        with ThreadPoolExecutor(max_workers=self.embedding_batch_concurrency) as executor:
+            results = executor.map(lambda batch: self._embed_batch([texts[i] for i in batch]), batches)
+            rows = [embedding for batch_embeddings in results for embedding in batch_embeddings]
+
+        return np.asarray(rows, dtype=np.float32)
+
+    def embed_documents(self, texts: list[str]) -> np.ndarray:
+        """
+        Batched `embed_document`: cached chunks are looked up, only the misses are sent.
+
+        Args:
+            texts (list[str]): The chunk texts.
+
+        Returns:
+            np.ndarray: float32 array of shape `(len(texts), dimension)`, rows in input order.
+
+        """
+        if self._openai_embedding_model is None:
+            msg = "OPENAI_EMBEDDING_MODEL"
+            raise EnvironmentVariableNotSetError(msg)
+
+        if not texts:
+            return np.empty((0, TEXT_EMBEDDING_DIMENSION), dtype=np.float32)
+
+        model = self._openai_embedding_model
+        cached = [DocumentEmbeddingCache.get(model, text.encode()) for text in texts]
+        missing = [index for index, embedding in enumerate(cached) if embedding is None]
+
+        computed = self.embed_texts([texts[index] for index in missing])
+        for index, embedding in zip(missing, computed):
+            cached[index] = embedding.tolist()
+            DocumentEmbeddingCache.put(model, texts[index].encode(), cached[index])  # type: ignore[arg-type]
+
+        return np.asarray(cached, dtype=np.float32)
+
 
 if __name__ == "__main__":
     ...
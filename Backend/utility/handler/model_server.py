@@ -0,0 +1,348 @@
+# Code by AkinoAlice@TyrantRey
+
+# One process holding the CLIP and OCR models for every API worker on the host.
+# Start it before the API and point the workers at it with MODEL_SERVER_ADDRESS, a Unix
+# socket path (or a `\\.\pipe\...` name on Windows), and the same MODEL_SERVER_AUTHKEY:
+#
+#     MODEL_SERVER_ADDRESS=/tmp/patent-model.sock MODEL_SERVER_AUTHKEY=<secret> \
+#         python -m Backend.utility.handler.model_server
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Connection, Listener
+from os import getenv
+from pathlib import Path
+from queue import Empty, Queue
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+import numpy as np
+
+from Backend.utility.error.common import EnvironmentVariableNotSetError
+from Backend.utility.error.model_server import ModelServerError
+from Backend.utility.handler.log_handler import Logger
+from Backend.utility.handler.pdf_pages import iter_pages, write_pages
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from PIL.Image import Image
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def get_model_server_address() -> str | None:
+    return getenv("MODEL_SERVER_ADDRESS")
+
+
+def get_model_server_authkey() -> bytes:
+    """
+    Read the shared secret of the model server and its clients from `MODEL_SERVER_AUTHKEY`.
+
+    Requests are pickled, so a connection that skips the authentication handshake could run
+    code in the server; neither side starts without the key.
+
+    Raises:
+        EnvironmentVariableNotSetError: If the variable is unset or empty.
+
+    """
+    authkey = getenv("MODEL_SERVER_AUTHKEY")
+    if not authkey:
+        msg = "MODEL_SERVER_AUTHKEY"
+        raise EnvironmentVariableNotSetError(msg)
+
+    return authkey.encode()
+
+
+class DynamicBatcher(Generic[T, R]):
+    """
+    Collects items submitted from many connections into one batch per handler call.
+
+    A batch is closed when it holds `max_batch_size` items or `max_wait` seconds after its
+    first item arrived, whichever comes first, so a lone request waits at most `max_wait`.
+    """
+
+    def __init__(
+        self, name: str, handle: Callable[[list[T]], list[R]], max_batch_size: int, max_wait: float
+    ) -> None:
+        self.logger = Logger().get_logger()
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._handle = handle
+        self._queue: Queue[tuple[T, Future[R]]] = Queue()
+        self._thread = threading.Thread(target=self._run, name=f"{name}-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, items: list[T]) -> list[Future[R]]:
+        futures: list[Future[R]] = []
+        for item in items:
+            future: Future[R] = Future()
+            self._queue.put((item, future))
+            futures.append(future)
+
+        return futures
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except Empty:
+                    break
+
+            try:
+                results = self._handle([item for item, _ in batch])
+            except Exception as e:
+                self.logger.exception("%s batch of %d failed", self.name, len(batch))
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+            # a handler that drops items must not leave their callers waiting forever
+            if len(results) != len(batch):
+                msg = f"{self.name} batch of {len(batch)} items returned {len(results)} results"
+                self.logger.error(msg)
+                for _, future in batch[len(results) :]:
+                    future.set_exception(ModelServerError(msg))
+
+
+class ModelServer:
+    """
+    Serves image embeddings and PDF and page OCR from a single copy of the models.
+
+    Every client connection gets a thread; requests from all of them meet in one
+    `DynamicBatcher` per model, configured by `MODEL_SERVER_IMAGE_BATCH_SIZE`,
+    `MODEL_SERVER_OCR_BATCH_SIZE` and `MODEL_SERVER_MAX_WAIT_MS`. PDFs are rendered on
+    their connection's thread and OCRed page by page with the streamed pages.
+    """
+
+    def __init__(self, address: str) -> None:
+        # imported here: API workers only import this module for the clients
+        from Backend.utility.handler.embedding import ImageEmbedding  # noqa: PLC0415
+        from Backend.utility.handler.pdf_extractor import PDFExtractor  # noqa: PLC0415
+
+        self.logger = Logger().get_logger()
+        self.address = address
+        self.authkey = get_model_server_authkey()
+
+        self.embedding_model = ImageEmbedding()
+        self.pdf_extractor = PDFExtractor()
+
+        max_wait = float(getenv("MODEL_SERVER_MAX_WAIT_MS", "10")) / 1000
+        self.image_batcher: DynamicBatcher[str, np.ndarray] = DynamicBatcher(
+            "image",
+            lambda image_paths: list(self.embedding_model.process_batch(image_paths)),
+            max_batch_size=int(getenv("MODEL_SERVER_IMAGE_BATCH_SIZE", str(self.embedding_model.batch_size))),
+            max_wait=max_wait,
+        )
+        # rendered pages, of the streaming ingestion pipeline and of whole PDFs alike
+        self.page_batcher: DynamicBatcher[np.ndarray, str] = DynamicBatcher(
+            "page",
+            self.pdf_extractor.ocr_images,
+            max_batch_size=int(getenv("MODEL_SERVER_OCR_BATCH_SIZE", str(self.pdf_extractor.max_workers))),
+            max_wait=max_wait,
+        )
+
+    def _ocr_pdf(self, pdf_file_path: str, poppler_path: str, output_dir: str) -> str | None:
+        # rendered on the caller's connection thread and read page by page through the shared
+        # batcher, a long PDF does not hold up the other requests; a batch or two of pages are
+        # in flight at a time, the rest are rendered as those finish
+        max_pending = 2 * self.page_batcher.max_batch_size
+        try:
+            pending: list[Future[str]] = []
+            texts: list[str] = []
+            for image in iter_pages(pdf_file_path, poppler_path):
+                pending.extend(self.page_batcher.submit([np.asarray(image)]))
+                if len(pending) >= max_pending:
+                    texts.append(pending.pop(0).result())
+            texts.extend(future.result() for future in pending)
+
+            return write_pages(pdf_file_path, list(enumerate(texts, start=1)), output_dir)
+        except Exception:
+            self.logger.exception("OCR of %s failed", pdf_file_path)
+            return None
+
+    def dispatch(self, method: str, args: tuple[Any, ...]) -> Any:  # noqa: ANN401
+        if method == "embed_images":
+            (image_paths,) = args
+            if not image_paths:
+                return np.empty((0, self.embedding_model.backend.dimension), dtype=np.float32)
+            return np.stack([future.result() for future in self.image_batcher.submit(image_paths)])
+
+        if method == "ocr_pdfs":
+            pdf_file_paths, poppler_path, output_dir = args
+            return {path: self._ocr_pdf(path, poppler_path, output_dir) for path in pdf_file_paths}
+
+        if method == "ocr_images":
+            (images,) = args
+            return [future.result() for future in self.page_batcher.submit(images)]
+
+        if method == "ping":
+            return True
+
+        msg = f"Unknown model server method: {method}"
+        raise ModelServerError(msg)
+
+    def _serve_connection(self, connection: Connection) -> None:
+        with connection:
+            while True:
+                try:
+                    method, args = connection.recv()
+                except (EOFError, OSError):
+                    return
+
+                try:
+                    connection.send(("ok", self.dispatch(method, args)))
+                except Exception as e:
+                    self.logger.exception("Model server request %s failed", method)
+                    connection.send(("error", repr(e)))
+
+    def serve_forever(self) -> None:
+        is_unix_socket = not self.address.startswith("\\\\")
+        if is_unix_socket:
+            # a socket file left by a previous run would make the bind fail
+            Path(self.address).unlink(missing_ok=True)
+
+        # bound under a restrictive umask, the socket is never reachable by other users, not even
+        # between the bind and a chmod
+        previous_umask = os.umask(0o177) if is_unix_socket else None
+        try:
+            listener = Listener(self.address, authkey=self.authkey)
+        finally:
+            if previous_umask is not None:
+                os.umask(previous_umask)
+
+        with listener:
+            self.logger.info("Model server listening on %s", self.address)
+
+            while True:
+                try:
+                    connection = listener.accept()
+                except OSError:
+                    # a failed authentication handshake, keep serving the others
+                    self.logger.exception("Model server rejected a connection")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(connection,), daemon=True).start()
+
+
+class ModelServerConnection:
+    """Pool of connections to the model server, one per concurrent call of this process."""
+
+    def __init__(self, address: str) -> None:
+        self.address = address
+        self.authkey = get_model_server_authkey()
+        self._lock = Lock()
+        self._idle: list[Connection] = []
+
+    def call(self, method: str, *args: Any) -> Any:  # noqa: ANN401
+        """
+        Run a method on the model server and wait for its result.
+
+        Raises:
+            ModelServerError: If the server is unreachable or the request failed there.
+
+        """
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+
+        try:
+            if connection is None:
+                connection = Client(self.address, authkey=self.authkey)
+            connection.send((method, args))
+            status, result = connection.recv()
+        except (OSError, EOFError) as e:
+            if connection is not None:
+                connection.close()
+            msg = f"Model server at {self.address} is unavailable: {e!r}"
+            raise ModelServerError(msg) from e
+
+        with self._lock:
+            self._idle.append(connection)
+
+        if status != "ok":
+            raise ModelServerError(result)
+
+        return result
+
+
+def _connect() -> ModelServerConnection:
+    address = get_model_server_address()
+    if address is None:
+        msg = "MODEL_SERVER_ADDRESS"
+        raise EnvironmentVariableNotSetError(msg)
+
+    return ModelServerConnection(address)
+
+
+class ImageEmbeddingClient:
+    """`ImageEmbedding` served by the model server."""
+
+    def __init__(self) -> None:
+        self.server = _connect()
+
+    def process(self, image_path: str) -> list[float]:
+        return self.process_batch([image_path])[0].tolist()
+
+    def process_batch(self, image_paths: list[str], batch_size: int | None = None) -> np.ndarray:  # noqa: ARG002
+        # the server batches across all API workers, a per-call batch size does not apply
+        return self.server.call("embed_images", [str(Path(image_path).resolve()) for image_path in image_paths])
+
+
+class PDFExtractorClient:
+    """`PDFExtractor` served by the model server."""
+
+    def __init__(self) -> None:
+        self.server = _connect()
+
+    def process_single_pdf(self, pdf_file_path: str, poppler_path: str, output_dir: str = "./pdf_output") -> str:
+        output_path = self.process_multiple([pdf_file_path], poppler_path, output_dir)[pdf_file_path]
+        if output_path is None:
+            msg = f"OCR of {pdf_file_path} failed"
+            raise ModelServerError(msg)
+
+        return output_path
+
+    def process_multiple(
+        self, pdf_file_paths: list, poppler_path: str, output_dir: str = "./pdf_output"
+    ) -> dict[str, str | None]:
+        # the server's working directory may differ, send absolute paths and map them back
+        absolute_paths = {str(Path(pdf_file_path).resolve()): pdf_file_path for pdf_file_path in pdf_file_paths}
+        results = self.server.call(
+            "ocr_pdfs", list(absolute_paths), poppler_path, str(Path(output_dir).resolve())
+        )
+
+        return {absolute_paths[path]: output_path for path, output_path in results.items()}
+
+    def ocr_image(self, image: Image | np.ndarray) -> str:
+        # pages are rendered by the caller and sent as arrays, the server only runs the reader
+        return self.server.call("ocr_images", [np.asarray(image)])[0]
+
+    def process(self, pdf_file_path: str, poppler_path: str, output_dir: str = "./pdf_output") -> str:
+        return self.process_single_pdf(pdf_file_path, poppler_path, output_dir)
+
+
+def main() -> None:
+    address = get_model_server_address()
+    if address is None:
+        msg = "MODEL_SERVER_ADDRESS"
+        raise EnvironmentVariableNotSetError(msg)
+
+    ModelServer(address).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,34 +3,106 @@
 
 from __future__ import annotations
 
+import multiprocessing
+import os
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from pathlib import Path
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from os import getenv
+from typing import TYPE_CHECKING, get_args
 
 import easyocr  # type: ignore[import-untyped]
 import numpy as np
-from pdf2image import convert_from_path
 
+from Backend.utility.error.pdf_extractor import InvalidOCRExecutorError
 from Backend.utility.handler.log_handler import Logger
+from Backend.utility.handler.pdf_pages import iter_pages, page_count, render_page, write_pages
+from Backend.utility.model.handler.pdf_extractor import OCR_EXECUTOR_LIST
+
+if TYPE_CHECKING:
+    from PIL.Image import Image
 
 # from log_handler import Logger
 
+OCR_LANGUAGES = ["ch_tra", "en"]
+
+# the reader of a pool worker process, created once by `_init_worker`
+_worker_reader: easyocr.Reader | None = None
+
+
+def get_ocr_executor() -> OCR_EXECUTOR_LIST:
+    """
+    Read how OCR runs in parallel from `OCR_EXECUTOR`, defaulting to `thread`.
+
+    Raises:
+        InvalidOCRExecutorError: If the variable holds an unknown executor.
+
+    """
+    executor = getenv("OCR_EXECUTOR", "thread")
+
+    if executor not in get_args(OCR_EXECUTOR_LIST):
+        raise InvalidOCRExecutorError(executor)
+
+    return executor  # type: ignore[return-value]
+
+
+def _read_text(reader: easyocr.Reader, image: Image | np.ndarray) -> str:
+    ocr_result = reader.readtext(np.array(image), detail=0, paragraph=True)
+    return "\n".join(ocr_result).strip()
+
+
+def _init_worker(torch_threads: int) -> None:
+    import torch  # noqa: PLC0415
+
+    global _worker_reader  # noqa: PLW0603
+    # workers split the cores between them instead of each one using all of them
+    torch.set_num_threads(torch_threads)
+    _worker_reader = easyocr.Reader(OCR_LANGUAGES)
+
+
+def _ocr_page(pdf_file_path: str, page: int, poppler_path: str) -> str:
+    # rendered in the worker, only the text crosses the process boundary
+    return _read_text(_worker_reader, render_page(pdf_file_path, page, poppler_path))
+
+
+def _ocr_image(image: np.ndarray) -> str:
+    return _read_text(_worker_reader, image)
+
 
 class PDFExtractor:
-    def __init__(self, max_workers: int = 3) -> None:
+    def __init__(self, max_workers: int | None = None, executor: OCR_EXECUTOR_LIST | None = None) -> None:
         """
-        Initialize the PDFExtractor with configurable thread pool size.
+        Initialize the PDFExtractor with configurable thread or process pool size.
+
+        In `process` mode every worker process loads its own reader and OCRs single pages,
+        so a long patent is spread over all workers instead of holding up one of them.
+        Each worker uses `OCR_TORCH_THREADS` torch threads, by default its share of the cores.
 
         Args:
-            max_workers (int, optional): Maximum number of worker threads.
-                If None, uses default ThreadPoolExecutor size (typically CPU count).
+            max_workers (int | None, optional): Maximum number of worker threads or processes.
+                Defaults to `OCR_WORKERS`, 3 if unset.
+            executor (OCR_EXECUTOR_LIST | None, optional): `thread` or `process`. Defaults to
+                `OCR_EXECUTOR`, `thread` if unset.
 
         """
         self.logger = Logger().get_logger()
-        self.reader = easyocr.Reader(["ch_tra", "en"])
-        self.max_workers = max_workers
+        self.max_workers = max_workers or int(getenv("OCR_WORKERS", "3"))
+        self.executor = executor or get_ocr_executor()
         self.lock = threading.Lock()
 
+        self.reader: easyocr.Reader | None = None
+        self.pool: ProcessPoolExecutor | None = None
+        if self.executor == "process":
+            torch_threads = int(getenv("OCR_TORCH_THREADS", str(max(1, (os.cpu_count() or 1) // self.max_workers))))
+            # spawned: a forked worker would inherit this process's torch thread pool in a broken state
+            self.pool = ProcessPoolExecutor(
+                self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(torch_threads,),
+            )
+        else:
+            self.reader = easyocr.Reader(OCR_LANGUAGES)
+
     def process_single_pdf(self, pdf_file_path: str, poppler_path: str, output_dir: str = "./pdf_output") -> str:
         """
         Process a single PDF file to extract text.
@@ -42,37 +114,53 @@ class PDFExtractor:
 
         """
         self.logger.info("Start process pdf: %s", pdf_file_path)
+        if self.pool is not None:
+            return self._collect_pages(pdf_file_path, self._submit_pages(pdf_file_path, poppler_path), output_dir)
+
         pdf_filename = pdf_file_path.split("/")[-1]
         pdf_file_id = pdf_filename.split(".")[0]
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-
-        images = convert_from_path(pdf_file_path, dpi=300, poppler_path=poppler_path)
-
-        all_text_output = ""
 
-        for i, image in enumerate(images):
-            page_num = i + 1
+        pages: list[tuple[int, str]] = []
+        for page_num, image in enumerate(iter_pages(pdf_file_path, poppler_path), start=1):
             with self.lock:
                 self.logger.info("Processing %s Page: %s", pdf_file_id, page_num)
 
-            ocr_result = self.reader.readtext(np.array(image), detail=0, paragraph=True)
-            extracted_text = "\n".join(ocr_result).strip()
+            pages.append((page_num, self.ocr_image(image)))
 
-            all_text_output += f"\n--- Page {page_num} ---\n{extracted_text}\n"
-
-        # Save the extracted text to a file
-        output_text_path = Path(output_dir) / f"{pdf_file_id}.txt"
-        with Path.open(output_text_path, "w", encoding="utf-8") as f:
-            f.write(all_text_output)
+        output_text_path = write_pages(pdf_file_path, pages, output_dir)
 
         self.logger.info("Finish processing %s", pdf_filename)
-        return str(output_text_path)
+        return output_text_path
+
+    def ocr_image(self, image: Image | np.ndarray) -> str:
+        """
+        Extract the text of one rendered page.
+
+        Args:
+            image (Image | np.ndarray): The page, as rendered by `iter_pages`.
+
+        Returns:
+            str: The page's paragraphs, one per line.
+
+        """
+        if self.pool is not None:
+            return self.pool.submit(_ocr_image, np.asarray(image)).result()
+
+        return _read_text(self.reader, image)
+
+    def ocr_images(self, images: list[Image | np.ndarray]) -> list[str]:
+        # the process pool reads the pages side by side, the shared reader one after another
+        if self.pool is not None:
+            futures = [self.pool.submit(_ocr_image, np.asarray(image)) for image in images]
+            return [future.result() for future in futures]
+
+        return [_read_text(self.reader, image) for image in images]
 
     def process_multiple(
         self, pdf_file_paths: list, poppler_path: str, output_dir: str = "./pdf_output"
     ) -> dict[str, str | None]:
         """
-        Process multiple PDF files in parallel using thread-based parallelism.
+        Process multiple PDF files in parallel, one PDF per thread or one page per process.
 
         Args:
             pdf_file_paths (list): List of paths to PDF files.
@@ -83,6 +171,9 @@ class PDFExtractor:
             dict: Dictionary mapping PDF file paths to their respective output text file paths.
 
         """
+        if self.pool is not None:
+            return self._process_pages(pdf_file_paths, poppler_path, output_dir)
+
         results: dict[str, str | None] = {pdf_path: None for pdf_path in pdf_file_paths}
 
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
@@ -119,6 +210,45 @@ class PDFExtractor:
         """
         return self.process_single_pdf(pdf_file_path, poppler_path, output_dir)
 
+    def _submit_pages(self, pdf_file_path: str, poppler_path: str) -> list[Future[str]]:
+        return [
+            self.pool.submit(_ocr_page, pdf_file_path, page, poppler_path)
+            for page in range(1, page_count(pdf_file_path, poppler_path) + 1)
+        ]
+
+    def _collect_pages(self, pdf_file_path: str, futures: list[Future[str]], output_dir: str) -> str:
+        # the futures are in page order, whatever order the workers finish them in
+        pages = [(page, future.result()) for page, future in enumerate(futures, start=1)]
+        output_text_path = write_pages(pdf_file_path, pages, output_dir)
+
+        self.logger.info("Finish processing %s", pdf_file_path)
+        return output_text_path
+
+    def _process_pages(self, pdf_file_paths: list, poppler_path: str, output_dir: str) -> dict[str, str | None]:
+        results: dict[str, str | None] = {pdf_path: None for pdf_path in pdf_file_paths}
+
+        # every page of every PDF is queued before waiting on any, the pool stays busy to the end
+        page_futures: dict[str, list[Future[str]]] = {}
+        for pdf_path in pdf_file_paths:
+            try:
+                page_futures[pdf_path] = self._submit_pages(pdf_path, poppler_path)
+            except Exception as e:
+                msg = f"Error processing {pdf_path}: {e!r}"
+                self.logger.exception(msg)
+
+        for pdf_path, futures in page_futures.items():
+            try:
+                results[pdf_path] = self._collect_pages(pdf_path, futures, output_dir)
+            except Exception as e:
+                msg = f"Error processing {pdf_path}: {e!r}"
+                self.logger.exception(msg)
+
+        return results
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
 
 if __name__ == "__main__":
     extractor = PDFExtractor(max_workers=3)  # Using 3 worker threads
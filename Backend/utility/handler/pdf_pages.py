@@ -0,0 +1,115 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import re
+from os import getenv
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from PIL.Image import Image
+
+# resolution pages are rasterised at for OCR
+PDF_DPI = 300
+# A4, assumed when poppler reports no page size
+A4_POINTS = (595.276, 841.89)
+PAGE_SIZE_PATTERN = r"([\d.]+)\s*x\s*([\d.]+)\s*pts"
+
+
+def get_render_memory_budget() -> int:
+    """Bytes of rendered pages one renderer may hold at once, `OCR_RENDER_MEMORY_MB` (128 if unset)."""
+    return int(float(getenv("OCR_RENDER_MEMORY_MB", "128")) * 1024**2)
+
+
+def page_bytes(page_size: str | None) -> int:
+    """Size of one page rendered as RGB at `PDF_DPI`, from a pdfinfo `Page size` such as `595 x 842 pts`."""
+    match = re.search(PAGE_SIZE_PATTERN, page_size or "")
+    width, height = (float(match[1]), float(match[2])) if match else A4_POINTS
+    return int(width / 72 * PDF_DPI) * int(height / 72 * PDF_DPI) * 3
+
+
+def iter_pages(pdf_file_path: str, poppler_path: str, memory_budget: int | None = None) -> Iterator[Image]:
+    """
+    Rasterise a PDF for OCR a window of pages at a time.
+
+    Rendering a whole PDF at once holds every page in memory, several GB for a long patent.
+    Here the window is as many pages as fit in the memory budget, at least one, so the memory
+    held does not grow with the page count. Pages are sized by the first one.
+
+    Args:
+        pdf_file_path (str): The path to the PDF file.
+        poppler_path (str): The poppler path.
+        memory_budget (int | None, optional): Bytes of rendered pages held at once. Defaults to
+            `get_render_memory_budget()`.
+
+    Yields:
+        Image: One RGB image per page, in page order.
+
+    """
+    info = pdfinfo_from_path(pdf_file_path, poppler_path=poppler_path)
+    pages = int(info["Pages"])
+    budget = get_render_memory_budget() if memory_budget is None else memory_budget
+    # pdftoppm's output is held next to the decoded images while a window is read
+    window = max(1, budget // (2 * page_bytes(info.get("Page size"))))
+
+    for first_page in range(1, pages + 1, window):
+        images = convert_from_path(
+            pdf_file_path,
+            dpi=PDF_DPI,
+            first_page=first_page,
+            last_page=min(first_page + window - 1, pages),
+            poppler_path=poppler_path,
+        )
+        # popped, the window must not keep the pages the caller is done with
+        while images:
+            yield images.pop(0)
+
+
+def page_count(pdf_file_path: str, poppler_path: str) -> int:
+    return int(pdfinfo_from_path(pdf_file_path, poppler_path=poppler_path)["Pages"])
+
+
+def render_page(pdf_file_path: str, page: int, poppler_path: str) -> Image:
+    """
+    Rasterise a single page of a PDF, without rendering the others.
+
+    Args:
+        pdf_file_path (str): The path to the PDF file.
+        page (int): The page, starting at 1.
+        poppler_path (str): The poppler path.
+
+    Returns:
+        Image: The RGB image of the page.
+
+    """
+    return convert_from_path(
+        pdf_file_path, dpi=PDF_DPI, first_page=page, last_page=page, poppler_path=poppler_path
+    )[0]
+
+
+def write_pages(pdf_file_path: str, pages: list[tuple[int, str]], output_dir: str = "./pdf_output") -> str:
+    """
+    Save the OCR text of a PDF as `--- Page N ---` sections, the file `/response/summary/` reads.
+
+    Args:
+        pdf_file_path (str): The path to the PDF file, its name is the text file's name.
+        pages (list[tuple[int, str]]): `(page, text)` of every page, in page order.
+        output_dir (str, optional): The directory to save the file. Defaults to "./pdf_output".
+
+    Returns:
+        str: The path of the text file.
+
+    """
+    pdf_file_id = Path(pdf_file_path).name.split(".")[0]
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    output_text_path = Path(output_dir) / f"{pdf_file_id}.txt"
+    with Path.open(output_text_path, "w", encoding="utf-8") as f:
+        f.write("".join(f"\n--- Page {page} ---\n{text}\n" for page, text in pages))
+
+    return str(output_text_path)
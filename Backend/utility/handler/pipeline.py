@@ -0,0 +1,127 @@
+# Code by AkinoAlice@TyrantRey
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from Backend.utility.handler.log_handler import Logger
+from Backend.utility.model.handler.pipeline import PipelineStageStats
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+T = TypeVar("T")
+
+
+class PipelineStage(Generic[T]):
+    """
+    A pipeline step run by `concurrency` coroutines, fed through a bounded queue.
+
+    `put` waits while the queue is full, so a slow stage holds its upstream back instead of
+    piling items up in memory. When all of a stage's upstreams finished, its workers drain
+    the queue and stop, then the stage closes its own downstream stages.
+
+    An item whose handler raises is logged, counted as failed and skipped, so one bad item
+    does not stop the pipeline; only the `fatal` exceptions propagate.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handle: Callable[[T], Awaitable[None]],
+        queue_size: int,
+        concurrency: int = 1,
+        fatal: tuple[type[Exception], ...] = (),
+    ) -> None:
+        self.logger = Logger().get_logger()
+        self.name = name
+        self.concurrency = concurrency
+        self.finished = asyncio.Event()
+        self._handle = handle
+        self._fatal = fatal
+        # None is the stop marker, one per worker
+        self._queue: asyncio.Queue[T | None] = asyncio.Queue(maxsize=queue_size)
+        self._downstream: list[PipelineStage] = []
+        self._open_upstreams = 0
+
+        self._queued = 0
+        self._processed = 0
+        self._failed = 0
+        self._busy_seconds = 0.0
+        self._queue_peak = 0
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+
+    def feeds(self, *stages: PipelineStage) -> None:
+        for stage in stages:
+            stage._open_upstreams += 1
+            self._downstream.append(stage)
+
+    async def put(self, item: T) -> None:
+        await self._queue.put(item)
+        self._queued += 1
+        self._queue_peak = max(self._queue_peak, self._queued)
+
+    async def close(self) -> None:
+        """Signal that an upstream is done; a stage without upstreams is closed by its feeder."""
+        self._open_upstreams -= 1
+        if self._open_upstreams <= 0:
+            for _ in range(self.concurrency):
+                await self._queue.put(None)
+
+    async def run(self) -> None:
+        self._started_at = time.perf_counter()
+        await asyncio.gather(*(self._work() for _ in range(self.concurrency)))
+        self._finished_at = time.perf_counter()
+        self.finished.set()
+
+        for stage in self._downstream:
+            await stage.close()
+
+    async def _work(self) -> None:
+        while (item := await self._queue.get()) is not None:
+            self._queued -= 1
+            start = time.perf_counter()
+            try:
+                await self._handle(item)
+            except self._fatal:
+                raise
+            except Exception:
+                self.logger.exception("Pipeline stage %s failed on an item", self.name)
+                self._failed += 1
+            self._busy_seconds += time.perf_counter() - start
+            self._processed += 1
+
+    def stats(self) -> PipelineStageStats:
+        elapsed = 0.0
+        if self._started_at is not None:
+            elapsed = (self._finished_at or time.perf_counter()) - self._started_at
+
+        return PipelineStageStats(
+            name=self.name,
+            concurrency=self.concurrency,
+            processed=self._processed,
+            failed=self._failed,
+            throughput=self._processed / elapsed if elapsed else 0.0,
+            utilisation=self._busy_seconds / (elapsed * self.concurrency) if elapsed else 0.0,
+            queue_size=self._queued,
+            queue_capacity=self._queue.maxsize,
+            queue_peak=self._queue_peak,
+        )
+
+
+async def run_stages(*coroutines: Awaitable[None]) -> None:
+    """
+    Run a pipeline's stages and feeders together.
+
+    If one of them fails the others are cancelled, a stage blocked on a full queue would
+    otherwise wait forever for a consumer that is gone.
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -21,3 +21,15 @@ class LoginHistoryRecord(Record):
 class ResponseHistoryRecord(Record):
     query: str
     response: str
+
+
+class SearchHistoryWriterStats(BaseModel):
+    queue_depth: int
+    enqueued_rows: int
+    flushed_rows: int
+    dropped_rows: int
+    flush_count: int
+    failed_flush_count: int
+    last_flush_latency_ms: float
+    max_flush_latency_ms: float
+    average_flush_latency_ms: float
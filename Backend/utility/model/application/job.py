@@ -0,0 +1,107 @@
+# Code by AkinoAlice@TyrantRey
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from Backend.utility.model.handler.pipeline import PipelineStageStats
+from Backend.utility.model.handler.scraper import PatentImageModel
+
+from .search import PDFInfo
+
+INGESTION_JOB_STATUS_LIST = Literal["queued", "running", "succeeded", "failed"]
+# in pipeline order
+INGESTION_STAGE_LIST = Literal["crawl", "ocr", "embedding", "neighbors"]
+# `local`: jobs run inside the API worker, `queue`: jobs are split into tasks for `Backend.worker`
+INGESTION_MODE_LIST = Literal["local", "queue"]
+INGESTION_TASK_KIND_LIST = Literal["scrape", "images", "ocr", "embed", "neighbors"]
+INGESTION_TASK_STATUS_LIST = Literal["pending", "running", "succeeded", "failed"]
+
+
+class IngestionStageProgress(BaseModel):
+    done: int = 0
+    total: int | None = None
+    # items of `done` that failed and were skipped
+    failed: int = 0
+
+
+class IngestionCheckpoint(BaseModel):
+    """What a resumed job does not redo, stored with the job after every step."""
+
+    stages_done: list[INGESTION_STAGE_LIST] = Field(default_factory=list)
+    # crawl: patent pages already stored
+    urls_done: list[str] = Field(default_factory=list)
+    # patent pages of `urls_done` that could not be fetched or stored, with the error
+    urls_failed: dict[str, str] = Field(default_factory=dict)
+    patents: list[PDFInfo] = Field(default_factory=list)
+    # images of stored patents that are not embedded yet
+    images_pending: dict[int, list[PatentImageModel]] = Field(default_factory=dict)
+    # patents whose image vectors could not be stored, with the error
+    images_failed: dict[int, str] = Field(default_factory=dict)
+    # ocr: text file of every PDF, None where OCR failed
+    ocr_outputs: dict[str, str | None] = Field(default_factory=dict)
+    # embedding: patents whose text vectors are stored
+    texts_done: list[int] = Field(default_factory=list)
+    # patents of `texts_done` whose text vectors could not be stored, with the error
+    texts_failed: dict[int, str] = Field(default_factory=dict)
+
+
+class IngestionJob(BaseModel):
+    job_id: int
+    user_id: int
+    keyword: str
+    status: INGESTION_JOB_STATUS_LIST
+    stage: INGESTION_STAGE_LIST | None
+    progress: dict[INGESTION_STAGE_LIST, IngestionStageProgress]
+    patent_ids: list[int]
+    # stages of the streaming pipeline of a local job, empty for queued jobs
+    pipeline: list[PipelineStageStats]
+    error: str | None
+    attempts: int
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None
+
+
+class IngestionTask(BaseModel):
+    task_id: int
+    job_id: int
+    kind: INGESTION_TASK_KIND_LIST
+    payload: dict
+    result: dict
+    attempts: int
+    max_attempts: int
+
+
+class IngestionFollowUp(BaseModel):
+    """A task queued by another one when it completes."""
+
+    kind: INGESTION_TASK_KIND_LIST
+    payload: dict
+    # queued once per job, a retried task cannot queue its follow-ups twice
+    dedupe_key: str | None = None
+
+
+class ScrapeTaskPayload(BaseModel):
+    keyword: str
+
+
+class ImagesTaskPayload(BaseModel):
+    patent_id: int
+    images: list[PatentImageModel]
+
+
+class OCRTaskPayload(BaseModel):
+    patent_id: int
+    pdf_path: str
+
+
+class EmbedTaskPayload(BaseModel):
+    patent_id: int
+    # (page, text) of every OCR page
+    pages: list[tuple[int, str]]
+
+
+class NeighborsTaskPayload(BaseModel):
+    patent_ids: list[int]
@@ -1,17 +1,73 @@
 # Code by AkinoAlice@TyrantRey
 
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel
 
 from Backend.utility.model.handler.scraper import PatentInfoModel
 
 
-class SearchResult(BaseModel):
+class PatentSearchPage(BaseModel):
     patents: list[PatentInfoModel]
+    next_cursor: str | None = None
+    total_estimate: int | None = None
+
+
+class SearchResult(PatentSearchPage):
+    search_time: datetime
+
+
+class HybridSearchHit(BaseModel):
+    patent: PatentInfoModel
+    score: float
+    # position in each stage, None when the stage did not return the patent
+    lexical_rank: int | None = None
+    vector_rank: int | None = None
+
+
+class HybridSearchPage(BaseModel):
+    hits: list[HybridSearchHit]
+    next_offset: int | None = None
+
+
+class HybridSearchResult(HybridSearchPage):
     search_time: datetime
 
 
+class SearchCursor(BaseModel):
+    rank: float
+    patent_id: int
+
+
+class PatentSimilarity(BaseModel):
+    patent_id: int
+    score: float
+    # matched pages, best first
+    pages: list[int]
+
+
+class GraphNode(BaseModel):
+    type: Literal["node"] = "node"
+    patent_id: int
+    title: str
+    depth: int
+
+
+class GraphEdge(BaseModel):
+    type: Literal["edge"] = "edge"
+    source: int
+    target: int
+    similarity: float
+
+
+class GraphTraversalEnd(BaseModel):
+    type: Literal["end"] = "end"
+    nodes: int
+    edges: int
+    reason: Literal["complete", "node_budget", "time_budget"]
+
+
 class PDFChunkEmbedding(BaseModel):
     patent_id: int
     page_number: int
@@ -19,6 +75,12 @@ class PDFChunkEmbedding(BaseModel):
     embedding: list[float]
 
 
+class BulkInsertResult(BaseModel):
+    rows: int
+    seconds: float
+    rows_per_second: float
+
+
 class PDFInfo(BaseModel):
     patent_id: int
     patent_file_path: str
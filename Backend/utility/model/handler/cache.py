@@ -0,0 +1,22 @@
+# Code by AkinoAlice@TyrantRey
+
+from pydantic import BaseModel
+
+
+class EmbeddingCacheStats(BaseModel):
+    memory_entries: int
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    hit_rate: float
+    disk_enabled: bool
+
+
+class ContentEmbeddingCacheStats(BaseModel):
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
@@ -1,8 +1,21 @@
 # Code by AkinoAlice@TyrantRey
 
+from typing import Literal
 
 from pydantic import BaseModel
 
+# `trigram`: pg_trgm GIN indexes, `bigram`: the app-maintained `patent_bigram` table
+SUBSTRING_SEARCH_MODE_LIST = Literal["trigram", "bigram"]
+
+# substring-searchable fields, as stored in `patent_bigram.field`
+SUBSTRING_SEARCH_FIELD_LIST = Literal["title", "applicant", "abstract"]
+
+# how chunk similarities are combined into a patent score
+SIMILARITY_AGGREGATION_LIST = Literal["max", "sum"]
+
+# ANN index on the embedding columns, `none` keeps exact (sequential) similarity search
+VECTOR_INDEX_TYPE_LIST = Literal["hnsw", "ivfflat", "none"]
+
 
 class DatabaseConfig(BaseModel):
     host: str
@@ -10,6 +23,43 @@ class DatabaseConfig(BaseModel):
     password: str
     database: str
     port: int = 5432
+    echo: bool = False
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_pre_ping: bool = True
+    pool_recycle: int = 1800
+    # milliseconds, 0 disables the server-side limit
+    statement_timeout: int = 0
+
+
+class VectorIndexConfig(BaseModel):
+    index_type: VECTOR_INDEX_TYPE_LIST = "hnsw"
+    # hnsw build parameters
+    m: int = 16
+    ef_construction: int = 64
+    # ivfflat build parameter, about rows / 1000 up to 1M rows
+    lists: int = 100
+
+
+class ConnectionPoolStats(BaseModel):
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    acquire_count: int
+    overflow_count: int
+    timeout_count: int
+    last_wait_ms: float
+    max_wait_ms: float
+    average_wait_ms: float
+
+
+class DatabasePoolStats(BaseModel):
+    sync_pool: ConnectionPoolStats
+    async_pool: ConnectionPoolStats
+
 
 class VectorDatabaseConfig(BaseModel):
     host: str
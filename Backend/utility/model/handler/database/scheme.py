@@ -3,8 +3,20 @@
 import datetime
 
 from pgvector.sqlalchemy import Vector  # type: ignore[import-untyped]
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, UniqueConstraint, func
-from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy import (
+    Computed,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -75,8 +87,35 @@ class LoginScheme(BaseScheme):
         )
 
 
+# The lexical search document of a patent. ``'simple'`` is used instead of a language
+# config because titles and applicants are mostly Traditional Chinese, which no
+# stemmer handles; the query side must use the same config to hit the GIN index.
+PATENT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(applicant, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(ipc, '') || ' ' || coalesce(application_number, '')), 'C')"
+)
+
+
+# OCR page of a patent PDF that carries the abstract, the only page indexed for substring search
+ABSTRACT_PAGE = 1
+# width of the text embeddings in `patent_content_vector`, the configured embedding model must match it
+TEXT_EMBEDDING_DIMENSION = 1536
+
+
 class PatentScheme(BaseScheme):
     __tablename__ = "patent"
+    __table_args__ = (
+        Index("patent_search_vector_idx", "search_vector", postgresql_using="gin"),
+        # pg_trgm indexes serving `LIKE '%keyword%'` for keywords of three or more characters
+        Index("patent_title_trgm_idx", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index(
+            "patent_applicant_trgm_idx",
+            "applicant",
+            postgresql_using="gin",
+            postgresql_ops={"applicant": "gin_trgm_ops"},
+        ),
+    )
 
     # SERIAL PRIMARY KEY in PostgreSQL
     patent_id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -96,17 +135,131 @@ class PatentScheme(BaseScheme):
     patent_url: Mapped[str] = mapped_column(Text)
     patent_file_path: Mapped[str] = mapped_column(Text)
 
-    search_vector = mapped_column(TSVECTOR)
+    # generated column, kept current by PostgreSQL on every insert/update
+    search_vector = mapped_column(TSVECTOR, Computed(PATENT_SEARCH_VECTOR, persisted=True))
 
 
 class ContentVectorScheme(BaseScheme):
     __tablename__ = "patent_content_vector"
+    __table_args__ = (
+        Index(
+            "patent_content_abstract_trgm_idx",
+            "content",
+            postgresql_using="gin",
+            postgresql_ops={"content": "gin_trgm_ops"},
+            postgresql_where=text(f"page = {ABSTRACT_PAGE}"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     patent_id: Mapped[int] = mapped_column(ForeignKey("patent.patent_id", ondelete="CASCADE"), nullable=False)
     page: Mapped[int] = mapped_column(Integer, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
-    embedding: Mapped[int] = mapped_column(Vector(1536), nullable=False)
+    embedding: Mapped[int] = mapped_column(Vector(TEXT_EMBEDDING_DIMENSION), nullable=False)
+
+
+class PatentBigramScheme(BaseScheme):
+    """
+    App-maintained character-bigram inverted index for CJK substring search.
+
+    pg_trgm cannot extract a trigram from a two-character keyword such as "鞋面", so such
+    searches would scan the whole table. Every bigram of a patent's title, applicant and
+    abstract is stored here; a keyword's candidates are the patents holding all of its bigrams.
+    """
+
+    __tablename__ = "patent_bigram"
+
+    field: Mapped[str] = mapped_column(String(16), primary_key=True)
+    bigram: Mapped[str] = mapped_column(String(2), primary_key=True)
+    patent_id: Mapped[int] = mapped_column(
+        ForeignKey("patent.patent_id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+
+
+class PatentNeighborScheme(BaseScheme):
+    """
+    Precomputed related patents, refreshed after ingestion so `/search/graph/` is a primary
+    key lookup instead of a vector search.
+    """
+
+    __tablename__ = "patent_neighbors"
+
+    patent_id: Mapped[int] = mapped_column(ForeignKey("patent.patent_id", ondelete="CASCADE"), primary_key=True)
+    # 1 is the nearest neighbour
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    neighbor_id: Mapped[int] = mapped_column(
+        ForeignKey("patent.patent_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    distance: Mapped[float] = mapped_column(Float, nullable=False)
+    computed_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=func.now())
+
+
+class IngestionJobScheme(BaseScheme):
+    """
+    Scraper ingestion jobs, run in the background and resumed after a restart.
+
+    `attempts` is bumped by every claim and guards all later updates, so a job resumed by
+    another worker cannot be overwritten by the one that lost it.
+    """
+
+    __tablename__ = "ingestion_job"
+
+    job_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    keyword: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued", index=True)
+    stage: Mapped[str | None] = mapped_column(String(16))
+    progress: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    checkpoint: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    pipeline: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    error: Mapped[str | None] = mapped_column(Text)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=func.now())
+    updated_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=func.now())
+    finished_at: Mapped[datetime.datetime | None] = mapped_column(DateTime)
+
+
+class IngestionTaskScheme(BaseScheme):
+    """
+    Units of work of queued ingestion jobs, claimed by `Backend.worker` processes with
+    `FOR UPDATE SKIP LOCKED`.
+
+    A claimed task holds a lease renewed by heartbeats; once `lease_expires_at` passes, any
+    worker may claim it again. Failed tasks go back to `pending` with a later `run_after`
+    until `max_attempts` is reached.
+    """
+
+    __tablename__ = "ingestion_task"
+    __table_args__ = (Index("ingestion_task_claim_idx", "status", "run_after"),)
+
+    task_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_id: Mapped[int] = mapped_column(
+        ForeignKey("ingestion_job.job_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="pending")
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    result: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    dedupe_key: Mapped[str | None] = mapped_column(String(128), unique=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    run_after: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=func.now())
+    worker_id: Mapped[str | None] = mapped_column(String(128))
+    lease_expires_at: Mapped[datetime.datetime | None] = mapped_column(DateTime)
+    heartbeat_at: Mapped[datetime.datetime | None] = mapped_column(DateTime)
+    error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=func.now())
+    finished_at: Mapped[datetime.datetime | None] = mapped_column(DateTime)
 
 
 class ImageVectorScheme(BaseScheme):
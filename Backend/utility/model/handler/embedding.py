@@ -0,0 +1,7 @@
+# Code by AkinoAlice@TyrantRey
+
+from typing import Literal
+
+# `torch`: fp32 transformers model, `int8`: dynamically quantised Linear layers,
+# `onnx`: ONNX Runtime session of the exported vision tower
+CLIP_BACKEND_LIST = Literal["torch", "int8", "onnx"]
@@ -0,0 +1,14 @@
+# Code by AkinoAlice@TyrantRey
+
+from typing import Literal
+
+from pydantic import BaseModel
+
+# heavy handlers loaded on first use, see Backend.utility.handler.lazy
+LAZY_HANDLER_LIST = Literal["pdf_extractor", "image_embedding", "llm"]
+
+
+class LazyHandlerStatus(BaseModel):
+    name: LAZY_HANDLER_LIST
+    loaded: bool
+    load_seconds: float | None
@@ -0,0 +1,7 @@
+# Code by AkinoAlice@TyrantRey
+
+from typing import Literal
+
+# `thread`: one EasyOCR reader shared by a thread pool, PDFs as the unit of work,
+# `process`: one reader per worker process, pages as the unit of work
+OCR_EXECUTOR_LIST = Literal["thread", "process"]
@@ -0,0 +1,19 @@
+# Code by AkinoAlice@TyrantRey
+
+from pydantic import BaseModel
+
+
+class PipelineStageStats(BaseModel):
+    name: str
+    concurrency: int
+    processed: int
+    # items of `processed` whose handler raised, logged and skipped
+    failed: int = 0
+    # items finished per second since the stage started
+    throughput: float
+    # share of the workers' time spent on items, including waits on a full downstream queue;
+    # low means the stage waits on its upstream
+    utilisation: float
+    queue_size: int
+    queue_capacity: int
+    queue_peak: int
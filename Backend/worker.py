@@ -0,0 +1,158 @@
+# Code by AkinoAlice@TyrantRey
+
+# Ingestion worker for INGESTION_MODE=queue: claims the tasks of queued ingestion jobs from
+# Postgres and runs them. Start any number of them, on any host that reaches the database
+# and shares the PDF and image download directories:
+#
+#     python -m Backend.worker --concurrency 2
+#     python -m Backend.worker --kinds ocr            # an OCR-only box
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import os
+import signal
+import socket
+import time
+import uuid
+from os import getenv
+from typing import TYPE_CHECKING, get_args
+
+from Backend.utility.error.job import IngestionJobLostError
+from Backend.utility.handler.backoff import backoff_delay
+from Backend.utility.handler.database.task import IngestionTaskOperation
+from Backend.utility.handler.ingestion import IngestionPipeline, IngestionTaskExecutor
+from Backend.utility.handler.log_handler import Logger
+from Backend.utility.model.application.job import INGESTION_TASK_KIND_LIST
+
+if TYPE_CHECKING:
+    from Backend.utility.model.application.job import IngestionFollowUp, IngestionTask
+
+
+class IngestionWorker:
+    """
+    Claims and runs ingestion tasks until stopped by SIGINT or SIGTERM.
+
+    Each of the `concurrency` slots runs one task at a time. A running task's lease is renewed
+    every third of `INGESTION_TASK_LEASE_SECONDS`; if the worker dies, the lease runs out and
+    another worker claims the task. Failed attempts are retried after an exponential backoff
+    from `INGESTION_TASK_BACKOFF_SECONDS` up to `INGESTION_TASK_BACKOFF_MAX_SECONDS`.
+    """
+
+    def __init__(self, kinds: list[INGESTION_TASK_KIND_LIST], concurrency: int, exit_when_idle: bool = False) -> None:
+        self.logger = Logger().get_logger()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.kinds = kinds
+        self.concurrency = concurrency
+        self.exit_when_idle = exit_when_idle
+
+        self.lease = float(getenv("INGESTION_TASK_LEASE_SECONDS", "120"))
+        self.poll_interval = float(getenv("INGESTION_WORKER_POLL_SECONDS", "2"))
+        self.backoff_base = float(getenv("INGESTION_TASK_BACKOFF_SECONDS", "10"))
+        self.backoff_max = float(getenv("INGESTION_TASK_BACKOFF_MAX_SECONDS", "600"))
+
+        self.tasks = IngestionTaskOperation()
+        self.executor = IngestionTaskExecutor(IngestionPipeline())
+        self._stopping = asyncio.Event()
+
+    def backoff(self, attempts: int) -> float:
+        return backoff_delay(attempts, self.backoff_base, self.backoff_max)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for stop_signal in (signal.SIGINT, signal.SIGTERM):
+            # not available on Windows, Ctrl+C still stops the worker there
+            with contextlib.suppress(NotImplementedError):
+                loop.add_signal_handler(stop_signal, self._stopping.set)
+
+        self.logger.info("Worker %s running %s with %d slots", self.worker_id, self.kinds, self.concurrency)
+        await asyncio.gather(*(self._slot() for _ in range(self.concurrency)))
+        self.logger.info("Worker %s stopped", self.worker_id)
+
+    async def _slot(self) -> None:
+        while not self._stopping.is_set():
+            task = await self.tasks.claim(self.worker_id, self.kinds, self.lease)
+            if task is None:
+                if self.exit_when_idle:
+                    return
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                continue
+
+            await self._execute(task)
+
+    async def _execute(self, task: IngestionTask) -> None:
+        if task.attempts > task.max_attempts:
+            # claimed again after the lease of its last allowed attempt ran out
+            await self.tasks.fail(task, self.worker_id, "Lease expired on the last attempt", retry_in=None)
+            return
+
+        self.logger.info(
+            "Running %s task %d of job %d, attempt %d", task.kind, task.task_id, task.job_id, task.attempts
+        )
+        lost = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(task, lost))
+
+        async def checkpoint(result: dict, follow_ups: list[IngestionFollowUp]) -> None:
+            if lost.is_set() or not await self.tasks.checkpoint(task, self.worker_id, result, follow_ups):
+                msg = f"Task {task.task_id} was claimed by another worker"
+                raise IngestionJobLostError(msg)
+
+        try:
+            result, follow_ups = await self.executor.run(task, checkpoint)
+        except IngestionJobLostError:
+            self.logger.warning("Task %d lost to another worker", task.task_id)
+        except Exception as e:
+            retry_in = self.backoff(task.attempts) if task.attempts < task.max_attempts else None
+            self.logger.exception("Task %d failed, retry in %s seconds", task.task_id, retry_in)
+            await self.tasks.fail(task, self.worker_id, repr(e), retry_in)
+        else:
+            if not await self.tasks.complete(task, self.worker_id, result, follow_ups):
+                self.logger.warning("Task %d finished after it was lost, result discarded", task.task_id)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, task: IngestionTask, lost: asyncio.Event) -> None:
+        # a database error does not lose the task while its lease lasts, the renewal is retried
+        # sooner until then
+        expires_at = time.monotonic() + self.lease
+        interval = self.lease / 3
+        while True:
+            await asyncio.sleep(interval)
+            renewed_at = time.monotonic()
+            try:
+                renewed = await self.tasks.heartbeat(task, self.worker_id, self.lease)
+            except Exception:
+                self.logger.exception("Heartbeat of task %d failed", task.task_id)
+                renewed = None
+
+            if renewed:
+                expires_at = renewed_at + self.lease
+                interval = self.lease / 3
+                continue
+
+            if renewed is False or time.monotonic() >= expires_at:
+                self.logger.warning("Lost the lease of task %d", task.task_id)
+                lost.set()
+                return
+
+            self.logger.warning("Could not renew the lease of task %d, retrying", task.task_id)
+            interval = min(self.lease / 3, max(0.0, expires_at - time.monotonic()), self.poll_interval)
+
+
+def main() -> None:
+    kinds = list(get_args(INGESTION_TASK_KIND_LIST))
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kinds", nargs="+", choices=kinds, default=kinds)
+    parser.add_argument("--concurrency", type=int, default=int(getenv("INGESTION_WORKER_CONCURRENCY", "1")))
+    parser.add_argument("--exit-when-idle", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(IngestionWorker(args.kinds, args.concurrency, args.exit_when_idle).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 // Code by AkinoAlice@TyrantRey
 import { fetcher } from "./fetcher";
-import { IPatentInfoModel } from "@/types/search"
+import { IFullTextSearchPage, IPatentInfoModel } from "@/types/search"
 
-export async function fullTextSearch(searchParse: string): Promise<IPatentInfoModel[]> {
-    const data = await fetcher("/search/full-text/?search_keywords=" + encodeURIComponent(searchParse), {
+export async function fullTextSearch(searchParse: string, cursor: string | null = null): Promise<IFullTextSearchPage> {
+    const params = new URLSearchParams({ search_keywords: searchParse })
+    if (cursor) {
+        params.set("cursor", cursor)
+    }
+    const data = await fetcher("/search/full-text/?" + params, {
         method: "GET"
     })
 
@@ -32,7 +36,7 @@ export async function fullTextSearch(searchParse: string): Promise<IPatentInfoMo
     }
 
     console.log(patents)
-    return patents
+    return { patents: patents, nextCursor: data.next_cursor ?? null }
 }
 
 export async function similaritySearch(searchParse: string): Promise<string> {
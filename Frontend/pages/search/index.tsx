@@ -30,6 +30,9 @@ export default function SearchPage() {
   const [searchMode, setSearchMode] = useState<boolean>(true)
   const [patentList, setPatentList] = useState<IPatentInfoModel[]>([])
   const [isSearching, setIsSearching] = useState<boolean>(false)
+  // the query the shown pages belong to, the cursor is only valid for it
+  const [searchedQuery, setSearchedQuery] = useState<string>("")
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const { isOpen, onOpen, onOpenChange } = useDisclosure();
 
   const handelSearch = () => {
@@ -53,7 +56,20 @@ export default function SearchPage() {
     setIsSearching(true)
     const results = await fullTextSearch(query);
     console.log(results)
-    setPatentList(results)
+    setPatentList(results.patents)
+    setSearchedQuery(query)
+    setNextCursor(results.nextCursor)
+    setIsSearching(false)
+  };
+
+  const handleLoadMore = async () => {
+    if (!nextCursor) {
+      return
+    }
+    setIsSearching(true)
+    const results = await fullTextSearch(searchedQuery, nextCursor);
+    setPatentList([...patentList, ...results.patents])
+    setNextCursor(results.nextCursor)
     setIsSearching(false)
   };
 
@@ -169,6 +185,14 @@ export default function SearchPage() {
                   patents={patentList}
                 >
                 </PatentTable>
+                {nextCursor &&
+                  <Button
+                    className="my-3"
+                    isLoading={isSearching}
+                    onPress={handleLoadMore}
+                  >
+                    載入更多
+                  </Button>}
               </>
             ) : (
               <Card className="w-full h-full my-3">
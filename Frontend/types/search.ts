@@ -37,4 +37,10 @@ export interface IPatentImageInfoModel {
 export interface ISearchResult {
     patents: IPatentInfoModel
     search_time: string
+}
+
+export interface IFullTextSearchPage {
+    patents: IPatentInfoModel[]
+    // pass back to `fullTextSearch` for the following page, null on the last page
+    nextCursor: string | null
 }
\ No newline at end of file